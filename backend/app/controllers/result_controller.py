@@ -5,11 +5,16 @@
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 from datetime import datetime
-from app.db.models.result_model import Result, ResultType
+from sqlalchemy import Text, cast, func, insert, literal, tuple_
+from sqlalchemy.dialects.postgresql import JSONB
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.db.models.result_model import LifecycleStatus, Result, ResultType, RESULT_DATA_AGENT, RESULT_DATA_TURN
 from app.db.schemas.result_schema import ResultCreate, ResultUpdate
 import json
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
 from app.db.models.scenario_model import Scenario
+from app.db.models.simulation_session_model import SimulationSession
 from fastapi import HTTPException
 
 # ============================================================
@@ -41,6 +46,7 @@ def create_result(db: Session, result_data: ResultCreate):
     """Create a new result entry."""
     try:
         new_result = Result(**result_data.model_dump())
+        new_result.resultdata = parse_payload(new_result.resulttext)
         db.add(new_result)
         db.commit()
         db.refresh(new_result)
@@ -62,8 +68,11 @@ def update_result(db: Session, resultid: int, result_data: ResultUpdate):
     if result.is_deleted:
         raise HTTPException(status_code=400, detail="Cannot update a deleted result")
 
-    for key, value in result_data.model_dump(exclude_unset=True).items():
+    updates = result_data.model_dump(exclude_unset=True)
+    for key, value in updates.items():
         setattr(result, key, value)
+    if "resulttext" in updates:
+        result.resultdata = parse_payload(result.resulttext)
 
     db.commit()
     db.refresh(result)
@@ -145,6 +154,133 @@ def get_results_by_scenario(db: Session, scenarioid: int):
 
 # Simulation Results Store
 
+# (projectagentid, resulttype, resulttext payload)
+MappedResult = Tuple[Optional[int], ResultType, Dict[str, Any]]
+
+
+def parse_payload(resulttext: Optional[str]) -> Optional[Any]:
+    """resulttext → value for the JSONB resultdata column (None if not JSON)."""
+    try:
+        return json.loads(resulttext) if resulttext else None
+    except ValueError:
+        return None
+
+
+def empty_result_counts() -> Dict[str, int]:
+    return {"system": 0, "emotion": 0, "memory": 0, "corrosion": 0, "position": 0}
+
+
+def _as_projectagentid(value: Any) -> Optional[int]:
+    try:
+        return int(value) if value is not None else None
+    except (ValueError, TypeError):
+        return None
+
+
+def map_log_entry(item: Dict[str, Any]) -> Iterator[MappedResult]:
+    """🧩 System log (main narration)."""
+    yield None, ResultType.system, {
+        "turn": item.get("turn"),
+        "who": item.get("who") or "System",
+        "text": item.get("text", ""),
+    }
+
+
+def map_agent_snapshot(agent_key: Any, snap: Dict[str, Any]) -> Iterator[MappedResult]:
+    """💭 Agent snapshot → emotion / memory / corrosion rows (key may be a projectagentid)."""
+    projectagentid = _as_projectagentid(agent_key)
+    for field, resulttype in (
+        ("emotion", ResultType.emotion),
+        ("memory", ResultType.memory),
+        ("corrosion", ResultType.corrosion),
+    ):
+        if snap.get(field):
+            yield projectagentid, resulttype, {
+                "agent": agent_key,
+                "time": snap.get("time"),
+                field: snap.get(field),
+            }
+
+
+def map_position(p: Dict[str, Any]) -> Iterator[MappedResult]:
+    """🧭 Agent position."""
+    yield _as_projectagentid(p.get("projectagentid")), ResultType.position, {
+        "agent": p.get("agent"),
+        "x": p.get("x"),
+        "y": p.get("y"),
+        "facing": p.get("facing"),
+    }
+
+
+def summary_payload(entries: int) -> Dict[str, Any]:
+    return {
+        "status": "completed",
+        "ended_at": datetime.utcnow().isoformat(),
+        "entries": entries,
+    }
+
+
+def validate_result_scenario(db: Session, scenarioid: int, projectid: int) -> Scenario:
+    scenario = db.query(Scenario).filter(
+        Scenario.scenarioid == scenarioid,
+        Scenario.is_deleted == False,
+    ).first()
+
+    if not scenario:
+        raise HTTPException(status_code=404, detail="Scenario not found")
+
+    if int(scenario.projectid) != int(projectid):
+        raise HTTPException(status_code=400, detail="Scenario does not belong to this project")
+    return scenario
+
+
+def mark_results_saved(db: Session, simulation_id: Optional[str]) -> bool:
+    """
+    Flag a registered simulation's results as saved (uncommitted: lands with
+    the caller's result rows). False if unknown or already saved; the row
+    lock also serializes concurrent saves of the same simulation.
+    """
+    if not simulation_id:
+        return False
+    return bool(
+        db.query(SimulationSession)
+        .filter(
+            SimulationSession.simulation_id == str(simulation_id),
+            SimulationSession.results_saved_at.is_(None),
+        )
+        .update({SimulationSession.results_saved_at: func.now()}, synchronize_session=False)
+    )
+
+
+def _results_saved(db: Session, simulation_id: Optional[str]) -> bool:
+    """True if a registered simulation's results were already saved."""
+    if not simulation_id:
+        return False
+    return (
+        db.query(SimulationSession.sessionid)
+        .filter(
+            SimulationSession.simulation_id == str(simulation_id),
+            SimulationSession.results_saved_at.isnot(None),
+        )
+        .first()
+        is not None
+    )
+
+
+def result_row(
+    scenarioid: int, sequence_no: int, projectagentid: Optional[int], resulttype: ResultType, payload: Dict[str, Any]
+) -> Dict[str, Any]:
+    return {
+        "projectagentid": projectagentid,
+        "scenarioid": scenarioid,
+        "resulttype": resulttype,
+        "sequence_no": sequence_no,
+        "confidence_score": None,
+        "resulttext": json.dumps(payload),
+        "resultdata": payload,
+        "status": LifecycleStatus.active,
+        "is_deleted": False,
+    }
 
 
 def save_simulation_results(
@@ -156,6 +292,7 @@ def save_simulation_results(
     logs: List[Dict[str, Any]],
     agentLogs: Dict[str, List[Dict[str, Any]]],
     positions: List[Dict[str, Any]] = [],
+    claimed: bool = False,
 ):
     
     print("💾 Incoming payload:",
@@ -165,184 +302,167 @@ def save_simulation_results(
     """
     Persist a finished simulation snapshot into result_tbl.
     Handles system logs, emotions, memories, corrosion, and agent positions.
+    A registered simulation is saved once: later saves (e.g. the frontend's
+    manual save after autosave on stop) write nothing. Pass claimed=True if
+    the caller already ran mark_results_saved in this transaction.
     """
     # 1️⃣ Validate scenario
-    scenario = db.query(Scenario).filter(
-        Scenario.scenarioid == scenarioid,
-        Scenario.is_deleted == False,
-    ).first()
+    validate_result_scenario(db, scenarioid, projectid)
 
-    if not scenario:
-        raise HTTPException(status_code=404, detail="Scenario not found")
+    simulation_id = (simulation or {}).get("id")
+    if not claimed and not mark_results_saved(db, simulation_id) and _results_saved(db, simulation_id):
+        db.rollback()
+        return {
+            "detail": f"Results for simulation {simulation_id} were already saved; nothing written",
+            "counts": empty_result_counts(),
+        }
 
-    if int(scenario.projectid) != int(projectid):
-        raise HTTPException(status_code=400, detail="Scenario does not belong to this project")
+    # 2️⃣ Build every row in memory (sequence numbers assigned here)
+    counts = empty_result_counts()
+    rows: List[Dict[str, Any]] = []
 
-    # 2️⃣ Begin collecting results
-    seq = 1
-    counts = {
-        "system": 0,
-        "emotion": 0,
-        "memory": 0,
-        "corrosion": 0,
-        "position": 0,
-    }
-
-    try:
-        # ---------------------------------------------------------
-        # 🧩 System logs (main narration)
-        # ---------------------------------------------------------
-        for item in logs or []:
-            db.add(Result(
-                projectagentid=None,
-                scenarioid=scenarioid,
-                resulttype=ResultType.system,
-                sequence_no=seq,
-                confidence_score=None,
-                resulttext=json.dumps({
-                    "turn": item.get("turn"),
-                    "who": item.get("who") or "System",
-                    "text": item.get("text", ""),
-                }),
-            ))
-            seq += 1
-            counts["system"] += 1
-
-        # ---------------------------------------------------------
-        # 💭 Agent logs (emotion, memory, corrosion)
-        # ---------------------------------------------------------
-        for agent_key, entries in (agentLogs or {}).items():
-            # Try to interpret key as projectagentid
-            try:
-                projectagentid = int(agent_key)
-            except (ValueError, TypeError):
-                projectagentid = None
-
-            for snap in entries or []:
-                # Emotion
-                if snap.get("emotion"):
-                    db.add(Result(
-                        projectagentid=projectagentid,
-                        scenarioid=scenarioid,
-                        resulttype=ResultType.emotion,
-                        sequence_no=seq,
-                        confidence_score=None,
-                        resulttext=json.dumps({
-                            "agent": agent_key,
-                            "time": snap.get("time"),
-                            "emotion": snap.get("emotion"),
-                        }),
-                    ))
-                    seq += 1
-                    counts["emotion"] += 1
-
-                # Memory
-                if snap.get("memory"):
-                    db.add(Result(
-                        projectagentid=projectagentid,
-                        scenarioid=scenarioid,
-                        resulttype=ResultType.memory,
-                        sequence_no=seq,
-                        confidence_score=None,
-                        resulttext=json.dumps({
-                            "agent": agent_key,
-                            "time": snap.get("time"),
-                            "memory": snap.get("memory"),
-                        }),
-                    ))
-                    seq += 1
-                    counts["memory"] += 1
-
-                # Corrosion
-                if snap.get("corrosion"):
-                    db.add(Result(
-                        projectagentid=projectagentid,
-                        scenarioid=scenarioid,
-                        resulttype=ResultType.corrosion,
-                        sequence_no=seq,
-                        confidence_score=None,
-                        resulttext=json.dumps({
-                            "agent": agent_key,
-                            "time": snap.get("time"),
-                            "corrosion": snap.get("corrosion"),
-                        }),
-                    ))
-                    seq += 1
-                    counts["corrosion"] += 1
-
-        # 🧭 Agent positions
-        for p in positions or []:
-            projectagentid = p.get("projectagentid")
-            try:
-                projectagentid = int(projectagentid) if projectagentid is not None else None
-            except (ValueError, TypeError):
-                projectagentid = None
-
-            db.add(Result(
-                projectagentid=projectagentid,
-                scenarioid=scenarioid,
-                resulttype=ResultType.position,
-                sequence_no=seq,
-                confidence_score=None,
-                resulttext=json.dumps({
-                    "agent": p.get("agent"),
-                    "x": p.get("x"),
-                    "y": p.get("y"),
-                    "facing": p.get("facing"),
-                }),
-            ))
-            seq += 1
-            counts["position"] += 1
-
-        # ---------------------------------------------------------
-        # 🧾 Optional summary record
-        # ---------------------------------------------------------
-        db.add(Result(
-            projectagentid=None,
-            scenarioid=scenarioid,
-            resulttype=ResultType.summary,
-            sequence_no=seq,
-            confidence_score=None,
-            resulttext=json.dumps({
-                "status": "completed",
-                "ended_at": datetime.utcnow().isoformat(),
-                "entries": sum(counts.values()),
-            }),
-        ))
-
-        # 3️⃣ Commit
-        try:
-            db.commit()
-        except Exception as e:
-            db.rollback()
-            import traceback
-            print("💥 Commit failed!")
-            traceback.print_exc()
-            raise HTTPException(status_code=500, detail=f"Commit failed: {str(e)}")
+    def _add(mapped: Iterable[MappedResult]) -> None:
+        for projectagentid, resulttype, payload in mapped:
+            rows.append(result_row(scenarioid, len(rows) + 1, projectagentid, resulttype, payload))
+            counts[resulttype.value] += 1
 
+    for item in logs or []:
+        _add(map_log_entry(item))
+    for agent_key, snapshots in (agentLogs or {}).items():
+        for snap in snapshots or []:
+            _add(map_agent_snapshot(agent_key, snap))
+    for p in positions or []:
+        _add(map_position(p))
 
-        return {
-            "detail": f"Saved {sum(counts.values()) + 1} result rows (including summary) for scenario {scenarioid}",
-            "counts": counts,
-        }
+    # 🧾 Summary record (not part of counts)
+    entries = sum(counts.values())
+    rows.append(result_row(scenarioid, len(rows) + 1, None, ResultType.summary, summary_payload(entries)))
 
+    # 3️⃣ Bulk write + commit (one transaction)
+    try:
+        _bulk_insert_results(db, rows)
+        db.commit()
     except Exception as e:
         db.rollback()
+        import traceback
+        print("💥 Bulk save failed!")
+        traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Database error while saving simulation: {str(e)}")
-    
+
+    return {
+        "detail": f"Saved {entries + 1} result rows (including summary) for scenario {scenarioid}",
+        "counts": counts,
+    }
+
+
+# ============================================================
+# 🔹 BULK INSERT HELPERS
+# ============================================================
+RESULT_BULK_COLUMNS = (
+    "projectagentid",
+    "scenarioid",
+    "resulttype",
+    "sequence_no",
+    "confidence_score",
+    "resulttext",
+    "resultdata",
+    "status",
+    "is_deleted",
+)
+
+
+def _copy_value(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value.value if hasattr(value, "value") else value
+
+
+def _bulk_insert_results(db: Session, rows: List[Dict[str, Any]]) -> None:
+    """
+    Insert prepared result rows without building ORM objects.
+    Large payloads stream through COPY; the rest use batched multi-row
+    INSERTs (executemany → insertmanyvalues). Both run in the session's
+    transaction, so the caller's commit/rollback covers them.
+    """
+    if not rows:
+        return
+    if len(rows) >= settings.result_bulk_copy_threshold and _copy_results(db, rows):
+        return
+    batch_size = settings.result_bulk_insert_batch_size
+    for i in range(0, len(rows), batch_size):
+        db.execute(insert(Result), rows[i:i + batch_size])
+
+
+def _copy_results(db: Session, rows: List[Dict[str, Any]]) -> bool:
+    """COPY rows into result_tbl via psycopg 3. Returns False if unsupported."""
+    dbapi_conn = db.connection().connection.driver_connection
+    if not type(dbapi_conn).__module__.startswith("psycopg."):
+        return False  # e.g. psycopg2: fall back to batched INSERTs
+
+    statement = f"COPY {Result.__tablename__} ({', '.join(RESULT_BULK_COLUMNS)}) FROM STDIN"
+    with dbapi_conn.cursor() as cursor:
+        with cursor.copy(statement) as copy:
+            for row in rows:
+                copy.write_row(tuple(_copy_value(row[c]) for c in RESULT_BULK_COLUMNS))
+    return True
+
+
+# ============================================================
+# 🔹 PAYLOAD FILTERS (pushed into Postgres)
+# ============================================================
+def result_filters(
+    scenarioid: int,
+    *,
+    resulttypes: Optional[List[ResultType]] = None,
+    agent: Optional[str] = None,
+    projectagentid: Optional[int] = None,
+    from_turn: Optional[int] = None,
+    to_turn: Optional[int] = None,
+) -> List[Any]:
+    """
+    WHERE clauses for result queries. Payload filters use resultdata, so
+    rows saved before the JSONB migration ran only match unfiltered reads.
+    A turn range keeps rows that carry a numeric turn (system logs).
+    """
+    filters = [Result.scenarioid == scenarioid, Result.is_deleted == False]
+    if resulttypes:
+        filters.append(Result.resulttype.in_(resulttypes))
+    if projectagentid is not None:
+        filters.append(Result.projectagentid == projectagentid)
+    if agent:
+        filters.append(RESULT_DATA_AGENT == agent)
+    if from_turn is not None or to_turn is not None:
+        filters.append(func.jsonb_typeof(RESULT_DATA_TURN) == "number")
+    if from_turn is not None:
+        filters.append(RESULT_DATA_TURN >= literal(int(from_turn), JSONB))
+    if to_turn is not None:
+        filters.append(RESULT_DATA_TURN <= literal(int(to_turn), JSONB))
+    return filters
+
+
+def _result_data(resultid: int, resultdata: Any, resulttext: Optional[str]) -> Any:
+    """Prefer the JSONB column; rows not yet migrated fall back to resulttext."""
+    if resultdata is not None:
+        return resultdata
+    try:
+        return json.loads(resulttext)
+    except Exception as e:
+        print(f"⚠️ Failed to parse resulttext for id={resultid}: {e}")
+        return None
+
+
 # ============================================================
 # 🔹 GET REPLAY DATA BY SCENARIO
 # ============================================================
-def get_replay_data(db: Session, scenarioid: int):
+def get_replay_data(db: Session, scenarioid: int, **filters):
     """
     Retrieve all saved simulation results grouped by type,
     so the frontend can replay the simulation visually.
+    Optional filters: see result_filters().
     """
-    from app.db.models.result_model import Result
-
     results = (
-        db.query(Result)
-        .filter(Result.scenarioid == scenarioid, Result.is_deleted == False)
+        db.query(Result.resultid, Result.resulttype, Result.resultdata, Result.resulttext)
+        .filter(*result_filters(scenarioid, **filters))
         .order_by(Result.sequence_no.asc(), Result.created_at.asc())
         .all()
     )
@@ -356,12 +476,135 @@ def get_replay_data(db: Session, scenarioid: int):
         "position": [],
     }
 
-    for r in results:
-        try:
-            data = json.loads(r.resulttext)
-            key = r.resulttype.value if hasattr(r.resulttype, "value") else str(r.resulttype)
-            grouped.setdefault(key, []).append(data)
-        except Exception as e:
-            print(f"⚠️ Failed to parse resulttext for id={r.resultid}: {e}")
+    for resultid, resulttype, resultdata, resulttext in results:
+        data = _result_data(resultid, resultdata, resulttext)
+        if data is None:
+            continue
+        key = resulttype.value if hasattr(resulttype, "value") else str(resulttype)
+        grouped.setdefault(key, []).append(data)
 
     return grouped
+
+
+# ============================================================
+# 🔹 STREAM REPLAY DATA (NDJSON)
+# ============================================================
+REPLAY_STREAM_BATCH = 500
+
+
+def stream_replay_ndjson(scenarioid: int, **filters) -> Iterator[str]:
+    """
+    Yield the scenario's results as NDJSON in sequence order:
+      {"seq": 1, "type": "system", "data": {...}}
+      ...
+      {"type": "end", "scenarioid": 7, "rows": 1234}
+    Rows come from a server-side cursor (yield_per), so memory stays flat
+    however long the run is. Uses its own session: the response outlives
+    the request's dependencies. Migrated rows are spliced in as the JSON
+    text Postgres renders from resultdata, without a Python round trip.
+    """
+    db = SessionLocal()
+    rows = 0
+    lines: List[str] = []
+    try:
+        query = (
+            db.query(
+                Result.resultid,
+                Result.sequence_no,
+                Result.resulttype,
+                cast(Result.resultdata, Text),
+                Result.resulttext,
+            )
+            .filter(*result_filters(scenarioid, **filters))
+            .order_by(Result.sequence_no.asc(), Result.created_at.asc())
+            .yield_per(REPLAY_STREAM_BATCH)
+        )
+        for resultid, sequence_no, resulttype, raw, resulttext in query:
+            if raw is None:
+                data = _result_data(resultid, None, resulttext)
+                if data is None:
+                    continue
+                raw = json.dumps(data, ensure_ascii=False)
+            key = resulttype.value if hasattr(resulttype, "value") else str(resulttype)
+            lines.append(f'{{"seq": {json.dumps(sequence_no)}, "type": "{key}", "data": {raw}}}')
+            rows += 1
+            if len(lines) >= REPLAY_STREAM_BATCH:
+                yield "\n".join(lines) + "\n"
+                lines = []
+        lines.append(json.dumps({"type": "end", "scenarioid": scenarioid, "rows": rows}))
+        yield "\n".join(lines) + "\n"
+    finally:
+        db.close()
+
+
+# ============================================================
+# 🔹 QUERY / STATS (filtered in Postgres)
+# ============================================================
+def query_results(
+    db: Session,
+    scenarioid: int,
+    *,
+    after_seq: Optional[int] = None,
+    after_id: Optional[int] = None,
+    limit: int = 500,
+    **filters,
+) -> Dict[str, Any]:
+    """One page of matching rows, keyset-paginated on (sequence_no, resultid)."""
+    query = db.query(
+        Result.resultid,
+        Result.sequence_no,
+        Result.resulttype,
+        Result.projectagentid,
+        Result.resultdata,
+        Result.resulttext,
+    ).filter(*result_filters(scenarioid, **filters))
+    if after_seq is not None and after_id is not None:
+        query = query.filter(tuple_(Result.sequence_no, Result.resultid) > tuple_(after_seq, after_id))
+
+    page = query.order_by(Result.sequence_no.asc(), Result.resultid.asc()).limit(limit + 1).all()
+    has_more = len(page) > limit
+    page = page[:limit]
+
+    rows = [
+        {
+            "resultid": resultid,
+            "seq": sequence_no,
+            "type": resulttype.value if hasattr(resulttype, "value") else str(resulttype),
+            "projectagentid": projectagentid,
+            "data": _result_data(resultid, resultdata, resulttext),
+        }
+        for resultid, sequence_no, resulttype, projectagentid, resultdata, resulttext in page
+    ]
+    return {
+        "scenarioid": scenarioid,
+        "rows": rows,
+        "next_after_seq": rows[-1]["seq"] if has_more else None,
+        "next_after_id": rows[-1]["resultid"] if has_more else None,
+    }
+
+
+def get_result_stats(db: Session, scenarioid: int) -> Dict[str, Any]:
+    """Row counts per type and agent plus the turn range, aggregated in SQL."""
+    base = result_filters(scenarioid)
+    by_type: Dict[str, int] = {}
+    by_agent: Dict[str, Dict[str, int]] = {}
+    for resulttype, agent, n in (
+        db.query(Result.resulttype, RESULT_DATA_AGENT, func.count())
+        .filter(*base)
+        .group_by(Result.resulttype, RESULT_DATA_AGENT)
+    ):
+        key = resulttype.value if hasattr(resulttype, "value") else str(resulttype)
+        by_type[key] = by_type.get(key, 0) + n
+        if agent is not None:
+            by_agent.setdefault(agent, {})[key] = n
+
+    numeric_turn = func.jsonb_typeof(RESULT_DATA_TURN) == "number"
+    turns = db.query(RESULT_DATA_TURN).filter(*base, numeric_turn)
+    return {
+        "scenarioid": scenarioid,
+        "rows": sum(by_type.values()),
+        "by_type": by_type,
+        "by_agent": by_agent,
+        "first_turn": turns.order_by(RESULT_DATA_TURN.asc()).limit(1).scalar(),
+        "last_turn": turns.order_by(RESULT_DATA_TURN.desc()).limit(1).scalar(),
+    }
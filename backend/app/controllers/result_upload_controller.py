@@ -0,0 +1,265 @@
+# ===============================
+# app/controllers/result_upload_controller.py
+# Chunked, resumable save of simulation results
+# ===============================
+
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List
+
+from fastapi import HTTPException
+from sqlalchemy import cast, delete, insert, literal, select
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Session
+
+from app.controllers.result_controller import (
+    MappedResult,
+    empty_result_counts,
+    map_agent_snapshot,
+    map_log_entry,
+    map_position,
+    result_row,
+    summary_payload,
+    validate_result_scenario,
+)
+from app.core.config import settings
+from app.db.models.result_model import LifecycleStatus, Result, ResultType
+from app.db.models.result_upload_model import ResultUpload, ResultUploadRow, ResultUploadStatus
+from app.db.schemas.result_schema import ResultUploadCreate, ResultUploadResponse
+
+
+def _value(enum_value) -> str:
+    return enum_value.value if hasattr(enum_value, "value") else str(enum_value)
+
+
+def serialize_upload(upload: ResultUpload) -> Dict[str, Any]:
+    last = upload.last_chunk_seq if upload.last_chunk_seq is not None else -1
+    return ResultUploadResponse(
+        uploadid=upload.uploadid,
+        scenarioid=upload.scenarioid,
+        projectid=upload.projectid,
+        status=_value(upload.status),
+        last_chunk_seq=last,
+        next_chunk_seq=last + 1,
+        row_count=upload.row_count or 0,
+        counts=json.loads(upload.counts) if upload.counts else empty_result_counts(),
+        created_at=upload.created_at,
+        updated_at=upload.updated_at,
+        committed_at=upload.committed_at,
+    ).model_dump()
+
+
+# ============================================================
+# 🔹 OPEN / GET UPLOAD
+# ============================================================
+def open_upload(db: Session, payload: ResultUploadCreate, userid: int) -> Dict[str, Any]:
+    validate_result_scenario(db, payload.scenarioid, payload.projectid)
+    try:
+        upload = ResultUpload(
+            uploadid=str(uuid.uuid4()),
+            userid=userid,
+            scenarioid=payload.scenarioid,
+            projectid=payload.projectid,
+            status=ResultUploadStatus.open,
+            last_chunk_seq=-1,
+            row_count=0,
+            counts=json.dumps(empty_result_counts()),
+        )
+        db.add(upload)
+        db.commit()
+        db.refresh(upload)
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+    return serialize_upload(upload)
+
+
+def get_upload_or_404(db: Session, uploadid: str, userid: int, lock: bool = False) -> ResultUpload:
+    query = db.query(ResultUpload).filter(ResultUpload.uploadid == uploadid)
+    if lock:
+        # Serializes concurrent retries of the same chunk
+        query = query.with_for_update()
+    upload = query.first()
+    if not upload or upload.userid != userid:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return upload
+
+
+def get_upload(db: Session, uploadid: str, userid: int) -> Dict[str, Any]:
+    return serialize_upload(get_upload_or_404(db, uploadid, userid))
+
+
+def _require_open(upload: ResultUpload) -> None:
+    if upload.status != ResultUploadStatus.open:
+        raise HTTPException(status_code=409, detail=f"Upload already {_value(upload.status)}")
+
+
+# ============================================================
+# 🔹 WRITE CHUNK (NDJSON)
+# ============================================================
+def _map_line(line: Dict[str, Any]) -> List[MappedResult]:
+    """
+    One NDJSON line → result rows. Lines look like
+      {"type": "log", "turn": 3, "who": "...", "text": "..."}
+      {"type": "agentLog", "agent": "12", "time": "...", "emotion": "..."}
+      {"type": "position", "agent": "...", "projectagentid": 12, "x": 1, "y": 2}
+    """
+    kind = line.pop("type", None)
+    if kind == "log":
+        return list(map_log_entry(line))
+    if kind == "agentLog":
+        return list(map_agent_snapshot(line.pop("agent", None), line))
+    if kind == "position":
+        return list(map_position(line))
+    raise ValueError(f"unknown type {kind!r}")
+
+
+def write_chunk(db: Session, uploadid: str, chunk_seq: int, body: bytes, userid: int) -> Dict[str, Any]:
+    """
+    Stage one chunk. Chunks must arrive in order; re-sending an acknowledged
+    chunk is a no-op, so a client can safely retry after a lost response.
+    """
+    upload = get_upload_or_404(db, uploadid, userid, lock=True)
+    _require_open(upload)
+
+    last = upload.last_chunk_seq if upload.last_chunk_seq is not None else -1
+    if chunk_seq <= last:
+        db.rollback()
+        return {"uploadid": uploadid, "chunk_seq": chunk_seq, "duplicate": True, "next_chunk_seq": last + 1}
+    if chunk_seq != last + 1:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=f"Expected chunk {last + 1}, got {chunk_seq}")
+
+    counts = json.loads(upload.counts) if upload.counts else empty_result_counts()
+    row_count = upload.row_count or 0
+    batch_size = settings.result_bulk_insert_batch_size
+    batch: List[Dict[str, Any]] = []
+    staged = 0
+
+    try:
+        for lineno, raw in enumerate(body.splitlines(), start=1):
+            if not raw.strip():
+                continue
+            try:
+                line = json.loads(raw)
+                if not isinstance(line, dict):
+                    raise ValueError("expected a JSON object")
+                mapped = _map_line(line)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=f"Chunk {chunk_seq}, line {lineno}: {e}")
+
+            for projectagentid, resulttype, payload in mapped:
+                staged += 1
+                counts[resulttype.value] += 1
+                batch.append({
+                    "uploadid": uploadid,
+                    "chunk_seq": chunk_seq,
+                    "sequence_no": row_count + staged,
+                    "projectagentid": projectagentid,
+                    "resulttype": resulttype.value,
+                    "confidence_score": None,
+                    "resulttext": json.dumps(payload),
+                })
+            if len(batch) >= batch_size:
+                db.execute(insert(ResultUploadRow), batch)
+                batch = []
+        if batch:
+            db.execute(insert(ResultUploadRow), batch)
+
+        # Acknowledge in the same transaction as the staged rows
+        upload.last_chunk_seq = chunk_seq
+        upload.row_count = row_count + staged
+        upload.counts = json.dumps(counts)
+        db.commit()
+    except HTTPException:
+        db.rollback()
+        raise
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Database error while staging chunk: {str(e)}")
+
+    return {
+        "uploadid": uploadid,
+        "chunk_seq": chunk_seq,
+        "duplicate": False,
+        "rows": staged,
+        "row_count": row_count + staged,
+        "next_chunk_seq": chunk_seq + 1,
+    }
+
+
+# ============================================================
+# 🔹 COMMIT / ABORT
+# ============================================================
+def commit_upload(db: Session, uploadid: str, userid: int) -> Dict[str, Any]:
+    """
+    Move the staged rows into result_tbl with one INSERT … SELECT, append the
+    summary row and drop the staging data. Committing twice returns the same
+    response without writing again.
+    """
+    upload = get_upload_or_404(db, uploadid, userid, lock=True)
+    counts = json.loads(upload.counts) if upload.counts else empty_result_counts()
+    entries = upload.row_count or 0
+    response = {
+        "detail": f"Saved {entries + 1} result rows (including summary) for scenario {upload.scenarioid}",
+        "counts": counts,
+    }
+    if upload.status == ResultUploadStatus.committed:
+        db.rollback()
+        return response
+    _require_open(upload)
+
+    result_cols = Result.__table__.c
+    staged = (
+        select(
+            ResultUploadRow.projectagentid,
+            literal(upload.scenarioid, result_cols.scenarioid.type),
+            cast(ResultUploadRow.resulttype, result_cols.resulttype.type),
+            ResultUploadRow.sequence_no,
+            ResultUploadRow.confidence_score,
+            ResultUploadRow.resulttext,
+            cast(ResultUploadRow.resulttext, JSONB),
+            literal(LifecycleStatus.active, result_cols.status.type),
+            literal(False, result_cols.is_deleted.type),
+        )
+        .where(ResultUploadRow.uploadid == uploadid)
+        .order_by(ResultUploadRow.sequence_no.asc())
+    )
+    try:
+        db.execute(
+            insert(Result).from_select(
+                [
+                    "projectagentid",
+                    "scenarioid",
+                    "resulttype",
+                    "sequence_no",
+                    "confidence_score",
+                    "resulttext",
+                    "resultdata",
+                    "status",
+                    "is_deleted",
+                ],
+                staged,
+            )
+        )
+        db.execute(insert(Result), [
+            result_row(upload.scenarioid, entries + 1, None, ResultType.summary, summary_payload(entries))
+        ])
+        db.execute(delete(ResultUploadRow).where(ResultUploadRow.uploadid == uploadid))
+        upload.status = ResultUploadStatus.committed
+        upload.committed_at = datetime.utcnow()
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Database error while saving simulation: {str(e)}")
+    return response
+
+
+def abort_upload(db: Session, uploadid: str, userid: int) -> Dict[str, Any]:
+    upload = get_upload_or_404(db, uploadid, userid, lock=True)
+    _require_open(upload)
+    db.execute(delete(ResultUploadRow).where(ResultUploadRow.uploadid == uploadid))
+    upload.status = ResultUploadStatus.aborted
+    db.commit()
+    return {"detail": f"Upload {uploadid} aborted"}
@@ -0,0 +1,193 @@
+# ===============================
+# app/controllers/simulation_checkpoint_controller.py
+# Checkpoints and "what-if" forks of provider simulations
+# ===============================
+
+import json
+from typing import Any, Dict, List, Optional
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.controllers import simulation_session_controller
+from app.db.models.simulation_checkpoint_model import SimulationCheckpoint
+from app.db.schemas.simulation_schema import SimulationCheckpointResponse
+from app.services import simulation_checkpoint_service, simulation_service
+from app.services.provider_scheduler_service import current_provider_user
+from app.services.simulation_journal_service import merged_history
+
+# Agent fields the provider accepts on create (everything else rides along as seed state)
+SEED_AGENT_FIELDS = (
+    "name",
+    "role",
+    "persona",
+    "mbti",
+    "cognitive_bias",
+    "motivation",
+    "skills",
+    "constraints",
+    "quirks",
+    "biography",
+    "emotional_state",
+)
+
+
+def serialize_checkpoint(cp: SimulationCheckpoint, stored_bytes: Optional[int] = None) -> Dict[str, Any]:
+    manifest = json.loads(cp.manifest)
+    return SimulationCheckpointResponse(
+        checkpointid=cp.checkpointid,
+        simulation_id=cp.simulation_id,
+        parent_checkpointid=cp.parent_checkpointid,
+        label=cp.label,
+        turn=cp.turn or 0,
+        agent_count=len(manifest.get("agents", [])),
+        event_count=manifest.get("event_count", 0),
+        stored_bytes=stored_bytes,
+        created_at=cp.created_at,
+    ).model_dump()
+
+
+def _get_checkpoint(db: Session, checkpointid: int, simulation_id: str) -> SimulationCheckpoint:
+    cp = (
+        db.query(SimulationCheckpoint)
+        .filter(
+            SimulationCheckpoint.checkpointid == checkpointid,
+            SimulationCheckpoint.simulation_id == simulation_id,
+            SimulationCheckpoint.is_deleted == False,
+        )
+        .first()
+    )
+    if not cp:
+        raise HTTPException(status_code=404, detail="Checkpoint not found")
+    return cp
+
+
+# ============================================================
+# 🔹 CREATE CHECKPOINT
+# ============================================================
+async def create_checkpoint(
+    db: Session, simulation_id: str, userid: int, label: Optional[str] = None
+) -> Dict[str, Any]:
+    """Snapshot the current provider state (agents + full event history)."""
+    current_provider_user.set(userid)
+    raw = await simulation_service._fetch_simulation(simulation_id)
+    sim = raw.get("simulation") or raw
+
+    session = simulation_session_controller._get_session(db, simulation_id)
+    parent: Optional[SimulationCheckpoint] = None
+    if session is not None and session.forked_from_checkpointid:
+        parent = db.query(SimulationCheckpoint).filter(
+            SimulationCheckpoint.checkpointid == session.forked_from_checkpointid
+        ).first()
+
+    try:
+        events = merged_history(db, simulation_id, sim.get("events") or [])
+        manifest, stored_bytes = simulation_checkpoint_service.build_manifest(
+            db,
+            sim,
+            simulation_service._filter_agents(sim),
+            events,
+            simulation_service._current_turn(sim),
+            json.loads(parent.manifest) if parent else None,
+        )
+        cp = SimulationCheckpoint(
+            simulation_id=simulation_id,
+            parent_checkpointid=parent.checkpointid if parent else None,
+            userid=userid,
+            label=label,
+            turn=manifest["turn"],
+            manifest=json.dumps(manifest),
+        )
+        db.add(cp)
+        db.commit()
+        db.refresh(cp)
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+    return serialize_checkpoint(cp, stored_bytes)
+
+
+# ============================================================
+# 🔹 LIST CHECKPOINTS
+# ============================================================
+def list_checkpoints(db: Session, simulation_id: str) -> List[Dict[str, Any]]:
+    checkpoints = (
+        db.query(SimulationCheckpoint)
+        .filter(SimulationCheckpoint.simulation_id == simulation_id, SimulationCheckpoint.is_deleted == False)
+        .order_by(SimulationCheckpoint.created_at.desc())
+        .all()
+    )
+    return [serialize_checkpoint(cp) for cp in checkpoints]
+
+
+# ============================================================
+# 🔹 FORK FROM CHECKPOINT
+# ============================================================
+def _seed_payload(manifest: Dict[str, Any], agents: List[Dict[str, Any]], recent: List[Dict[str, Any]]) -> Dict[str, Any]:
+    custom_agents = []
+    for slot, a in enumerate(agents):
+        seeded = {k: a.get(k) for k in SEED_AGENT_FIELDS if a.get(k) is not None}
+        seeded["slot"] = slot
+        # Carried state for providers that restore it; ignored otherwise
+        seeded["memory"] = a.get("memory")
+        seeded["corroded_memory"] = a.get("corroded_memory")
+        seeded["position"] = a.get("position")
+        custom_agents.append(seeded)
+    return {
+        "scenario": manifest.get("scenario") or "",
+        "custom_agents": custom_agents,
+        "seed_state": {
+            "turn": manifest.get("turn", 0),
+            "recent_events": [
+                {"turn": e.get("turn"), "type": e.get("type"), "summary": e.get("summary") or e.get("text")}
+                for e in recent
+            ],
+        },
+    }
+
+
+async def fork_simulation(
+    db: Session,
+    simulation_id: str,
+    userid: int,
+    checkpointid: Optional[int] = None,
+    prompt: Optional[str] = None,
+    recent_events: int = 20,
+) -> Dict[str, Any]:
+    """
+    Seed a new provider simulation from a checkpoint (a fresh one when none
+    is given) and register it as a branch. An optional fate prompt is
+    applied to the branch straight away.
+    """
+    if checkpointid is None:
+        checkpointid = (await create_checkpoint(db, simulation_id, userid, label="fork"))["checkpointid"]
+    cp = _get_checkpoint(db, checkpointid, simulation_id)
+    manifest = json.loads(cp.manifest)
+
+    try:
+        agents = simulation_checkpoint_service.load_agents(db, manifest)
+        recent = simulation_checkpoint_service.load_recent_events(db, manifest, recent_events)
+    except LookupError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    current_provider_user.set(userid)
+    result = await simulation_service.create_simulation(_seed_payload(manifest, agents, recent))
+
+    source = simulation_session_controller._get_session(db, simulation_id)
+    simulation_session_controller.register_session(
+        db,
+        result=result,
+        userid=userid,
+        projectid=source.projectid if source else None,
+        scenarioid=source.scenarioid if source else None,
+        forked_from_checkpointid=cp.checkpointid,
+    )
+
+    branch_id = (result.get("simulation") or {}).get("id") or result.get("id")
+    if prompt and branch_id:
+        result = await simulation_service.trigger_fate(branch_id, {"prompt": prompt})
+    else:
+        result = simulation_service._slim_simulation(result)
+
+    return {**result, "forked_from": {"simulation_id": simulation_id, "checkpointid": cp.checkpointid}}
@@ -1,11 +1,19 @@
-from typing import Any, Dict
+import asyncio
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Tuple
 
+from fastapi import HTTPException
+
+from app.core.config import settings
 from app.db.schemas.simulation_schema import (
     SimulationAdvanceRequest,
+    SimulationBatchAdvanceRequest,
     SimulationCreateRequest,
     SimulationFateRequest,
 )
 from app.services import simulation_service
+from app.services.provider_scheduler_service import current_provider_user
+from app.services.simulation_projection_service import resolve_fields
 
 
 def _serialize(model) -> Dict[str, Any]:
@@ -17,15 +25,41 @@ def _serialize(model) -> Dict[str, Any]:
         return {}
 
 
-async def create_simulation(payload: SimulationCreateRequest) -> Dict[str, Any]:
-    print("DEBUG create_simulation payload type:", type(payload))
+@contextmanager
+def _as_user(user_id: Optional[int]):
+    """Attribute provider calls to a user for fair scheduling."""
+    token = current_provider_user.set(user_id)
+    try:
+        yield
+    finally:
+        current_provider_user.reset(token)
 
-    return await simulation_service.create_simulation(_serialize(payload))
 
+async def create_simulation(
+    payload: SimulationCreateRequest, user_id: Optional[int] = None
+) -> Dict[str, Any]:
+    data = _serialize(payload)
+    # Registry-only fields never go to the provider
+    data.pop("projectid", None)
+    data.pop("scenarioid", None)
+    with _as_user(user_id):
+        return await simulation_service.create_simulation(data)
 
-async def get_simulation(simulation_id: str) -> Dict[str, Any]:
-    result = await simulation_service.get_simulation(simulation_id, slim=True)
 
+async def get_simulation(
+    simulation_id: str,
+    user_id: Optional[int] = None,
+    profile: Optional[str] = None,
+    fields: Optional[str] = None,
+) -> Dict[str, Any]:
+    projection = resolve_fields(profile, fields)
+    with _as_user(user_id):
+        result = await simulation_service.get_simulation(
+            simulation_id, slim=True, fields=projection
+        )
+
+    if not simulation_service.should_dump_debug():
+        return result
     print(f"[DEBUG] Controller get_simulation result keys: {list(result.keys())}")
     if "simulation" in result:
         sim = result["simulation"]
@@ -37,22 +71,142 @@ async def get_simulation(simulation_id: str) -> Dict[str, Any]:
 
 
 async def advance_simulation(
-    simulation_id: str, payload: SimulationAdvanceRequest
+    simulation_id: str,
+    payload: SimulationAdvanceRequest,
+    user_id: Optional[int] = None,
+    profile: Optional[str] = None,
+    fields: Optional[str] = None,
 ) -> Dict[str, Any]:
-    return await simulation_service.advance_simulation(
-        simulation_id, _serialize(payload)
+    projection = resolve_fields(profile, fields)
+    data = _serialize(payload)
+    until_meaningful = data.pop("until_meaningful", True)
+    deadline_seconds = data.pop("deadline_seconds", None)
+    prefetch = data.pop("prefetch", False)
+    with _as_user(user_id):
+        return await simulation_service.advance_simulation(
+            simulation_id,
+            data,
+            fields=projection,
+            until_meaningful=until_meaningful,
+            deadline_seconds=deadline_seconds,
+            prefetch=prefetch,
+        )
+
+
+async def advance_simulations_batch(
+    payload: SimulationBatchAdvanceRequest,
+    user_id: Optional[int] = None,
+    check_access: Optional[Callable[[str], Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Advance several simulations concurrently; failures are reported per item.
+    ``check_access`` runs per item, so a denied or unknown id only fails itself.
+    """
+    limit = min(
+        payload.max_concurrency or settings.simulation_batch_max_concurrency,
+        settings.simulation_batch_max_concurrency,
     )
+    semaphore = asyncio.Semaphore(limit)
+
+    async def _advance_one(item) -> Dict[str, Any]:
+        async with semaphore:
+            try:
+                if check_access is not None:
+                    check_access(item.simulation_id)
+                result = await advance_simulation(
+                    item.simulation_id,
+                    SimulationAdvanceRequest(steps=item.steps),
+                    user_id=user_id,
+                )
+                return {"simulation_id": item.simulation_id, "ok": True, "result": result}
+            except HTTPException as exc:
+                return {
+                    "simulation_id": item.simulation_id,
+                    "ok": False,
+                    "error": {"status": exc.status_code, "detail": exc.detail},
+                }
+            except Exception as exc:
+                print(f"[BATCH ADVANCE ERROR] {item.simulation_id}: {exc}")
+                return {
+                    "simulation_id": item.simulation_id,
+                    "ok": False,
+                    "error": {"status": 500, "detail": "Simulation service error"},
+                }
+
+    results = await asyncio.gather(*(_advance_one(item) for item in payload.items))
+    succeeded = sum(1 for r in results if r["ok"])
+    return {
+        "results": results,
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+    }
 
 
 async def trigger_simulation_fate(
-    simulation_id: str, payload: SimulationFateRequest
+    simulation_id: str,
+    payload: SimulationFateRequest,
+    user_id: Optional[int] = None,
+    profile: Optional[str] = None,
+    fields: Optional[str] = None,
 ) -> Dict[str, Any]:
+    projection = resolve_fields(profile, fields)
     data = _serialize(payload)
     # Ensure an empty body is still sent as {} instead of None
-    return await simulation_service.trigger_fate(simulation_id, data or {})
+    with _as_user(user_id):
+        return await simulation_service.trigger_fate(simulation_id, data or {}, fields=projection)
+
+async def pause_simulation(
+    simulation_id: str,
+    user_id: Optional[int] = None,
+    profile: Optional[str] = None,
+    fields: Optional[str] = None,
+) -> Dict[str, Any]:
+    projection = resolve_fields(profile, fields)
+    with _as_user(user_id):
+        return await simulation_service.pause_simulation(simulation_id, fields=projection)
+
+async def stop_simulation(
+    simulation_id: str,
+    user_id: Optional[int] = None,
+    profile: Optional[str] = None,
+    fields: Optional[str] = None,
+) -> Dict[str, Any]:
+    projection = resolve_fields(profile, fields)
+    with _as_user(user_id):
+        return await simulation_service.stop_simulation(simulation_id, fields=projection)
+
+
+async def stream_simulation(
+    simulation_id: str,
+    *,
+    advance: bool = True,
+    steps: int = 1,
+    interval: float = 1.0,
+    max_turns: Optional[int] = None,
+    user_id: Optional[int] = None,
+    on_advance: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    current_provider_user.set(user_id)  # generator runs in the response task
+    async for item in simulation_service.stream_simulation(
+        simulation_id,
+        advance=advance,
+        steps=steps,
+        interval=interval,
+        max_turns=max_turns,
+        on_advance=on_advance,
+    ):
+        yield item
+
+
+async def get_simulation_delta(
+    simulation_id: str, after: Optional[str] = None, user_id: Optional[int] = None
+) -> Dict[str, Any]:
+    with _as_user(user_id):
+        return await simulation_service.get_simulation_delta(simulation_id, after)
 
-async def pause_simulation(simulation_id: str) -> Dict[str, Any]:
-    return await simulation_service.pause_simulation(simulation_id)
 
-async def stop_simulation(simulation_id: str) -> Dict[str, Any]:
-    return await simulation_service.stop_simulation(simulation_id)
+async def open_simulation_passthrough(
+    simulation_id: str, user_id: Optional[int] = None
+) -> Tuple[Dict[str, str], AsyncIterator[bytes]]:
+    with _as_user(user_id):
+        return await simulation_service.open_passthrough(simulation_id)
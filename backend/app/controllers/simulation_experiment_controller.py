@@ -0,0 +1,252 @@
+# ===============================
+# app/controllers/simulation_experiment_controller.py
+# ===============================
+
+import json
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models.simulation_experiment_model import (
+    SimulationExperiment,
+    SimulationExperimentRun,
+    SimulationExperimentStatus,
+    SimulationRunStatus,
+)
+from app.db.schemas.simulation_schema import (
+    SimulationExperimentRequest,
+    SimulationExperimentResponse,
+    SimulationExperimentRunResponse,
+)
+from app.services import simulation_experiment_service
+
+
+def _value(enum_value) -> str:
+    return enum_value.value if hasattr(enum_value, "value") else str(enum_value)
+
+
+def _serialize_run(run: SimulationExperimentRun) -> Dict[str, Any]:
+    return SimulationExperimentRunResponse(
+        runid=run.runid,
+        run_index=run.run_index,
+        params=json.loads(run.params),
+        simulation_id=run.simulation_id,
+        status=_value(run.status),
+        turns_completed=run.turns_completed or 0,
+        summary=json.loads(run.summary) if run.summary else None,
+        error=run.error,
+        started_at=run.started_at,
+        finished_at=run.finished_at,
+    ).model_dump()
+
+
+def serialize_experiment(
+    exp: SimulationExperiment,
+    runs: List[SimulationExperimentRun],
+    include_runs: bool = True,
+    runs_by_status: Optional[Dict[str, int]] = None,
+) -> Dict[str, Any]:
+    if runs_by_status is None:
+        runs_by_status = dict(Counter(_value(r.status) for r in runs))
+    return SimulationExperimentResponse(
+        experimentid=exp.experimentid,
+        userid=exp.userid,
+        projectid=exp.projectid,
+        scenarioid=exp.scenarioid,
+        name=exp.name,
+        status=_value(exp.status),
+        turns_per_run=exp.turns_per_run,
+        steps_per_turn=exp.steps_per_turn or 1,
+        max_concurrency=exp.max_concurrency or 1,
+        total_runs=sum(runs_by_status.values()),
+        runs_by_status=runs_by_status,
+        runs=[_serialize_run(r) for r in runs] if include_runs else None,
+        error=exp.error,
+        created_at=exp.created_at,
+        started_at=exp.started_at,
+        finished_at=exp.finished_at,
+    ).model_dump()
+
+
+def _runs(db: Session, experimentid: int) -> List[SimulationExperimentRun]:
+    return (
+        db.query(SimulationExperimentRun)
+        .execution_options(populate_existing=True)
+        .filter(SimulationExperimentRun.experimentid == experimentid)
+        .order_by(SimulationExperimentRun.run_index.asc())
+        .all()
+    )
+
+
+# ============================================================
+# 🔹 CREATE EXPERIMENT
+# ============================================================
+def create_experiment(db: Session, payload: SimulationExperimentRequest, userid: int) -> Dict[str, Any]:
+    """Expand the grid, persist one run row per variant and start the sweep."""
+    grid = payload.grid.model_dump(by_alias=True, exclude_none=True)
+    variants = simulation_experiment_service.expand_grid(grid)
+    if len(variants) > settings.simulation_experiment_max_runs:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Grid expands to {len(variants)} runs (max {settings.simulation_experiment_max_runs})",
+        )
+
+    template = payload.template.model_dump(by_alias=True, exclude_none=True)
+    try:
+        exp = SimulationExperiment(
+            userid=userid,
+            projectid=payload.template.projectid,
+            scenarioid=payload.template.scenarioid,
+            name=payload.name,
+            status=SimulationExperimentStatus.queued,
+            template=json.dumps(template),
+            grid=json.dumps(grid),
+            turns_per_run=payload.turns_per_run,
+            steps_per_turn=payload.steps_per_turn,
+            max_concurrency=payload.max_concurrency,
+        )
+        db.add(exp)
+        db.flush()
+        db.add_all([
+            SimulationExperimentRun(
+                experimentid=exp.experimentid,
+                run_index=i,
+                params=json.dumps(params),
+                status=SimulationRunStatus.pending,
+                turns_completed=0,
+            )
+            for i, params in enumerate(variants)
+        ])
+        db.commit()
+        db.refresh(exp)
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+    simulation_experiment_service.start_experiment(exp.experimentid)
+    return serialize_experiment(exp, _runs(db, exp.experimentid), include_runs=False)
+
+
+# ============================================================
+# 🔹 GET / LIST (owner only)
+# ============================================================
+def get_experiment_or_404(db: Session, experimentid: int, userid: int) -> SimulationExperiment:
+    exp = (
+        db.query(SimulationExperiment)
+        .execution_options(populate_existing=True)
+        .filter(SimulationExperiment.experimentid == experimentid, SimulationExperiment.is_deleted == False)
+        .first()
+    )
+    if not exp or exp.userid != userid:
+        raise HTTPException(status_code=404, detail="Experiment not found")
+    return exp
+
+
+def get_experiment(db: Session, experimentid: int, userid: int) -> Dict[str, Any]:
+    exp = get_experiment_or_404(db, experimentid, userid)
+    return serialize_experiment(exp, _runs(db, experimentid))
+
+
+def list_experiments(db: Session, userid: int, limit: int = 20) -> List[Dict[str, Any]]:
+    experiments = (
+        db.query(SimulationExperiment)
+        .filter(SimulationExperiment.userid == userid, SimulationExperiment.is_deleted == False)
+        .order_by(SimulationExperiment.created_at.desc())
+        .limit(limit)
+        .all()
+    )
+    counts: Dict[int, Dict[str, int]] = {}
+    if experiments:
+        rows = (
+            db.query(SimulationExperimentRun.experimentid, SimulationExperimentRun.status, func.count())
+            .filter(SimulationExperimentRun.experimentid.in_([e.experimentid for e in experiments]))
+            .group_by(SimulationExperimentRun.experimentid, SimulationExperimentRun.status)
+            .all()
+        )
+        for experimentid, status, n in rows:
+            counts.setdefault(experimentid, {})[_value(status)] = n
+    return [
+        serialize_experiment(e, [], include_runs=False, runs_by_status=counts.get(e.experimentid, {}))
+        for e in experiments
+    ]
+
+
+# ============================================================
+# 🔹 CANCEL EXPERIMENT
+# ============================================================
+def cancel_experiment(db: Session, experimentid: int, userid: int) -> Dict[str, Any]:
+    """Runs notice the status change before their next turn."""
+    exp = get_experiment_or_404(db, experimentid, userid)
+    if exp.status not in simulation_experiment_service.ACTIVE_STATUSES:
+        raise HTTPException(status_code=400, detail=f"Experiment already {_value(exp.status)}")
+
+    exp.status = SimulationExperimentStatus.cancelled
+    exp.finished_at = datetime.utcnow()
+    db.query(SimulationExperimentRun).filter(
+        SimulationExperimentRun.experimentid == experimentid,
+        SimulationExperimentRun.status == SimulationRunStatus.pending,
+    ).update({SimulationExperimentRun.status: SimulationRunStatus.cancelled}, synchronize_session=False)
+    db.commit()
+    return get_experiment(db, experimentid, userid)
+
+
+# ============================================================
+# 🔹 COMPARISON TABLE
+# ============================================================
+COMPARISON_COLUMNS = (
+    "run_index",
+    "agents",
+    "relationships",
+    "fate_prompt",
+    "repeat",
+    "status",
+    "simulation_id",
+    "turns_completed",
+    "turn",
+    "provider_status",
+    "event_count",
+    "meaningful_turns",
+    "events_skipped",
+    "provider_ms",
+    "emotions",
+    "last_event",
+)
+
+
+def _comparison_row(run: SimulationExperimentRun) -> Dict[str, Any]:
+    params = json.loads(run.params)
+    summary = json.loads(run.summary) if run.summary else {}
+    agents = params.get("custom_agents")
+    return {
+        "run_index": run.run_index,
+        "agents": [a.get("name") for a in agents] if agents else None,
+        "relationships": len(params["relationships"]) if params.get("relationships") else None,
+        "fate_prompt": params.get("fate_prompt"),
+        "repeat": params.get("repeat", 0),
+        "status": _value(run.status),
+        "simulation_id": run.simulation_id,
+        "turns_completed": run.turns_completed or 0,
+        "turn": summary.get("turn"),
+        "provider_status": summary.get("provider_status"),
+        "event_count": summary.get("event_count"),
+        "meaningful_turns": summary.get("meaningful_turns"),
+        "events_skipped": summary.get("events_skipped"),
+        "provider_ms": summary.get("provider_ms"),
+        "emotions": summary.get("emotions"),
+        "last_event": (summary.get("last_events") or [None])[-1],
+    }
+
+
+def get_comparison(db: Session, experimentid: int, userid: int) -> Dict[str, Any]:
+    exp = get_experiment_or_404(db, experimentid, userid)
+    return {
+        "experimentid": exp.experimentid,
+        "status": _value(exp.status),
+        "columns": list(COMPARISON_COLUMNS),
+        "rows": [_comparison_row(r) for r in _runs(db, experimentid)],
+    }
@@ -0,0 +1,95 @@
+# ===============================
+# app/controllers/simulation_job_controller.py
+# ===============================
+
+import json
+from datetime import datetime
+from typing import Any, Dict
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.db.models.simulation_job_model import SimulationJob, SimulationJobStatus
+from app.db.schemas.simulation_schema import SimulationAutorunRequest, SimulationJobResponse
+from app.services import simulation_autorun_service
+
+
+def serialize_job(job: SimulationJob) -> Dict[str, Any]:
+    data = SimulationJobResponse(
+        jobid=job.jobid,
+        simulation_id=job.simulation_id,
+        userid=job.userid,
+        status=job.status.value if hasattr(job.status, "value") else str(job.status),
+        turns_requested=job.turns_requested,
+        turns_completed=job.turns_completed or 0,
+        steps_per_turn=job.steps_per_turn or 1,
+        pacing_seconds=job.pacing_seconds or 0,
+        stop_conditions=json.loads(job.stop_conditions) if job.stop_conditions else None,
+        progress=json.loads(job.progress) if job.progress else None,
+        error=job.error,
+        created_at=job.created_at,
+        updated_at=job.updated_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+    )
+    return data.model_dump()
+
+
+# ============================================================
+# 🔹 CREATE AUTO-RUN JOB
+# ============================================================
+def create_autorun_job(
+    db: Session, simulation_id: str, payload: SimulationAutorunRequest, userid: int
+) -> SimulationJob:
+    """Persist a queued job and hand it to this worker."""
+    try:
+        job = SimulationJob(
+            simulation_id=simulation_id,
+            userid=userid,
+            status=SimulationJobStatus.queued,
+            turns_requested=payload.turns,
+            turns_completed=0,
+            steps_per_turn=payload.steps,
+            pacing_seconds=payload.pacing_seconds,
+            stop_conditions=json.dumps(payload.stop_conditions.model_dump()),
+        )
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+    simulation_autorun_service.start_job(job.jobid)
+    return job
+
+
+# ============================================================
+# 🔹 GET JOB (owner only)
+# ============================================================
+def get_job(db: Session, jobid: int, userid: int) -> SimulationJob:
+    job = (
+        db.query(SimulationJob)
+        .execution_options(populate_existing=True)
+        .filter(SimulationJob.jobid == jobid, SimulationJob.is_deleted == False)
+        .first()
+    )
+    if not job or job.userid != userid:
+        raise HTTPException(status_code=404, detail="Simulation job not found")
+    return job
+
+
+# ============================================================
+# 🔹 CANCEL JOB
+# ============================================================
+def cancel_job(db: Session, jobid: int, userid: int) -> SimulationJob:
+    """The worker notices the status change before its next turn."""
+    job = get_job(db, jobid, userid)
+    if job.status not in simulation_autorun_service.ACTIVE_STATUSES:
+        raise HTTPException(status_code=400, detail=f"Job already {job.status.value}")
+
+    job.status = SimulationJobStatus.cancelled
+    job.finished_at = datetime.utcnow()
+    db.commit()
+    db.refresh(job)
+    return job
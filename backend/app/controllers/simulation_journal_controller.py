@@ -0,0 +1,51 @@
+# ===============================
+# app/controllers/simulation_journal_controller.py
+# ===============================
+
+import json
+from typing import Any, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.db.models.simulation_event_model import SimulationEvent
+
+
+# ============================================================
+# 🔹 LIST JOURNALED EVENTS BY TURN RANGE
+# ============================================================
+def list_events(
+    db: Session,
+    simulation_id: str,
+    from_turn: Optional[int] = None,
+    to_turn: Optional[int] = None,
+    after_id: Optional[int] = None,
+    limit: int = 500,
+) -> Dict[str, Any]:
+    """
+    Journaled events for one simulation in provider order, optionally
+    restricted to [from_turn, to_turn]. Page with `after_id` = next_after_id.
+    """
+    query = db.query(SimulationEvent).filter(SimulationEvent.simulation_id == simulation_id)
+    if from_turn is not None:
+        query = query.filter(SimulationEvent.turn >= from_turn)
+    if to_turn is not None:
+        query = query.filter(SimulationEvent.turn <= to_turn)
+    if after_id is not None:
+        query = query.filter(SimulationEvent.eventid > after_id)
+
+    rows = query.order_by(SimulationEvent.eventid.asc()).limit(limit).all()
+    return {
+        "simulation_id": simulation_id,
+        "events": [
+            {
+                "eventid": r.eventid,
+                "seq": r.seq,
+                "turn": r.turn,
+                "type": r.event_type,
+                "actor_id": r.actor_id,
+                "event": json.loads(r.payload),
+            }
+            for r in rows
+        ],
+        "next_after_id": rows[-1].eventid if len(rows) == limit else None,
+    }
@@ -0,0 +1,189 @@
+# ===============================
+# app/controllers/simulation_session_controller.py
+# Registry of provider simulation ids → user / project / scenario
+# ===============================
+
+import json
+from datetime import datetime
+from math import ceil
+from typing import Any, Dict, List, Optional
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.db.models.simulation_session_model import SimulationSession
+from app.db.schemas.simulation_schema import SimulationSessionResponse
+from app.services.simulation_service import payload_agents_cache, provider_pool
+from app.services.utils.config_helper import get_int_config
+
+ADMIN_ROLES = {"admin", "superadmin"}
+STOPPED_STATUSES = {"stopped", "completed", "finished", "terminated"}
+
+
+def _get_session(db: Session, simulation_id: str) -> Optional[SimulationSession]:
+    return (
+        db.query(SimulationSession)
+        .filter(SimulationSession.simulation_id == simulation_id, SimulationSession.is_deleted == False)
+        .first()
+    )
+
+
+# ============================================================
+# 🔹 REGISTER ON CREATE
+# ============================================================
+def register_session(
+    db: Session,
+    *,
+    result: Dict[str, Any],
+    userid: int,
+    projectid: Optional[int] = None,
+    scenarioid: Optional[int] = None,
+    forked_from_checkpointid: Optional[int] = None,
+) -> Optional[SimulationSession]:
+    """
+    Record a freshly created provider simulation. Raises 500 if the row
+    cannot be written: check_access denies unregistered ids, so the
+    creator could not reach the simulation anyway.
+    """
+    sim = result.get("simulation") or result
+    simulation_id = sim.get("id")
+    if not simulation_id:
+        return None
+    try:
+        agent_names = payload_agents_cache.get(simulation_id) or []
+        session = SimulationSession(
+            simulation_id=simulation_id,
+            userid=userid,
+            projectid=projectid,
+            scenarioid=scenarioid,
+            forked_from_checkpointid=forked_from_checkpointid,
+            provider_endpoint=provider_pool.lookup(simulation_id),
+            status=(sim.get("status") or "running").lower(),
+            scenario_excerpt=(sim.get("scenario") or "")[:200],
+            agent_names=json.dumps(agent_names),
+            event_count=len(sim.get("events") or []),
+        )
+        db.add(session)
+        db.commit()
+        return session
+    except Exception as e:
+        db.rollback()
+        print(f"⚠️ [SESSION REGISTRY] Failed to register {simulation_id}: {e}")
+        raise HTTPException(status_code=500, detail="Simulation created but could not be registered")
+
+
+# ============================================================
+# 🔹 OWNERSHIP CHECK (single indexed lookup)
+# ============================================================
+def check_access(db: Session, simulation_id: str, current_user) -> Optional[SimulationSession]:
+    """
+    403 if the simulation is registered to another user, 404 if it is not
+    registered at all (admins exempt from both). Also warms this worker's cast
+    cache and endpoint binding from the registry so slimming and routing
+    are correct on any worker.
+    """
+    role = (getattr(current_user, "role", None) or "user")
+    role = role.value if hasattr(role, "value") else str(role)
+    is_admin = role.lower() in ADMIN_ROLES
+
+    session = _get_session(db, simulation_id)
+    if session is None:
+        if is_admin:
+            return None
+        raise HTTPException(status_code=404, detail="Simulation not found")
+    if session.userid != current_user.userid and not is_admin:
+        raise HTTPException(status_code=403, detail="You do not have access to this simulation")
+
+    _warm(session)
+    return session
+
+
+def _warm(session: SimulationSession) -> None:
+    simulation_id = session.simulation_id
+    if payload_agents_cache.get(simulation_id) is None and session.agent_names:
+        names = json.loads(session.agent_names)
+        if names:
+            payload_agents_cache.set(simulation_id, names)
+    if session.provider_endpoint and provider_pool.lookup(simulation_id) is None:
+        provider_pool.bind(simulation_id, session.provider_endpoint)
+
+
+def warm_caches(db: Session, simulation_id: str) -> None:
+    """Cast cache + endpoint binding for background work (no user check)."""
+    session = _get_session(db, simulation_id)
+    if session is not None:
+        _warm(session)
+
+
+# ============================================================
+# 🔹 RECORD ACTIVITY (advance / fate / pause / stop / view)
+# ============================================================
+def record_activity(
+    db: Session, simulation_id: str, result: Optional[Dict[str, Any]] = None, status: Optional[str] = None
+) -> None:
+    try:
+        session = _get_session(db, simulation_id)
+        if session is None:
+            return
+        sim = (result or {}).get("simulation") or {}
+        session.status = (status or sim.get("status") or session.status or "").lower()
+        if isinstance(sim.get("turn"), int):
+            session.last_turn = max(session.last_turn or 0, sim["turn"])
+        if isinstance(sim.get("event_count"), int):
+            session.event_count = max(session.event_count or 0, sim["event_count"])
+        session.last_seen_at = datetime.utcnow()
+        if (session.status or "").lower() in STOPPED_STATUSES and not session.stopped_at:
+            session.stopped_at = datetime.utcnow()
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"⚠️ [SESSION REGISTRY] Failed to update {simulation_id}: {e}")
+
+
+# ============================================================
+# 🔹 LIST MY SIMULATIONS (paginated)
+# ============================================================
+def list_sessions(
+    db: Session,
+    userid: int,
+    page: int = 1,
+    limit: Optional[int] = None,
+    status: Optional[str] = None,
+    projectid: Optional[int] = None,
+    scenarioid: Optional[int] = None,
+) -> Dict[str, Any]:
+    if limit is None:
+        limit = get_int_config(db, "LogPaginationLimit", 20)
+
+    query = db.query(SimulationSession).filter(
+        SimulationSession.userid == userid,
+        SimulationSession.is_deleted == False,
+    )
+    if status and status.lower() != "all":
+        query = query.filter(SimulationSession.status == status.lower())
+    if projectid is not None:
+        query = query.filter(SimulationSession.projectid == projectid)
+    if scenarioid is not None:
+        query = query.filter(SimulationSession.scenarioid == scenarioid)
+
+    total = query.count()
+    sessions: List[SimulationSession] = (
+        query.order_by(SimulationSession.last_seen_at.desc())
+        .offset((page - 1) * limit)
+        .limit(limit)
+        .all()
+    )
+    return {
+        "items": [SimulationSessionResponse.model_validate(s) for s in sessions],
+        "page": page,
+        "limit": limit,
+        "total": total,
+        "total_pages": ceil(total / limit) if total else 1,
+    }
+
+
+def get_session_or_404(db: Session, simulation_id: str) -> SimulationSession:
+    session = _get_session(db, simulation_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Simulation is not registered")
+    return session
@@ -14,6 +14,74 @@ class Settings(BaseSettings):
     simulation_service_base_url: str = "https://new-model-r733.onrender.com"
     simulation_service_timeout_seconds: int = 30
     simulation_service_api_key: str | None = None
+    # Extra provider endpoints, e.g. ["https://a.onrender.com", "https://b.onrender.com"].
+    # Empty = only simulation_service_base_url. The first entry is the primary.
+    simulation_service_base_urls: list[str] = []
+    simulation_pool_probe_interval_seconds: float = 15.0
+    simulation_pool_probe_timeout_seconds: float = 3.0
+    simulation_pool_health_path: str = "/health"
+    simulation_pool_ewma_alpha: float = 0.3
+    simulation_pool_unhealthy_after_failures: int = 3
+
+    # Simulation provider HTTP client (shared, app-lifetime pool)
+    simulation_service_http2: bool = False
+    simulation_service_max_connections: int = 100
+    simulation_service_max_keepalive_connections: int = 20
+    simulation_service_keepalive_expiry_seconds: float = 30.0
+    simulation_service_connect_timeout_seconds: float = 5.0
+    simulation_service_pool_timeout_seconds: float = 5.0
+    # Per-operation read timeouts, e.g. {"advance": 60, "get": 10}
+    simulation_service_operation_timeouts: dict[str, float] = {}
+    # Short-lived cache of slimmed GET results shared by all viewers (0 = off)
+    simulation_read_cache_ttl_seconds: float = 0.0
+    # Circuit breaker + retry budget for provider calls
+    simulation_breaker_failure_threshold: int = 5
+    simulation_breaker_recovery_seconds: float = 30.0
+    simulation_retry_budget_ratio: float = 0.2
+    simulation_retry_budget_min_retries: int = 10
+    simulation_retry_budget_window_seconds: float = 10.0
+    simulation_retry_backoff_base_seconds: float = 0.5
+    simulation_retry_backoff_max_seconds: float = 8.0
+    # Fair scheduler in front of provider calls
+    simulation_scheduler_max_concurrent: int = 32
+    simulation_scheduler_max_queued_per_user: int = 8
+    simulation_scheduler_max_queued_total: int = 500
+    simulation_batch_max_concurrency: int = 8
+    # Server-side "advance until meaningful" loop
+    simulation_advance_max_attempts: int = 5
+    simulation_advance_deadline_seconds: float = 45.0
+    simulation_advance_backoff_initial_seconds: float = 0.1
+    simulation_advance_backoff_max_seconds: float = 1.0
+    # Speculative next-turn advance (opt-in per request with "prefetch": true)
+    simulation_prefetch_max_outstanding: int = 50
+    simulation_prefetch_ttl_seconds: float = 120.0
+    # Fraction of simulation responses whose full payload is printed (0 = off)
+    simulation_debug_payload_sample_rate: float = 0.0
+    # Hedged GET /simulations/{id} (second request after the p-th percentile latency)
+    simulation_hedge_enabled: bool = False
+    simulation_hedge_percentile: float = 95.0
+    simulation_hedge_min_delay_seconds: float = 0.1
+    simulation_hedge_min_samples: int = 20
+    # Auto-run jobs: heartbeat age before another worker resumes a job
+    simulation_autorun_stale_seconds: int = 300
+    simulation_autorun_sweep_seconds: int = 60
+    # Simulation event journal writer
+    simulation_journal_batch_size: int = 500
+    simulation_journal_flush_seconds: float = 1.0
+    simulation_journal_queue_size: int = 50000
+    # Parameter-sweep experiments
+    simulation_experiment_max_runs: int = 100
+    simulation_experiment_max_concurrency: int = 5
+    # Save the final provider state to result_tbl when a simulation is stopped
+    simulation_autosave_on_stop: bool = True
+    # Per-simulation cast names used by the slim filter
+    simulation_agent_cache_max_entries: int = 1000
+    simulation_agent_cache_ttl_seconds: float = 6 * 60 * 60
+    # Bulk save of simulation results: batched INSERTs, COPY from this many rows
+    result_bulk_insert_batch_size: int = 5000
+    result_bulk_copy_threshold: int = 20000
+    # Chunked result uploads (/results/uploads): max NDJSON bytes per chunk
+    result_upload_max_chunk_bytes: int = 8 * 1024 * 1024
     stripe_webhook_secret : str = ""
 
     # Email settings
@@ -0,0 +1,4 @@
+# ===============================
+# app/db/benchmarks — manual query-plan / latency checks against Postgres
+# Run with: python -m app.db.benchmarks.<name>
+# ===============================
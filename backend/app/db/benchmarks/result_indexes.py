@@ -0,0 +1,173 @@
+# ===============================
+# app/db/benchmarks/result_indexes.py
+# Query plans + latencies for the result access paths, before/after the
+# composite indexes from migrations/result_access_indexes.py
+#   python -m app.db.benchmarks.result_indexes [--rows 10000000] [--keep]
+# Works on a scratch UNLOGGED copy (result_bench_tbl); result_tbl is not touched.
+# ===============================
+
+import argparse
+import random
+import statistics
+import time
+from typing import Any, Dict, List
+
+from sqlalchemy import text
+
+from app.db.database import engine
+from app.db.migrations.result_access_indexes import index_ddl
+
+TABLE = "result_bench_tbl"
+AGENTS_PER_SCENARIO = 8
+RESULT_TYPES = ("system", "emotion", "memory", "corrosion", "position")
+
+CREATE_TABLE = f"""
+CREATE UNLOGGED TABLE {TABLE} (
+    resultid BIGINT PRIMARY KEY,
+    projectagentid INTEGER,
+    scenarioid INTEGER NOT NULL,
+    resulttype result_type,
+    sequence_no INTEGER,
+    confidence_score DOUBLE PRECISION,
+    resulttext TEXT,
+    status lifecycle_status DEFAULT 'active',
+    created_at TIMESTAMP DEFAULT now(),
+    updated_at TIMESTAMP DEFAULT now(),
+    deleted_at TIMESTAMP,
+    is_deleted BOOLEAN DEFAULT false
+)
+"""
+
+# Row g: scenario g / rows_per_scenario, 8 agents per scenario, types round-robin, 1% soft-deleted
+FILL = f"""
+INSERT INTO {TABLE} (resultid, projectagentid, scenarioid, resulttype, sequence_no, resulttext, created_at, is_deleted)
+SELECT g,
+       (g / :per_scenario) * {AGENTS_PER_SCENARIO} + g % {AGENTS_PER_SCENARIO},
+       g / :per_scenario + 1,
+       (ARRAY{list(RESULT_TYPES)}::result_type[])[1 + g % {len(RESULT_TYPES)}],
+       g % :per_scenario + 1,
+       '{{"turn": ' || (g % :per_scenario) / 20 || ', "who": "System", "text": "bench row ' || g || '"}}',
+       timestamp '2025-01-01' + g * interval '1 millisecond',
+       g % 100 = 0
+  FROM generate_series(:lo, :hi) AS g
+"""
+
+QUERIES = {
+    "agent_scenario_type": (
+        f"SELECT * FROM {TABLE} WHERE projectagentid = :agent AND scenarioid = :scenario "
+        "AND resulttype = CAST(:rtype AS result_type) AND is_deleted = false ORDER BY sequence_no"
+    ),
+    "replay_rows": (
+        f"SELECT * FROM {TABLE} WHERE scenarioid = :scenario AND is_deleted = false "
+        "ORDER BY sequence_no, created_at"
+    ),
+    # Replay ordering only — the part the index can answer without the heap
+    "replay_order_index_only": (
+        f"SELECT sequence_no, created_at FROM {TABLE} WHERE scenarioid = :scenario AND is_deleted = false "
+        "ORDER BY sequence_no, created_at"
+    ),
+}
+
+
+def _params(scenarios: int) -> Dict[str, Any]:
+    scenario = random.randint(1, scenarios)
+    return {
+        "scenario": scenario,
+        "agent": (scenario - 1) * AGENTS_PER_SCENARIO + random.randrange(AGENTS_PER_SCENARIO),
+        "rtype": random.choice(RESULT_TYPES),
+    }
+
+
+def build_table(rows: int, per_scenario: int, chunk: int) -> None:
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+        conn.execute(text(CREATE_TABLE))
+    started = time.monotonic()
+    for lo in range(0, rows, chunk):
+        hi = min(lo + chunk, rows) - 1
+        with engine.begin() as conn:
+            conn.execute(text(FILL), {"lo": lo, "hi": hi, "per_scenario": per_scenario})
+        print(f"[BENCH] filled {hi + 1:,}/{rows:,} rows ({time.monotonic() - started:.0f}s)")
+    _vacuum()
+
+
+def _vacuum() -> None:
+    # Sets the visibility map so index-only scans skip heap fetches
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text(f"VACUUM ANALYZE {TABLE}"))
+
+
+def create_indexes() -> None:
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for ddl in index_ddl(table=TABLE, prefix="ix_result_bench", concurrently=False):
+            started = time.monotonic()
+            conn.execute(text(ddl))
+            print(f"[BENCH] {ddl} — {time.monotonic() - started:.1f}s")
+    _vacuum()
+
+
+def explain(name: str, params: Dict[str, Any]) -> List[str]:
+    with engine.connect() as conn:
+        return [
+            line for (line,) in conn.execute(
+                text(f"EXPLAIN (ANALYZE, BUFFERS, COSTS OFF) {QUERIES[name]}"), params
+            )
+        ]
+
+
+def latency(name: str, scenarios: int, runs: int) -> Dict[str, float]:
+    timings = []
+    with engine.connect() as conn:
+        for _ in range(runs):
+            params = _params(scenarios)
+            started = time.perf_counter()
+            conn.execute(text(QUERIES[name]), params).fetchall()
+            timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return {
+        "p50_ms": round(statistics.median(timings), 2),
+        "p95_ms": round(timings[int(len(timings) * 0.95) - 1], 2),
+        "max_ms": round(timings[-1], 2),
+    }
+
+
+def report(label: str, scenarios: int, runs: int) -> Dict[str, Dict[str, float]]:
+    print(f"\n==================== {label} ====================")
+    results = {}
+    for name in QUERIES:
+        plan = explain(name, _params(scenarios))
+        stats = latency(name, scenarios, runs)
+        results[name] = stats
+        print(f"\n--- {name}: {stats}")
+        for line in plan:
+            print(f"    {line}")
+    return results
+
+
+def run(rows: int, per_scenario: int, runs: int, chunk: int, keep: bool) -> None:
+    scenarios = max(1, rows // per_scenario)
+    print(f"[BENCH] {rows:,} rows, {scenarios:,} scenarios × {per_scenario:,} rows, {runs} runs per query")
+    try:
+        build_table(rows, per_scenario, chunk)
+        before = report("without composite indexes", scenarios, runs)
+        create_indexes()
+        after = report("with composite indexes", scenarios, runs)
+
+        print("\n==================== summary (p50 ms) ====================")
+        for name in QUERIES:
+            print(f"{name:28} {before[name]['p50_ms']:>10} → {after[name]['p50_ms']:>8}")
+    finally:
+        if not keep:
+            with engine.begin() as conn:
+                conn.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark result_tbl access paths with and without composite indexes")
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--rows-per-scenario", type=int, default=2_000)
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--chunk", type=int, default=1_000_000, help="rows per fill transaction")
+    parser.add_argument("--keep", action="store_true", help="keep result_bench_tbl afterwards")
+    args = parser.parse_args()
+    run(args.rows, args.rows_per_scenario, args.runs, args.chunk, args.keep)
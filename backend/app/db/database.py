@@ -17,6 +17,12 @@ def test_connection():
 
 def init_db():
     Base.metadata.create_all(bind=engine)
+    # create_all never adds columns to an existing result_tbl; every Result
+    # query selects resultdata, so add it here (catalog-only, IF NOT EXISTS).
+    # Backfill + expression indexes stay in the migration: until it runs,
+    # older rows only match unfiltered replay reads.
+    from app.db.migrations.result_payload_jsonb import add_column
+    add_column()
 
 def get_db():
     db = SessionLocal()
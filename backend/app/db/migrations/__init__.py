@@ -0,0 +1,4 @@
+# ===============================
+# app/db/migrations — one-off schema changes init_db() (create_all) cannot make
+# Run with: python -m app.db.migrations.<name>
+# ===============================
@@ -0,0 +1,58 @@
+# ===============================
+# app/db/migrations/result_access_indexes.py
+# result_tbl: composite indexes for the result access paths, live rows only
+#   python -m app.db.migrations.result_access_indexes
+# Safe to re-run (IF NOT EXISTS); builds CONCURRENTLY, so writes keep flowing.
+# ===============================
+
+from typing import List
+
+from sqlalchemy import text
+
+from app.db.database import engine
+
+# (name suffix, indexed columns) — must match Result.__table_args__
+RESULT_ACCESS_INDEXES = (
+    # list_results_by_agent_scenario_type: = scenarioid, projectagentid, resulttype; ORDER BY sequence_no
+    ("scenario_agent_type_seq", "scenarioid, projectagentid, resulttype, sequence_no"),
+    # get_replay_data / replay stream: = scenarioid; ORDER BY sequence_no, created_at
+    ("scenario_seq", "scenarioid, sequence_no, created_at"),
+)
+
+
+def index_ddl(table: str = "result_tbl", prefix: str = "ix_result", concurrently: bool = True) -> List[str]:
+    mode = "CONCURRENTLY " if concurrently else ""
+    return [
+        f"CREATE INDEX {mode}IF NOT EXISTS {prefix}_{suffix} ON {table} ({columns}) WHERE is_deleted = false"
+        for suffix, columns in RESULT_ACCESS_INDEXES
+    ]
+
+
+def run() -> None:
+    # CONCURRENTLY cannot run inside a transaction block
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        # A failed concurrent build leaves an INVALID index that IF NOT EXISTS would keep
+        for suffix, _ in RESULT_ACCESS_INDEXES:
+            valid = conn.execute(
+                text(
+                    """
+                    SELECT i.indisvalid FROM pg_index i
+                      JOIN pg_class c ON c.oid = i.indexrelid
+                     WHERE c.relname = :name
+                    """
+                ),
+                {"name": f"ix_result_{suffix}"},
+            ).scalar()
+            if valid is False:
+                print(f"⚠️ [MIGRATION] Dropping invalid index ix_result_{suffix}")
+                conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS ix_result_{suffix}"))
+
+        for ddl in index_ddl():
+            print(f"[MIGRATION] {ddl}")
+            conn.execute(text(ddl))
+        conn.execute(text("ANALYZE result_tbl"))
+    print("✅ [MIGRATION] result_access_indexes complete")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,105 @@
+# ===============================
+# app/db/migrations/result_payload_jsonb.py
+# result_tbl: JSON-in-Text resulttext → JSONB resultdata + expression indexes
+#   python -m app.db.migrations.result_payload_jsonb [--batch-size 20000]
+# Safe to re-run: every step is IF NOT EXISTS / only touches NULL rows.
+# init_db() runs add_column() on every startup; this script does the rest.
+# ===============================
+
+import argparse
+import time
+
+from sqlalchemy import text
+
+from app.db.database import engine
+
+TRY_JSONB_FUNCTION = """
+CREATE OR REPLACE FUNCTION result_try_jsonb(value text) RETURNS jsonb
+LANGUAGE plpgsql IMMUTABLE AS $$
+BEGIN
+    RETURN value::jsonb;
+EXCEPTION WHEN others THEN
+    RETURN NULL;
+END;
+$$
+"""
+
+# Must match the Index() definitions in app/db/models/result_model.py
+INDEXES = (
+    """CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_result_data_turn
+       ON result_tbl (scenarioid, (resultdata -> 'turn')) WHERE is_deleted = false""",
+    """CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_result_data_agent
+       ON result_tbl (scenarioid, (resultdata ->> 'agent')) WHERE is_deleted = false""",
+)
+
+
+def add_column() -> None:
+    # Nullable, no default → catalog-only change, no table rewrite
+    with engine.begin() as conn:
+        exists = conn.execute(
+            text(
+                """
+                SELECT 1 FROM information_schema.columns
+                 WHERE table_name = 'result_tbl' AND column_name = 'resultdata'
+                """
+            )
+        ).scalar()
+        # Skip the ALTER (and its exclusive lock) once the column is there
+        if not exists:
+            print("[MIGRATION] Adding result_tbl.resultdata (JSONB)")
+            conn.execute(text("ALTER TABLE result_tbl ADD COLUMN IF NOT EXISTS resultdata JSONB"))
+        conn.execute(text(TRY_JSONB_FUNCTION))
+
+
+def backfill(batch_size: int) -> int:
+    """Copy resulttext into resultdata in resultid ranges, one short transaction each."""
+    with engine.connect() as conn:
+        lo, hi = conn.execute(text("SELECT MIN(resultid), MAX(resultid) FROM result_tbl")).one()
+    if lo is None:
+        return 0
+
+    updated = 0
+    started = time.monotonic()
+    for start in range(lo, hi + 1, batch_size):
+        with engine.begin() as conn:
+            updated += conn.execute(
+                text(
+                    """
+                    UPDATE result_tbl
+                       SET resultdata = result_try_jsonb(resulttext)
+                     WHERE resultid >= :start AND resultid < :stop
+                       AND resultdata IS NULL AND resulttext IS NOT NULL
+                    """
+                ),
+                {"start": start, "stop": start + batch_size},
+            ).rowcount
+        print(f"[MIGRATION] resultdata backfilled up to id {min(start + batch_size - 1, hi)} ({updated} rows)")
+    print(f"[MIGRATION] Backfill done: {updated} rows in {time.monotonic() - started:.1f}s")
+    return updated
+
+
+def create_indexes() -> None:
+    # CONCURRENTLY cannot run inside a transaction block
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for ddl in INDEXES:
+            conn.execute(text(ddl))
+        conn.execute(text("ANALYZE result_tbl"))
+
+
+def run(batch_size: int = 20000) -> None:
+    add_column()
+    backfill(batch_size)
+    create_indexes()
+    with engine.connect() as conn:
+        unparsed = conn.execute(
+            text("SELECT COUNT(*) FROM result_tbl WHERE resultdata IS NULL AND resulttext IS NOT NULL")
+        ).scalar()
+    if unparsed:
+        print(f"⚠️ [MIGRATION] {unparsed} row(s) have resulttext that is not valid JSON; resultdata left NULL")
+    print("✅ [MIGRATION] result_payload_jsonb complete")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill result_tbl.resultdata (JSONB) from resulttext")
+    parser.add_argument("--batch-size", type=int, default=20000)
+    run(parser.parse_args().batch_size)
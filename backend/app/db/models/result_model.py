@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, Float, Text, TIMESTAMP, ForeignKey, Enum, Boolean
+from sqlalchemy import Column, Integer, Float, Text, TIMESTAMP, ForeignKey, Enum, Boolean, Index, literal_column, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 from app.db.models.user_model import Base
 import enum
@@ -27,9 +28,33 @@ class Result(Base):
     sequence_no = Column(Integer)
     confidence_score = Column(Float)
     resulttext = Column(Text)
+    resultdata = Column(JSONB)   # same payload as resulttext, queryable (see migrations/result_payload_jsonb.py)
     status = Column(Enum(LifecycleStatus, name="lifecycle_status"), default=LifecycleStatus.active)
 
     created_at = Column(TIMESTAMP, server_default=func.now())
     updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
     deleted_at = Column(TIMESTAMP)
-    is_deleted = Column(Boolean, default=False)
\ No newline at end of file
+    is_deleted = Column(Boolean, default=False)
+
+    # Live rows only; see migrations/result_access_indexes.py for existing databases
+    __table_args__ = (
+        # list_results_by_agent_scenario_type
+        Index(
+            "ix_result_scenario_agent_type_seq",
+            "scenarioid", "projectagentid", "resulttype", "sequence_no",
+            postgresql_where=text("is_deleted = false"),
+        ),
+        # get_replay_data / replay stream
+        Index(
+            "ix_result_scenario_seq",
+            "scenarioid", "sequence_no", "created_at",
+            postgresql_where=text("is_deleted = false"),
+        ),
+    )
+
+# Payload keys filtered in SQL. Literal keys (not bind params) so queries match the expression indexes.
+RESULT_DATA_TURN = Result.resultdata.op("->", return_type=JSONB)(literal_column("'turn'"))
+RESULT_DATA_AGENT = Result.resultdata.op("->>", return_type=Text)(literal_column("'agent'"))
+
+Index("ix_result_data_turn", Result.scenarioid, RESULT_DATA_TURN, postgresql_where=Result.is_deleted == False)
+Index("ix_result_data_agent", Result.scenarioid, RESULT_DATA_AGENT, postgresql_where=Result.is_deleted == False)
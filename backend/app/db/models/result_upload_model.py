@@ -0,0 +1,44 @@
+from sqlalchemy import Column, Integer, BigInteger, String, Text, TIMESTAMP, ForeignKey, Enum, Float, Index
+from sqlalchemy.sql import func
+from app.db.models.user_model import Base
+import enum
+
+class ResultUploadStatus(str, enum.Enum):
+    open = "open"
+    committed = "committed"
+    aborted = "aborted"
+
+class ResultUpload(Base):
+    """Chunked save session for simulation results (see /results/uploads)."""
+    __tablename__ = "result_upload_tbl"
+
+    uploadid = Column(String(36), primary_key=True)   # uuid4, handed to the client
+    userid = Column(Integer, ForeignKey("user_tbl.userid", ondelete="CASCADE"), nullable=False)
+    scenarioid = Column(Integer, ForeignKey("scenario_tbl.scenarioid", ondelete="CASCADE"), nullable=False)
+    projectid = Column(Integer, nullable=False)
+    status = Column(Enum(ResultUploadStatus, name="result_upload_status"), default=ResultUploadStatus.open)
+
+    last_chunk_seq = Column(Integer, default=-1)   # highest acknowledged chunk
+    row_count = Column(Integer, default=0)         # staged rows = next sequence_no - 1
+    counts = Column(Text)                          # JSON: rows per result type
+
+    created_at = Column(TIMESTAMP, server_default=func.now())
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
+    committed_at = Column(TIMESTAMP)
+
+class ResultUploadRow(Base):
+    """Staged result rows; moved into result_tbl in one statement on commit."""
+    __tablename__ = "result_upload_row_tbl"
+
+    rowid = Column(BigInteger, primary_key=True)
+    uploadid = Column(String(36), ForeignKey("result_upload_tbl.uploadid", ondelete="CASCADE"), nullable=False)
+    chunk_seq = Column(Integer, nullable=False)
+    sequence_no = Column(Integer, nullable=False)
+    projectagentid = Column(Integer)
+    resulttype = Column(String(20), nullable=False)
+    confidence_score = Column(Float)
+    resulttext = Column(Text)
+
+    __table_args__ = (
+        Index("ix_result_upload_row_upload_seq", "uploadid", "sequence_no"),
+    )
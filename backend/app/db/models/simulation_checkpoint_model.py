@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, ForeignKey, Boolean, LargeBinary, Index
+from sqlalchemy.sql import func
+from app.db.models.user_model import Base
+
+class SimulationStateBlob(Base):
+    """Content-addressed, zlib-compressed piece of simulation state (agent or event segment)."""
+    __tablename__ = "simulation_state_blob_tbl"
+
+    digest = Column(String(64), primary_key=True)   # sha256 of the uncompressed JSON
+    data = Column(LargeBinary, nullable=False)
+    raw_size = Column(Integer, nullable=False)
+    stored_size = Column(Integer, nullable=False)
+    created_at = Column(TIMESTAMP, server_default=func.now())
+
+class SimulationCheckpoint(Base):
+    """Point-in-time snapshot of a simulation; branches share blobs with their parent."""
+    __tablename__ = "simulation_checkpoint_tbl"
+
+    checkpointid = Column(Integer, primary_key=True, index=True)
+    simulation_id = Column(String(100), nullable=False)
+    parent_checkpointid = Column(Integer, ForeignKey("simulation_checkpoint_tbl.checkpointid", ondelete="SET NULL"), nullable=True)
+    userid = Column(Integer, ForeignKey("user_tbl.userid", ondelete="CASCADE"), nullable=False)
+    label = Column(String(100))
+    turn = Column(Integer, default=0)
+    manifest = Column(Text, nullable=False)   # JSON: scenario, agent blob digests, event segment digests
+
+    created_at = Column(TIMESTAMP, server_default=func.now())
+    is_deleted = Column(Boolean, default=False)
+    deleted_at = Column(TIMESTAMP)
+
+    __table_args__ = (
+        Index("ix_simulation_checkpoint_sim", "simulation_id", "created_at"),
+    )
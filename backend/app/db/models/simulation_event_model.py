@@ -0,0 +1,22 @@
+from sqlalchemy import Column, BigInteger, Integer, String, Text, TIMESTAMP, Index, UniqueConstraint
+from sqlalchemy.sql import func
+from app.db.models.user_model import Base
+
+class SimulationEvent(Base):
+    """Append-only journal of every provider event seen by the proxy."""
+    __tablename__ = "simulation_event_tbl"
+
+    eventid = Column(BigInteger, primary_key=True)
+    simulation_id = Column(String(100), nullable=False)
+    event_key = Column(String(120), nullable=False)   # provider id, or content hash
+    seq = Column(Integer)                             # provider order within the run
+    turn = Column(Integer)
+    event_type = Column(String(50))
+    actor_id = Column(String(100))
+    payload = Column(Text, nullable=False)            # JSON, as sent by the provider
+    created_at = Column(TIMESTAMP, server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("simulation_id", "event_key", name="uq_simulation_event_key"),
+        Index("ix_simulation_event_turn", "simulation_id", "turn", "seq"),
+    )
@@ -0,0 +1,72 @@
+from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, ForeignKey, Enum, Boolean, Index, UniqueConstraint
+from sqlalchemy.sql import func
+from app.db.models.user_model import Base
+import enum
+
+class SimulationExperimentStatus(str, enum.Enum):
+    queued = "queued"
+    running = "running"
+    completed = "completed"   # every run finished (some may have failed)
+    cancelled = "cancelled"
+    failed = "failed"
+
+class SimulationRunStatus(str, enum.Enum):
+    pending = "pending"
+    running = "running"
+    completed = "completed"
+    failed = "failed"
+    cancelled = "cancelled"
+
+class SimulationExperiment(Base):
+    """Parameter sweep: one scenario template × a grid of variants."""
+    __tablename__ = "simulation_experiment_tbl"
+
+    experimentid = Column(Integer, primary_key=True, index=True)
+    userid = Column(Integer, ForeignKey("user_tbl.userid", ondelete="CASCADE"), nullable=False)
+    projectid = Column(Integer, ForeignKey("project_tbl.projectid", ondelete="SET NULL"), nullable=True)
+    scenarioid = Column(Integer, ForeignKey("scenario_tbl.scenarioid", ondelete="SET NULL"), nullable=True)
+    name = Column(String(150))
+    status = Column(Enum(SimulationExperimentStatus, name="simulation_experiment_status"), default=SimulationExperimentStatus.queued)
+
+    template = Column(Text, nullable=False)   # JSON: create payload shared by every run
+    grid = Column(Text, nullable=False)       # JSON: parameter → list of values
+    turns_per_run = Column(Integer, default=5)
+    steps_per_turn = Column(Integer, default=1)
+    max_concurrency = Column(Integer, default=3)
+    error = Column(Text)
+
+    created_at = Column(TIMESTAMP, server_default=func.now())
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())   # worker heartbeat
+    started_at = Column(TIMESTAMP)
+    finished_at = Column(TIMESTAMP)
+    is_deleted = Column(Boolean, default=False)
+    deleted_at = Column(TIMESTAMP)
+
+    __table_args__ = (
+        Index("ix_simulation_experiment_status_updated", "status", "updated_at"),
+        Index("ix_simulation_experiment_user", "userid", "created_at"),
+    )
+
+class SimulationExperimentRun(Base):
+    """One variant of an experiment and the provider simulation driving it."""
+    __tablename__ = "simulation_experiment_run_tbl"
+
+    runid = Column(Integer, primary_key=True, index=True)
+    experimentid = Column(Integer, ForeignKey("simulation_experiment_tbl.experimentid", ondelete="CASCADE"), nullable=False)
+    run_index = Column(Integer, nullable=False)
+    params = Column(Text, nullable=False)     # JSON: this variant's grid values
+    simulation_id = Column(String(100))
+    create_started_at = Column(TIMESTAMP)     # claim taken before the provider create call
+    status = Column(Enum(SimulationRunStatus, name="simulation_run_status"), default=SimulationRunStatus.pending)
+    fate_applied = Column(Boolean, default=False)
+    turns_completed = Column(Integer, default=0)
+    summary = Column(Text)                    # JSON: metrics for the comparison table
+    error = Column(Text)
+
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
+    started_at = Column(TIMESTAMP)
+    finished_at = Column(TIMESTAMP)
+
+    __table_args__ = (
+        UniqueConstraint("experimentid", "run_index", name="uq_experiment_run_index"),
+    )
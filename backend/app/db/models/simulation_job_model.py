@@ -0,0 +1,39 @@
+from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, ForeignKey, Enum, Boolean, Float, Index
+from sqlalchemy.sql import func
+from app.db.models.user_model import Base
+import enum
+
+class SimulationJobStatus(str, enum.Enum):
+    queued = "queued"
+    running = "running"
+    completed = "completed"
+    stopped = "stopped"       # a stop condition matched
+    cancelled = "cancelled"   # cancelled by the user
+    failed = "failed"
+
+class SimulationJob(Base):
+    __tablename__ = "simulation_job_tbl"
+
+    jobid = Column(Integer, primary_key=True, index=True)
+    simulation_id = Column(String(100), nullable=False, index=True)
+    userid = Column(Integer, ForeignKey("user_tbl.userid", ondelete="CASCADE"), nullable=False)
+    status = Column(Enum(SimulationJobStatus, name="simulation_job_status"), default=SimulationJobStatus.queued)
+
+    turns_requested = Column(Integer, nullable=False)
+    turns_completed = Column(Integer, default=0)
+    steps_per_turn = Column(Integer, default=1)
+    pacing_seconds = Column(Float, default=0)
+    stop_conditions = Column(Text)   # JSON
+    progress = Column(Text)          # JSON: last outcome, last events, provider status
+    error = Column(Text)
+
+    created_at = Column(TIMESTAMP, server_default=func.now())
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
+    started_at = Column(TIMESTAMP)
+    finished_at = Column(TIMESTAMP)
+    is_deleted = Column(Boolean, default=False)
+    deleted_at = Column(TIMESTAMP)
+
+    __table_args__ = (
+        Index("ix_simulation_job_status_updated", "status", "updated_at"),
+    )
@@ -0,0 +1,35 @@
+from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, ForeignKey, Boolean, Index
+from sqlalchemy.sql import func
+from app.db.models.user_model import Base
+
+class SimulationSession(Base):
+    """Registry of provider simulations → owning user / project / scenario."""
+    __tablename__ = "simulation_session_tbl"
+
+    sessionid = Column(Integer, primary_key=True, index=True)
+    simulation_id = Column(String(100), nullable=False, unique=True)
+    userid = Column(Integer, ForeignKey("user_tbl.userid", ondelete="CASCADE"), nullable=False)
+    projectid = Column(Integer, ForeignKey("project_tbl.projectid", ondelete="SET NULL"), nullable=True)
+    scenarioid = Column(Integer, ForeignKey("scenario_tbl.scenarioid", ondelete="SET NULL"), nullable=True)
+    forked_from_checkpointid = Column(Integer, ForeignKey("simulation_checkpoint_tbl.checkpointid", ondelete="SET NULL"), nullable=True)
+
+    provider_endpoint = Column(String(255))            # base URL the simulation lives on
+    status = Column(String(30), default="running")   # last provider status seen
+    scenario_excerpt = Column(String(200))
+    agent_names = Column(Text)                         # JSON list: the closed cast
+    last_turn = Column(Integer, default=0)
+    event_count = Column(Integer, default=0)
+
+    created_at = Column(TIMESTAMP, server_default=func.now())
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
+    last_seen_at = Column(TIMESTAMP, server_default=func.now())
+    stopped_at = Column(TIMESTAMP)
+    results_saved_at = Column(TIMESTAMP)               # final state written to result_tbl
+    is_deleted = Column(Boolean, default=False)
+    deleted_at = Column(TIMESTAMP)
+
+    __table_args__ = (
+        Index("ix_simulation_session_user_status", "userid", "status", "last_seen_at"),
+        Index("ix_simulation_session_project", "projectid", "last_seen_at"),
+        Index("ix_simulation_session_scenario", "scenarioid"),
+    )
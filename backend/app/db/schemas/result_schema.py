@@ -41,6 +41,7 @@ class ResultUpdate(BaseModel):
 
 class ResultResponse(ResultBase):
     resultid: int
+    resultdata: Optional[Any] = None
     created_at: datetime
     updated_at: Optional[datetime]
     is_deleted: Optional[bool] = False
@@ -54,10 +55,22 @@ class SaveSimulationResultsRequest(BaseModel):
     agentLogs: Dict[str, List[Dict[str, Any]]] = {}
     positions: List[Dict[str, Any]] = []  # 🧭 NEW
 
-
     class Config:
         from_attributes = True
 
+class ResultUploadCreate(BaseModel):
+    scenarioid: int
+    projectid: int
 
-
-        
\ No newline at end of file
+class ResultUploadResponse(BaseModel):
+    uploadid: str
+    scenarioid: int
+    projectid: int
+    status: str
+    last_chunk_seq: int
+    next_chunk_seq: int
+    row_count: int
+    counts: Dict[str, int]
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    committed_at: Optional[datetime] = None
@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, Field
@@ -42,6 +43,9 @@ class SimulationCreateRequest(BaseModel):
         default=None, alias="agent_profiles"
     )
     relationships: Optional[List[RelationshipSeed]] = None
+    # Backend-only: recorded in the session registry, not sent to the provider
+    projectid: Optional[int] = None
+    scenarioid: Optional[int] = None
 
     class Config:
         allow_population_by_field_name = True
@@ -50,14 +54,160 @@ class SimulationCreateRequest(BaseModel):
 
 class SimulationAdvanceRequest(BaseModel):
     steps: int = Field(default=1, ge=1, le=50)
+    # Server-side only (not forwarded to the provider)
+    until_meaningful: bool = True
+    deadline_seconds: Optional[float] = Field(default=None, ge=0.5, le=120)
+    # Speculatively advance the next turn after answering this one
+    prefetch: bool = False
+
+
+class SimulationBatchAdvanceItem(BaseModel):
+    simulation_id: str
+    steps: int = Field(default=1, ge=1, le=50)
+
+
+class SimulationBatchAdvanceRequest(BaseModel):
+    items: List[SimulationBatchAdvanceItem] = Field(..., min_length=1, max_length=20)
+    max_concurrency: Optional[int] = Field(default=None, ge=1, le=20)
+
+
+class SimulationAutorunStopConditions(BaseModel):
+    statuses: List[str] = Field(default_factory=lambda: ["stopped", "completed", "paused"])
+    keywords: List[str] = Field(default_factory=list, max_length=20)
+    max_duration_seconds: Optional[float] = Field(default=None, ge=1, le=6 * 60 * 60)
+    max_consecutive_errors: int = Field(default=3, ge=1, le=20)
+
+
+class SimulationAutorunRequest(BaseModel):
+    turns: int = Field(..., ge=1, le=500)
+    steps: int = Field(default=1, ge=1, le=50)
+    pacing_seconds: float = Field(default=0.0, ge=0, le=60)
+    stop_conditions: SimulationAutorunStopConditions = Field(
+        default_factory=SimulationAutorunStopConditions
+    )
+
+
+class SimulationJobResponse(BaseModel):
+    jobid: int
+    simulation_id: str
+    userid: int
+    status: str
+    turns_requested: int
+    turns_completed: int = 0
+    steps_per_turn: int = 1
+    pacing_seconds: float = 0
+    stop_conditions: Optional[Dict[str, Any]] = None
+    progress: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class SimulationExperimentGrid(BaseModel):
+    """Each list is one sweep axis; runs are the cartesian product × repeats."""
+    custom_agents: Optional[List[List[AgentCustomization]]] = None
+    relationships: Optional[List[List[RelationshipSeed]]] = None
+    fate_prompt: Optional[List[Optional[str]]] = None
+    repeats: int = Field(default=1, ge=1, le=20)
+
+
+class SimulationExperimentRequest(BaseModel):
+    name: Optional[str] = Field(default=None, max_length=150)
+    template: SimulationCreateRequest
+    grid: SimulationExperimentGrid = Field(default_factory=SimulationExperimentGrid)
+    turns_per_run: int = Field(default=5, ge=1, le=200)
+    steps_per_turn: int = Field(default=1, ge=1, le=50)
+    max_concurrency: int = Field(default=3, ge=1, le=20)
+
+
+class SimulationExperimentRunResponse(BaseModel):
+    runid: int
+    run_index: int
+    params: Dict[str, Any]
+    simulation_id: Optional[str] = None
+    status: str
+    turns_completed: int = 0
+    summary: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class SimulationExperimentResponse(BaseModel):
+    experimentid: int
+    userid: int
+    projectid: Optional[int] = None
+    scenarioid: Optional[int] = None
+    name: Optional[str] = None
+    status: str
+    turns_per_run: int
+    steps_per_turn: int
+    max_concurrency: int
+    total_runs: int = 0
+    runs_by_status: Dict[str, int] = {}
+    runs: Optional[List[SimulationExperimentRunResponse]] = None
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
 
 
 class SimulationFateRequest(BaseModel):
     prompt: Optional[str] = None
 
 
+class SimulationCheckpointRequest(BaseModel):
+    label: Optional[str] = Field(default=None, max_length=100)
+
+
+class SimulationForkRequest(BaseModel):
+    # Fate prompt applied to the branch right after it is seeded
+    prompt: Optional[str] = None
+    recent_events: int = Field(default=20, ge=0, le=200)
+
+
+class SimulationCheckpointResponse(BaseModel):
+    checkpointid: int
+    simulation_id: str
+    parent_checkpointid: Optional[int] = None
+    label: Optional[str] = None
+    turn: int = 0
+    agent_count: int = 0
+    event_count: int = 0
+    stored_bytes: Optional[int] = None
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
 class SimulationResponse(BaseModel):
     simulation: Dict[str, Any]
 
     class Config:
         extra = "allow"
+
+
+class SimulationSessionResponse(BaseModel):
+    sessionid: int
+    simulation_id: str
+    userid: int
+    projectid: Optional[int] = None
+    scenarioid: Optional[int] = None
+    forked_from_checkpointid: Optional[int] = None
+    status: Optional[str] = None
+    scenario_excerpt: Optional[str] = None
+    last_turn: Optional[int] = 0
+    event_count: Optional[int] = 0
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    last_seen_at: Optional[datetime] = None
+    stopped_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
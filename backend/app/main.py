@@ -13,6 +13,14 @@ from app.db.seed.access_control_seed import seed_access_controls
 from app.db.seed.config_seed import seed_configs
 from app.db.seed.maintenance_seed import seed_maintenance
 from app.db.seed.credit_config_seed import seed_credit_packs
+from app.db.models import (  # noqa: F401 — register tables before create_all
+    result_upload_model,
+    simulation_checkpoint_model,
+    simulation_event_model,
+    simulation_experiment_model,
+    simulation_job_model,
+    simulation_session_model,
+)
 
 
 init_db()
@@ -207,6 +215,31 @@ def seed_defaults():
 
 
 
+# ✅ Shared simulation provider HTTP client (keep-alive pool)
+from app.services import simulation_service
+
+from app.services import (
+    simulation_autorun_service,
+    simulation_experiment_service,
+    simulation_journal_service,
+)
+
+@app.on_event("startup")
+async def start_simulation_client():
+    await simulation_service.start_http_client()
+    await simulation_journal_service.start_writer()
+    await simulation_autorun_service.start_supervisor()
+    await simulation_experiment_service.start_supervisor()
+
+
+@app.on_event("shutdown")
+async def close_simulation_client():
+    await simulation_experiment_service.stop_supervisor()
+    await simulation_autorun_service.stop_supervisor()
+    await simulation_service.close_http_client()
+    await simulation_journal_service.stop_writer()
+
+
 @app.get("/debug-all-routes")
 def debug_all_routes():
     """Debug endpoint to see ALL registered routes and methods"""
@@ -3,12 +3,21 @@
 # ===============================
 
 from fastapi import APIRouter, Depends, Request, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from app.db.database import get_db
-from app.controllers import result_controller
-from app.db.schemas.result_schema import ResultCreate, ResultUpdate, ResultResponse, SaveSimulationResultsRequest
+from app.controllers import result_controller, result_upload_controller
+from app.core.config import settings
+from app.db.models.result_model import ResultType
+from app.db.schemas.result_schema import (
+    ResultCreate,
+    ResultUpdate,
+    ResultResponse,
+    ResultUploadCreate,
+    SaveSimulationResultsRequest,
+)
 from app.services.jwt_service import get_current_user
 from app.services.route_logger_helper import log_action, log_error
 
@@ -245,16 +254,187 @@ async def save_simulation(
         await log_error(db, request, current_user, "RESULT_SAVE_SIMULATION_ERROR", e, "Error saving simulation results")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+# ============================================================
+# 🔹 CHUNKED SIMULATION UPLOAD (open → NDJSON chunks → commit)
+# ============================================================
+@router.post("/uploads", status_code=201)
+async def open_result_upload(
+    payload: ResultUploadCreate,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    try:
+        upload = result_upload_controller.open_upload(db, payload, current_user.userid)
+        await log_action(
+            db, request, current_user,
+            "RESULT_UPLOAD_OPEN",
+            details=f"Opened result upload {upload['uploadid']} for scenario {payload.scenarioid}",
+        )
+        return upload
+    except HTTPException as e:
+        await log_error(db, request, current_user, "RESULT_UPLOAD_OPEN_FAILED", e, "Failed to open result upload")
+        raise e
+    except Exception as e:
+        await log_error(db, request, current_user, "RESULT_UPLOAD_OPEN_ERROR", e, "Error opening result upload")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/uploads/{uploadid}")
+async def get_result_upload(
+    uploadid: str,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    """Status of an upload; `next_chunk_seq` is where a client resumes."""
+    return result_upload_controller.get_upload(db, uploadid, current_user.userid)
+
+
+async def _read_chunk(request: Request) -> bytes:
+    limit = settings.result_upload_max_chunk_bytes
+    body = bytearray()
+    async for part in request.stream():
+        body.extend(part)
+        if len(body) > limit:
+            raise HTTPException(status_code=413, detail=f"Chunk exceeds {limit} bytes")
+    return bytes(body)
+
+
+@router.put("/uploads/{uploadid}/chunks/{chunk_seq}")
+async def put_result_upload_chunk(
+    uploadid: str,
+    chunk_seq: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    """Body: NDJSON lines of type log / agentLog / position. Chunks start at 0."""
+    if chunk_seq < 0:
+        raise HTTPException(status_code=400, detail="chunk_seq must be >= 0")
+    try:
+        body = await _read_chunk(request)
+        return result_upload_controller.write_chunk(db, uploadid, chunk_seq, body, current_user.userid)
+    except HTTPException as e:
+        await log_error(db, request, current_user, "RESULT_UPLOAD_CHUNK_FAILED", e, f"Failed to stage chunk {chunk_seq}")
+        raise e
+    except Exception as e:
+        await log_error(db, request, current_user, "RESULT_UPLOAD_CHUNK_ERROR", e, f"Error staging chunk {chunk_seq}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.post("/uploads/{uploadid}/commit")
+async def commit_result_upload(
+    uploadid: str,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    try:
+        out = result_upload_controller.commit_upload(db, uploadid, current_user.userid)
+        await log_action(
+            db, request, current_user,
+            "RESULT_SAVE_SIMULATION",
+            details=f"Committed result upload {uploadid}",
+        )
+        return out
+    except HTTPException as e:
+        await log_error(db, request, current_user, "RESULT_SAVE_SIMULATION_FAILED", e, "Failed to commit result upload")
+        raise e
+    except Exception as e:
+        await log_error(db, request, current_user, "RESULT_SAVE_SIMULATION_ERROR", e, "Error committing result upload")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.delete("/uploads/{uploadid}")
+async def abort_result_upload(
+    uploadid: str,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    try:
+        out = result_upload_controller.abort_upload(db, uploadid, current_user.userid)
+        await log_action(db, request, current_user, "RESULT_UPLOAD_ABORT", details=f"Aborted result upload {uploadid}")
+        return out
+    except HTTPException as e:
+        await log_error(db, request, current_user, "RESULT_UPLOAD_ABORT_FAILED", e, "Failed to abort result upload")
+        raise e
+    except Exception as e:
+        await log_error(db, request, current_user, "RESULT_UPLOAD_ABORT_ERROR", e, "Error aborting result upload")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
 # ============================================================
 # 🔹 GET REPLAY DATA (for scenario replays)
 # ============================================================
+def replay_filters(
+    types: Optional[List[ResultType]] = Query(None, description="Only these result types"),
+    agent: Optional[str] = Query(None, description="Payload agent name / key"),
+    projectagentid: Optional[int] = Query(None),
+    from_turn: Optional[int] = Query(None, ge=0),
+    to_turn: Optional[int] = Query(None, ge=0),
+) -> Dict[str, Any]:
+    """Shared query filters, applied in Postgres (see result_controller.result_filters)."""
+    return {
+        "resulttypes": types,
+        "agent": agent,
+        "projectagentid": projectagentid,
+        "from_turn": from_turn,
+        "to_turn": to_turn,
+    }
+
+
 @router.get("/replay/{scenarioid}")
 async def get_replay_data_route(
     scenarioid: int,
+    filters: Dict[str, Any] = Depends(replay_filters),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
     try:
-        return result_controller.get_replay_data(db, scenarioid)
+        return result_controller.get_replay_data(db, scenarioid, **filters)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/replay/{scenarioid}/stream")
+async def stream_replay_data_route(
+    scenarioid: int,
+    filters: Dict[str, Any] = Depends(replay_filters),
+    current_user=Depends(get_current_user),
+):
+    """
+    Same rows as /replay/{scenarioid}, one JSON object per line in
+    sequence order, ending with a {"type": "end"} line.
+    """
+    return StreamingResponse(
+        result_controller.stream_replay_ndjson(scenarioid, **filters),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# ============================================================
+# 🔹 QUERY / STATS (payload filters run in Postgres)
+# ============================================================
+@router.get("/query/{scenarioid}")
+async def query_results_route(
+    scenarioid: int,
+    filters: Dict[str, Any] = Depends(replay_filters),
+    after_seq: Optional[int] = Query(None, description="Keyset cursor: next_after_seq of the previous page"),
+    after_id: Optional[int] = Query(None, description="Keyset cursor: next_after_id of the previous page"),
+    limit: int = Query(500, ge=1, le=5000),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    return result_controller.query_results(
+        db, scenarioid, after_seq=after_seq, after_id=after_id, limit=limit, **filters
+    )
+
+
+@router.get("/stats/{scenarioid}")
+async def get_result_stats_route(
+    scenarioid: int,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    return result_controller.get_result_stats(db, scenarioid)
@@ -1,14 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
 import asyncio
-from app.controllers import simulation_controller
-from app.db.database import get_db
+import json
+from typing import Optional
+from app.controllers import (
+    simulation_checkpoint_controller,
+    simulation_controller,
+    simulation_experiment_controller,
+    simulation_job_controller,
+    simulation_journal_controller,
+    simulation_session_controller,
+)
+from app.db.database import SessionLocal, get_db
 from app.db.schemas.simulation_schema import (
     SimulationAdvanceRequest,
+    SimulationAutorunRequest,
+    SimulationBatchAdvanceRequest,
+    SimulationCheckpointRequest,
     SimulationCreateRequest,
+    SimulationExperimentRequest,
     SimulationFateRequest,
+    SimulationForkRequest,
 )
+from app.services import simulation_autosave_service, simulation_journal_service, simulation_service
 from app.services.jwt_service import get_current_user
+from app.services.utils.permissions_helper import enforce_permission_auto
 from app.services.route_logger_helper import log_action, log_error
 
 router = APIRouter(prefix="/simulations", tags=["Simulations"])
@@ -24,49 +41,198 @@ async def create_simulation(
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    max_attempts = 3
-    for attempt in range(1, max_attempts + 1):
-        try:
-            result = await simulation_controller.create_simulation(payload)
-            await log_action(
-                db,
-                request,
-                current_user,
-                "SIMULATION_CREATE",
-                details=f"Created simulation for scenario: {payload.scenario[:80]}",
-            )
-            return result
-        except HTTPException as exc:
-            # 🔁 Retry transient errors only
-            if exc.status_code in {502, 503, 504} and attempt < max_attempts:
-                print(f"[Retry {attempt}/{max_attempts}] Provider error: {exc.detail}")
-                await asyncio.sleep(1 * attempt)
-                continue
-            # Permanent or final failure
-            await log_error(
-                db,
-                request,
-                current_user,
-                "SIMULATION_CREATE_FAILED",
-                exc,
-                f"Simulation create failed (attempt {attempt})",
-            )
-            raise
-        except Exception as exc:
-            # 🔁 Retry generic error
-            if attempt < max_attempts:
-                print(f"[Retry {attempt}/{max_attempts}] Generic error: {exc}")
-                await asyncio.sleep(1 * attempt)
-                continue
-            await log_error(
-                db,
-                request,
-                current_user,
-                "SIMULATION_CREATE_ERROR",
-                exc,
-                "Error creating simulation after retries",
-            )
-            raise HTTPException(status_code=500, detail="Simulation service error") from exc
+    # Transient provider errors are retried inside the simulation proxy
+    try:
+        result = await simulation_controller.create_simulation(
+            payload, user_id=current_user.userid
+        )
+        simulation_session_controller.register_session(
+            db,
+            result=result,
+            userid=current_user.userid,
+            projectid=payload.projectid,
+            scenarioid=payload.scenarioid,
+        )
+        await log_action(
+            db,
+            request,
+            current_user,
+            "SIMULATION_CREATE",
+            details=f"Created simulation for scenario: {payload.scenario[:80]}",
+        )
+        return result
+    except HTTPException as exc:
+        await log_error(
+            db,
+            request,
+            current_user,
+            "SIMULATION_CREATE_FAILED",
+            exc,
+            "Simulation create failed",
+        )
+        raise
+    except Exception as exc:
+        await log_error(
+            db,
+            request,
+            current_user,
+            "SIMULATION_CREATE_ERROR",
+            exc,
+            "Error creating simulation",
+        )
+        raise HTTPException(status_code=500, detail="Simulation service error") from exc
+
+# ============================================================
+# 🔌 PROVIDER CONNECTION STATS (Admin)
+# ============================================================
+@router.get("/provider/stats", status_code=status.HTTP_200_OK)
+async def get_provider_stats(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    enforce_permission_auto(db, current_user, "SYSTEM_LOGS", request)
+    return {
+        "pool": simulation_service.get_pool_stats(),
+        "coalescing": simulation_service.get_coalescing_stats(),
+        "agent_cache": simulation_service.payload_agents_cache.stats(),
+        "scheduler": simulation_service.provider_scheduler.stats(),
+        "hedging": {
+            "enabled": simulation_service.settings.simulation_hedge_enabled,
+            **simulation_service.read_hedger.stats(),
+        },
+        "journal": simulation_journal_service.stats(),
+        "autosave": simulation_autosave_service.stats(),
+        "prefetch": simulation_service.turn_prefetcher.stats(),
+    }
+
+
+# ============================================================
+# 🛡️ PROVIDER CIRCUIT BREAKER STATE (Admin)
+# ============================================================
+@router.get("/provider/breaker", status_code=status.HTTP_200_OK)
+async def get_provider_breaker(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    enforce_permission_auto(db, current_user, "SYSTEM_LOGS", request)
+    return simulation_service.get_breaker_stats()
+
+
+# ============================================================
+# 🗂️ MY SIMULATIONS (session registry, paginated)
+# ============================================================
+@router.get("/sessions", status_code=status.HTTP_200_OK)
+async def list_simulation_sessions(
+    request: Request,
+    page: int = Query(1, ge=1, description="Page number"),
+    page_size: Optional[int] = Query(None, ge=1, le=100, description="Items per page"),
+    status_filter: Optional[str] = Query(None, alias="status", description="Provider status (running, paused, stopped...)"),
+    projectid: Optional[int] = Query(None),
+    scenarioid: Optional[int] = Query(None),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    try:
+        result = simulation_session_controller.list_sessions(
+            db,
+            current_user.userid,
+            page=page,
+            limit=page_size,
+            status=status_filter,
+            projectid=projectid,
+            scenarioid=scenarioid,
+        )
+        await log_action(
+            db,
+            request,
+            current_user,
+            "SIMULATION_SESSION_LIST",
+            details=f"Listed simulations (page={page}, status={status_filter}, project={projectid})",
+        )
+        return result
+    except Exception as exc:
+        await log_error(db, request, current_user, "SIMULATION_SESSION_LIST_ERROR", exc)
+        raise HTTPException(status_code=500, detail="Internal server error") from exc
+
+
+# ============================================================
+# 🧪 PARAMETER-SWEEP EXPERIMENTS (list must precede /{simulation_id})
+# ============================================================
+@router.get("/experiments", status_code=status.HTTP_200_OK)
+async def list_simulation_experiments(
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    return simulation_experiment_controller.list_experiments(db, current_user.userid, limit)
+
+
+@router.post("/experiments", status_code=status.HTTP_202_ACCEPTED)
+async def create_simulation_experiment(
+    payload: SimulationExperimentRequest,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    try:
+        experiment = simulation_experiment_controller.create_experiment(db, payload, current_user.userid)
+        await log_action(
+            db,
+            request,
+            current_user,
+            "SIMULATION_EXPERIMENT",
+            details=f"Started experiment {experiment['experimentid']} ({experiment['total_runs']} runs)",
+        )
+        return experiment
+    except HTTPException as exc:
+        await log_error(db, request, current_user, "SIMULATION_EXPERIMENT_FAILED", exc)
+        raise
+    except Exception as exc:
+        await log_error(db, request, current_user, "SIMULATION_EXPERIMENT_ERROR", exc)
+        raise HTTPException(status_code=500, detail="Failed to start experiment") from exc
+
+
+@router.get("/experiments/{experiment_id}", status_code=status.HTTP_200_OK)
+async def get_simulation_experiment(
+    experiment_id: int,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    return simulation_experiment_controller.get_experiment(db, experiment_id, current_user.userid)
+
+
+@router.get("/experiments/{experiment_id}/comparison", status_code=status.HTTP_200_OK)
+async def get_simulation_experiment_comparison(
+    experiment_id: int,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    return simulation_experiment_controller.get_comparison(db, experiment_id, current_user.userid)
+
+
+@router.post("/experiments/{experiment_id}/cancel", status_code=status.HTTP_200_OK)
+async def cancel_simulation_experiment(
+    experiment_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    try:
+        experiment = simulation_experiment_controller.cancel_experiment(db, experiment_id, current_user.userid)
+        await log_action(
+            db,
+            request,
+            current_user,
+            "SIMULATION_EXPERIMENT_CANCEL",
+            details=f"Cancelled experiment {experiment_id}",
+        )
+        return experiment
+    except HTTPException as exc:
+        await log_error(db, request, current_user, "SIMULATION_EXPERIMENT_CANCEL_FAILED", exc)
+        raise
+
 
 # ============================================================
 # 🧩 GET SIMULATION BY ID
@@ -75,11 +241,31 @@ async def create_simulation(
 async def get_simulation(
     simulation_id: str,
     request: Request,
+    raw: bool = Query(False, description="Stream the unmodified provider payload"),
+    profile: Optional[str] = Query(None, description="Agent field profile: minimal | board | inspector | full"),
+    fields: Optional[str] = Query(None, description="Comma-separated agent fields (overrides profile)"),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
     try:
-        result = await simulation_controller.get_simulation(simulation_id)
+        simulation_session_controller.check_access(db, simulation_id, current_user)
+        if raw:
+            headers, body = await simulation_controller.open_simulation_passthrough(
+                simulation_id, user_id=current_user.userid
+            )
+            await log_action(
+                db,
+                request,
+                current_user,
+                "SIMULATION_VIEW",
+                details=f"Viewed simulation {simulation_id} (raw)",
+                dedupe_key=f"simulation_{simulation_id}",
+            )
+            return StreamingResponse(body, headers=headers)
+
+        result = await simulation_controller.get_simulation(
+            simulation_id, user_id=current_user.userid, profile=profile, fields=fields
+        )
         await log_action(
             db,
             request,
@@ -89,42 +275,12 @@ async def get_simulation(
             dedupe_key=f"simulation_{simulation_id}",
         )
 
-        # --- Debug: pretty print outgoing payload (sanitized, full output) ---
-        try:
-            import json
-
-            def sanitize(obj):
-                """Recursively hide or mark heavy text fields."""
-                if isinstance(obj, dict):
-                    clean = {}
-                    for k, v in obj.items():
-                        if k in {
-                            "memory",
-                            "corroded_memory",
-                            "biography",
-                            "thought_process",
-                            "scenario",
-                        }:
-                            # show full text (no truncation)
-                            clean[k] = v
-                        elif isinstance(v, (dict, list)):
-                            clean[k] = sanitize(v)
-                        else:
-                            clean[k] = v
-                    return clean
-                elif isinstance(obj, list):
-                    return [sanitize(x) for x in obj]
-                return obj
-
-            safe_result = sanitize(result)
+        # --- Debug: sampled full payload dump (off unless configured) ---
+        if simulation_service.should_dump_debug():
             print(f"[DEBUG ROUTE] Outgoing SimulationResponse for {simulation_id}:")
-            # ⛔ no cutoff here — prints entire JSON
-            print(json.dumps(safe_result, indent=2, ensure_ascii=False))
-
-        except Exception as e:
-            print("[DEBUG ROUTE] (could not serialize result)", e)
+            print(json.dumps(result, indent=2, ensure_ascii=False))
 
-        return result  # ✅ send everything to frontend untouched
+        return ORJSONResponse(result)
 
     except HTTPException as exc:
         await log_error(
@@ -148,6 +304,164 @@ async def get_simulation(
         raise HTTPException(status_code=500, detail="Simulation service error") from exc
 
 
+# ============================================================
+# 🧭 SIMULATION EVENTS SINCE CURSOR (delta polling)
+# ============================================================
+@router.get("/{simulation_id}/events", status_code=status.HTTP_200_OK)
+async def get_simulation_events(
+    simulation_id: str,
+    request: Request,
+    after: Optional[str] = Query(
+        None, max_length=64, description="Cursor returned by the previous poll (unknown cursors force a resync)"
+    ),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    try:
+        simulation_session_controller.check_access(db, simulation_id, current_user)
+        result = await simulation_controller.get_simulation_delta(
+            simulation_id, after, user_id=current_user.userid
+        )
+        await log_action(
+            db,
+            request,
+            current_user,
+            "SIMULATION_VIEW",
+            details=f"Polled events for simulation {simulation_id} (after={after})",
+            dedupe_key=f"simulation_{simulation_id}",
+        )
+        return ORJSONResponse(result)
+    except HTTPException as exc:
+        await log_error(
+            db,
+            request,
+            current_user,
+            "SIMULATION_VIEW_FAILED",
+            exc,
+            f"Failed to poll events for simulation {simulation_id}",
+        )
+        raise
+    except Exception as exc:
+        await log_error(
+            db,
+            request,
+            current_user,
+            "SIMULATION_VIEW_ERROR",
+            exc,
+            f"Error polling events for simulation {simulation_id}",
+        )
+        raise HTTPException(status_code=500, detail="Simulation service error") from exc
+
+
+# ============================================================
+# 📓 SIMULATION EVENT JOURNAL (persisted history, by turn range)
+# ============================================================
+@router.get("/{simulation_id}/journal", status_code=status.HTTP_200_OK)
+async def get_simulation_journal(
+    simulation_id: str,
+    request: Request,
+    from_turn: Optional[int] = Query(None, ge=0),
+    to_turn: Optional[int] = Query(None, ge=0),
+    after_id: Optional[int] = Query(None, ge=0, description="next_after_id of the previous page"),
+    limit: int = Query(500, ge=1, le=5000),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    try:
+        simulation_session_controller.check_access(db, simulation_id, current_user)
+        result = simulation_journal_controller.list_events(
+            db, simulation_id, from_turn, to_turn, after_id, limit
+        )
+        await log_action(
+            db,
+            request,
+            current_user,
+            "SIMULATION_VIEW",
+            details=f"Viewed journal of simulation {simulation_id} (turns {from_turn}-{to_turn})",
+            dedupe_key=f"simulation_{simulation_id}",
+        )
+        return ORJSONResponse(result)
+    except HTTPException as exc:
+        await log_error(
+            db,
+            request,
+            current_user,
+            "SIMULATION_VIEW_FAILED",
+            exc,
+            f"Failed to read journal of simulation {simulation_id}",
+        )
+        raise
+    except Exception as exc:
+        await log_error(
+            db,
+            request,
+            current_user,
+            "SIMULATION_VIEW_ERROR",
+            exc,
+            f"Error reading journal of simulation {simulation_id}",
+        )
+        raise HTTPException(status_code=500, detail="Failed to read simulation journal") from exc
+
+
+# ============================================================
+# 📡 LIVE SIMULATION STREAM (SSE)
+# ============================================================
+@router.get("/{simulation_id}/stream")
+async def stream_simulation(
+    simulation_id: str,
+    request: Request,
+    advance: bool = Query(True, description="Drive the provider forward (false = watch only)"),
+    steps: int = Query(1, ge=1, le=50),
+    interval: float = Query(1.0, ge=0, le=30, description="Seconds between provider calls"),
+    max_turns: Optional[int] = Query(None, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    simulation_session_controller.check_access(db, simulation_id, current_user)
+    await log_action(
+        db,
+        request,
+        current_user,
+        "SIMULATION_STREAM",
+        details=f"Opened live stream for simulation {simulation_id} (advance={advance})",
+        dedupe_key=f"simulation_stream_{simulation_id}",
+    )
+
+    def record_turn(result):
+        # The request session may be closed once streaming starts
+        session = SessionLocal()
+        try:
+            simulation_session_controller.record_activity(session, simulation_id, result)
+        finally:
+            session.close()
+
+    async def event_source():
+        try:
+            async for name, data in simulation_controller.stream_simulation(
+                simulation_id,
+                advance=advance,
+                steps=steps,
+                interval=interval,
+                max_turns=max_turns,
+                user_id=current_user.userid,
+                on_advance=record_turn,
+            ):
+                if await request.is_disconnected():
+                    break
+                yield f"event: {name}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+        except HTTPException as exc:
+            yield f"event: error\ndata: {json.dumps({'status': exc.status_code, 'detail': exc.detail})}\n\n"
+        except Exception as exc:
+            print(f"[STREAM ERROR] simulation {simulation_id}: {exc}")
+            yield f"event: error\ndata: {json.dumps({'status': 500, 'detail': 'Simulation service error'})}\n\n"
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 # ============================================================
 # 🧩 ADVANCE SIMULATION
 # ============================================================
@@ -156,11 +470,17 @@ async def advance_simulation(
     simulation_id: str,
     payload: SimulationAdvanceRequest,
     request: Request,
+    profile: Optional[str] = Query(None, description="Agent field profile: minimal | board | inspector | full"),
+    fields: Optional[str] = Query(None, description="Comma-separated agent fields (overrides profile)"),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
     try:
-        result = await simulation_controller.advance_simulation(simulation_id, payload)
+        simulation_session_controller.check_access(db, simulation_id, current_user)
+        result = await simulation_controller.advance_simulation(
+            simulation_id, payload, user_id=current_user.userid, profile=profile, fields=fields
+        )
+        simulation_session_controller.record_activity(db, simulation_id, result)
         await log_action(
             db,
             request,
@@ -168,7 +488,7 @@ async def advance_simulation(
             "SIMULATION_ADVANCE",
             details=f"Advanced simulation {simulation_id} by {payload.steps} step(s)",
         )
-        return result  # ✅ direct JSON pass-through
+        return ORJSONResponse(result)  # ✅ direct JSON pass-through
     except HTTPException as exc:
         await log_error(
             db,
@@ -191,6 +511,62 @@ async def advance_simulation(
         raise HTTPException(status_code=500, detail="Simulation service error") from exc
 
 
+# ============================================================
+# 🧩 BATCH ADVANCE (several simulations at once)
+# ============================================================
+@router.post("/advance-batch", status_code=status.HTTP_200_OK)
+async def advance_simulations_batch(
+    payload: SimulationBatchAdvanceRequest,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    try:
+        result = await simulation_controller.advance_simulations_batch(
+            payload,
+            user_id=current_user.userid,
+            check_access=lambda simulation_id: simulation_session_controller.check_access(
+                db, simulation_id, current_user
+            ),
+        )
+        for item in result["results"]:
+            if item["ok"]:
+                simulation_session_controller.record_activity(
+                    db, item["simulation_id"], item["result"]
+                )
+        await log_action(
+            db,
+            request,
+            current_user,
+            "SIMULATION_ADVANCE",
+            details=(
+                f"Batch-advanced {len(payload.items)} simulation(s): "
+                f"{result['succeeded']} ok, {result['failed']} failed"
+            ),
+        )
+        return ORJSONResponse(result)
+    except HTTPException as exc:
+        await log_error(
+            db,
+            request,
+            current_user,
+            "SIMULATION_ADVANCE_FAILED",
+            exc,
+            "Failed to batch-advance simulations",
+        )
+        raise
+    except Exception as exc:
+        await log_error(
+            db,
+            request,
+            current_user,
+            "SIMULATION_ADVANCE_ERROR",
+            exc,
+            "Error batch-advancing simulations",
+        )
+        raise HTTPException(status_code=500, detail="Simulation service error") from exc
+
+
 # ============================================================
 # 🧩 TRIGGER FATE
 # ============================================================
@@ -199,11 +575,17 @@ async def trigger_simulation_fate(
     simulation_id: str,
     payload: SimulationFateRequest,
     request: Request,
+    profile: Optional[str] = Query(None, description="Agent field profile: minimal | board | inspector | full"),
+    fields: Optional[str] = Query(None, description="Comma-separated agent fields (overrides profile)"),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
     try:
-        result = await simulation_controller.trigger_simulation_fate(simulation_id, payload)
+        simulation_session_controller.check_access(db, simulation_id, current_user)
+        result = await simulation_controller.trigger_simulation_fate(
+            simulation_id, payload, user_id=current_user.userid, profile=profile, fields=fields
+        )
+        simulation_session_controller.record_activity(db, simulation_id, result)
         summary = (
             payload.prompt[:80] if payload.prompt else "No prompt provided (random fate)"
         )
@@ -214,7 +596,7 @@ async def trigger_simulation_fate(
             "SIMULATION_FATE",
             details=f"Triggered fate for simulation {simulation_id}: {summary}",
         )
-        return result  # ✅ full data preserved
+        return ORJSONResponse(result)  # ✅ full data preserved
     except HTTPException as exc:
         await log_error(
             db,
@@ -241,11 +623,17 @@ async def trigger_simulation_fate(
 async def pause_simulation(
     simulation_id: str,
     request: Request,
+    profile: Optional[str] = Query(None, description="Agent field profile: minimal | board | inspector | full"),
+    fields: Optional[str] = Query(None, description="Comma-separated agent fields (overrides profile)"),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
     try:
-        result = await simulation_controller.pause_simulation(simulation_id)
+        simulation_session_controller.check_access(db, simulation_id, current_user)
+        result = await simulation_controller.pause_simulation(
+            simulation_id, user_id=current_user.userid, profile=profile, fields=fields
+        )
+        simulation_session_controller.record_activity(db, simulation_id, result)
         await log_action(
             db,
             request,
@@ -253,7 +641,7 @@ async def pause_simulation(
             "SIMULATION_PAUSE",
             details=f"Paused simulation {simulation_id}",
         )
-        return result
+        return ORJSONResponse(result)
     except HTTPException as exc:
         await log_error(db, request, current_user, "SIMULATION_PAUSE_FAILED", exc)
         raise
@@ -266,11 +654,24 @@ async def pause_simulation(
 async def stop_simulation(
     simulation_id: str,
     request: Request,
+    background_tasks: BackgroundTasks,
+    profile: Optional[str] = Query(None, description="Agent field profile: minimal | board | inspector | full"),
+    fields: Optional[str] = Query(None, description="Comma-separated agent fields (overrides profile)"),
+    autosave: bool = Query(True, description="Save the final state to results in the background"),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
     try:
-        result = await simulation_controller.stop_simulation(simulation_id)
+        simulation_session_controller.check_access(db, simulation_id, current_user)
+        result = await simulation_controller.stop_simulation(
+            simulation_id, user_id=current_user.userid, profile=profile, fields=fields
+        )
+        simulation_session_controller.record_activity(db, simulation_id, result)
+        # 💾 Persist the final state server-side once the response is sent
+        if autosave and simulation_service.settings.simulation_autosave_on_stop:
+            background_tasks.add_task(
+                simulation_autosave_service.autosave_final_state, simulation_id, current_user.userid
+            )
         await log_action(
             db,
             request,
@@ -278,10 +679,191 @@ async def stop_simulation(
             "SIMULATION_STOP",
             details=f"Stopped simulation {simulation_id}",
         )
-        return result
+        return ORJSONResponse(result)
     except HTTPException as exc:
         await log_error(db, request, current_user, "SIMULATION_STOP_FAILED", exc)
         raise
     except Exception as exc:
         await log_error(db, request, current_user, "SIMULATION_STOP_ERROR", exc)
         raise HTTPException(status_code=500, detail="Simulation service error") from exc
+
+
+
+# ============================================================
+# 📌 CHECKPOINTS + WHAT-IF FORKS
+# ============================================================
+@router.post("/{simulation_id}/checkpoint", status_code=status.HTTP_201_CREATED)
+async def create_simulation_checkpoint(
+    simulation_id: str,
+    request: Request,
+    payload: Optional[SimulationCheckpointRequest] = None,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    try:
+        simulation_session_controller.check_access(db, simulation_id, current_user)
+        checkpoint = await simulation_checkpoint_controller.create_checkpoint(
+            db, simulation_id, current_user.userid, label=payload.label if payload else None
+        )
+        await log_action(
+            db,
+            request,
+            current_user,
+            "SIMULATION_CHECKPOINT",
+            details=f"Checkpointed simulation {simulation_id} at turn {checkpoint['turn']}",
+        )
+        return checkpoint
+    except HTTPException as exc:
+        await log_error(db, request, current_user, "SIMULATION_CHECKPOINT_FAILED", exc)
+        raise
+    except Exception as exc:
+        await log_error(db, request, current_user, "SIMULATION_CHECKPOINT_ERROR", exc)
+        raise HTTPException(status_code=500, detail="Failed to checkpoint simulation") from exc
+
+
+@router.get("/{simulation_id}/checkpoints", status_code=status.HTTP_200_OK)
+async def list_simulation_checkpoints(
+    simulation_id: str,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    simulation_session_controller.check_access(db, simulation_id, current_user)
+    return simulation_checkpoint_controller.list_checkpoints(db, simulation_id)
+
+
+@router.post("/{simulation_id}/fork", status_code=status.HTTP_201_CREATED)
+async def fork_simulation(
+    simulation_id: str,
+    request: Request,
+    checkpoint: Optional[int] = Query(None, ge=1, description="Checkpoint to branch from (default: checkpoint now)"),
+    payload: Optional[SimulationForkRequest] = None,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    payload = payload or SimulationForkRequest()
+    try:
+        simulation_session_controller.check_access(db, simulation_id, current_user)
+        result = await simulation_checkpoint_controller.fork_simulation(
+            db,
+            simulation_id,
+            current_user.userid,
+            checkpointid=checkpoint,
+            prompt=payload.prompt,
+            recent_events=payload.recent_events,
+        )
+        await log_action(
+            db,
+            request,
+            current_user,
+            "SIMULATION_FORK",
+            details=f"Forked simulation {simulation_id} from checkpoint {result['forked_from']['checkpointid']}",
+        )
+        return ORJSONResponse(result, status_code=status.HTTP_201_CREATED)
+    except HTTPException as exc:
+        await log_error(db, request, current_user, "SIMULATION_FORK_FAILED", exc)
+        raise
+    except Exception as exc:
+        await log_error(db, request, current_user, "SIMULATION_FORK_ERROR", exc)
+        raise HTTPException(status_code=500, detail="Failed to fork simulation") from exc
+
+
+# ============================================================
+# 🤖 AUTO-RUN JOBS (server-side multi-turn runs)
+# ============================================================
+@router.post("/{simulation_id}/autorun", status_code=status.HTTP_202_ACCEPTED)
+async def start_simulation_autorun(
+    simulation_id: str,
+    payload: SimulationAutorunRequest,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    try:
+        simulation_session_controller.check_access(db, simulation_id, current_user)
+        job = simulation_job_controller.create_autorun_job(
+            db, simulation_id, payload, current_user.userid
+        )
+        await log_action(
+            db,
+            request,
+            current_user,
+            "SIMULATION_AUTORUN",
+            details=f"Started auto-run job {job.jobid} for simulation {simulation_id} ({payload.turns} turns)",
+        )
+        return {"job_id": job.jobid, "status": job.status.value}
+    except HTTPException as exc:
+        await log_error(db, request, current_user, "SIMULATION_AUTORUN_FAILED", exc)
+        raise
+    except Exception as exc:
+        await log_error(db, request, current_user, "SIMULATION_AUTORUN_ERROR", exc)
+        raise HTTPException(status_code=500, detail="Simulation service error") from exc
+
+
+@router.get("/jobs/{job_id}", status_code=status.HTTP_200_OK)
+async def get_simulation_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    job = simulation_job_controller.get_job(db, job_id, current_user.userid)
+    return simulation_job_controller.serialize_job(job)
+
+
+@router.get("/jobs/{job_id}/stream")
+async def stream_simulation_job(
+    job_id: int,
+    request: Request,
+    interval: float = Query(1.0, ge=0.2, le=30, description="Seconds between progress checks"),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    simulation_job_controller.get_job(db, job_id, current_user.userid)  # 404 if not owner
+    userid = current_user.userid
+
+    async def event_source():
+        last_seen = None
+        while not await request.is_disconnected():
+            session = SessionLocal()
+            try:
+                data = simulation_job_controller.serialize_job(
+                    simulation_job_controller.get_job(session, job_id, userid)
+                )
+            finally:
+                session.close()
+
+            marker = (data["status"], data["turns_completed"], data["updated_at"])
+            if marker != last_seen:
+                last_seen = marker
+                yield f"event: progress\ndata: {json.dumps(data, default=str)}\n\n"
+            if data["status"] not in ("queued", "running"):
+                yield f"event: end\ndata: {json.dumps({'status': data['status']})}\n\n"
+                break
+            await asyncio.sleep(interval)
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/jobs/{job_id}/cancel", status_code=status.HTTP_200_OK)
+async def cancel_simulation_job(
+    job_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    try:
+        job = simulation_job_controller.cancel_job(db, job_id, current_user.userid)
+        await log_action(
+            db,
+            request,
+            current_user,
+            "SIMULATION_AUTORUN_CANCEL",
+            details=f"Cancelled auto-run job {job_id}",
+        )
+        return simulation_job_controller.serialize_job(job)
+    except HTTPException as exc:
+        await log_error(db, request, current_user, "SIMULATION_AUTORUN_CANCEL_FAILED", exc)
+        raise
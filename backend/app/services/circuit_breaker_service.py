@@ -0,0 +1,180 @@
+# ===============================
+# app/services/circuit_breaker_service.py
+# Circuit breaker, retry budget and retry policies for the simulation proxy
+# ===============================
+
+import random
+import time
+from collections import deque
+from threading import Lock
+from typing import Any, Dict, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised when the breaker rejects a call without contacting the provider."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Circuit open, retry after {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Classic three-state breaker.
+    - closed: calls flow; `failure_threshold` consecutive failures → open
+    - open: calls rejected for `recovery_seconds`, then → half_open
+    - half_open: up to `half_open_max_calls` probes; success → closed, failure → open
+    """
+
+    def __init__(self, failure_threshold: int = 5, recovery_seconds: float = 30.0, half_open_max_calls: int = 1):
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.half_open_calls = 0
+        self.total_failures = 0
+        self.total_rejections = 0
+        self.times_opened = 0
+        self._lock = Lock()
+
+    def before_call(self) -> None:
+        with self._lock:
+            if self.state == OPEN:
+                elapsed = time.monotonic() - (self.opened_at or 0)
+                if elapsed < self.recovery_seconds:
+                    self.total_rejections += 1
+                    raise CircuitOpenError(self.recovery_seconds - elapsed)
+                self.state = HALF_OPEN
+                self.half_open_calls = 0
+
+            if self.state == HALF_OPEN:
+                if self.half_open_calls >= self.half_open_max_calls:
+                    self.total_rejections += 1
+                    raise CircuitOpenError(1)
+                self.half_open_calls += 1
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = CLOSED
+            self.consecutive_failures = 0
+            self.half_open_calls = 0
+            self.opened_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.total_failures += 1
+            self.consecutive_failures += 1
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.times_opened += 1
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+                self.half_open_calls = 0
+
+    def release_probe(self) -> None:
+        """Give back a half-open probe that never reached the provider."""
+        with self._lock:
+            if self.state == HALF_OPEN and self.half_open_calls > 0:
+                self.half_open_calls -= 1
+
+    def reset(self) -> None:
+        self.record_success()
+
+    def stats(self) -> Dict[str, Any]:
+        retry_after = None
+        if self.state == OPEN and self.opened_at is not None:
+            retry_after = max(0.0, self.recovery_seconds - (time.monotonic() - self.opened_at))
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "failure_threshold": self.failure_threshold,
+            "recovery_seconds": self.recovery_seconds,
+            "retry_after_seconds": retry_after,
+            "times_opened": self.times_opened,
+            "total_failures": self.total_failures,
+            "total_rejections": self.total_rejections,
+        }
+
+
+class RetryBudget:
+    """
+    Global cap on retries: within a sliding window, retries may not exceed
+    `min_retries` + `ratio` × first attempts. Stops retry storms when the
+    provider is struggling for everyone.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_retries: int = 10, window_seconds: float = 10.0):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window_seconds = window_seconds
+        self._requests: deque = deque()
+        self._retries: deque = deque()
+        self.denied = 0
+        self._lock = Lock()
+
+    def _trim(self, now: float) -> None:
+        for q in (self._requests, self._retries):
+            while q and now - q[0] > self.window_seconds:
+                q.popleft()
+
+    def record_request(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._trim(now)
+            self._requests.append(now)
+
+    def try_acquire_retry(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self._trim(now)
+            if len(self._retries) >= self.min_retries + self.ratio * len(self._requests):
+                self.denied += 1
+                return False
+            self._retries.append(now)
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._trim(time.monotonic())
+            return {
+                "window_seconds": self.window_seconds,
+                "requests": len(self._requests),
+                "retries": len(self._retries),
+                "ratio": self.ratio,
+                "min_retries": self.min_retries,
+                "denied": self.denied,
+            }
+
+
+# ============================================================
+# 🔁 Per-operation retry policies
+# ============================================================
+# retry_statuses: provider HTTP statuses worth retrying.
+# Non-idempotent operations (advance / fate) only retry when the request
+# never reached the provider (connect errors), never on a provider status.
+TRANSIENT_STATUSES = frozenset({502, 503, 504})
+
+RETRY_POLICIES: Dict[str, Dict[str, Any]] = {
+    "create": {"max_attempts": 3, "retry_statuses": TRANSIENT_STATUSES},
+    "get": {"max_attempts": 3, "retry_statuses": TRANSIENT_STATUSES},
+    "advance": {"max_attempts": 2, "retry_statuses": frozenset()},
+    "fate": {"max_attempts": 2, "retry_statuses": frozenset()},
+    "pause": {"max_attempts": 3, "retry_statuses": TRANSIENT_STATUSES},
+    "stop": {"max_attempts": 3, "retry_statuses": TRANSIENT_STATUSES},
+}
+DEFAULT_RETRY_POLICY: Dict[str, Any] = {"max_attempts": 1, "retry_statuses": frozenset()}
+
+
+def get_retry_policy(operation: Optional[str]) -> Dict[str, Any]:
+    return RETRY_POLICIES.get(operation or "", DEFAULT_RETRY_POLICY)
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Exponential backoff with full jitter (attempt starts at 1)."""
+    return random.uniform(0, min(cap, base * (2 ** (attempt - 1))))
@@ -0,0 +1,110 @@
+# ===============================
+# app/services/hedging_service.py
+# Hedged (backup) requests for idempotent provider reads
+# ===============================
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class RequestHedger:
+    """
+    Run a call; if it has not finished after the recent p-th percentile
+    latency, fire a second identical call and keep whichever succeeds first.
+    - percentile: latency percentile used as the hedge delay
+    - min_delay_seconds: floor for the hedge delay
+    - min_samples: no hedging until this many latencies were observed
+    Samples are always the primary attempt's latency, whoever wins. When a
+    hedge wins, the cancelled primary contributes its elapsed time as a
+    censored (lower-bound) sample; recording the winner's time instead
+    would pull the percentile down and make hedging fire ever more often.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        min_delay_seconds: float = 0.1,
+        min_samples: int = 20,
+        window: int = 200,
+    ):
+        self.percentile = percentile
+        self.min_delay_seconds = min_delay_seconds
+        self.min_samples = min_samples
+        self._latencies: deque = deque(maxlen=window)
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.primary_wins = 0  # primary finished first although a hedge was sent
+        self.skipped = 0
+        self.censored = 0  # primary latency samples cut short by a winning hedge
+
+    def delay(self) -> Optional[float]:
+        if len(self._latencies) < self.min_samples:
+            return None
+        ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))
+        return max(self.min_delay_seconds, ordered[index])
+
+    async def run(
+        self,
+        factory: Callable[[], Awaitable[Any]],
+        may_hedge: Callable[[], bool] = lambda: True,
+    ) -> Any:
+        self.calls += 1
+        started = time.monotonic()
+        primary = asyncio.ensure_future(factory())
+        pending = {primary}
+        hedge_sent = False
+        try:
+            delay = self.delay()
+            if delay is not None:
+                done, _ = await asyncio.wait(pending, timeout=delay)
+                if not done:
+                    if may_hedge():
+                        self.hedged += 1
+                        hedge_sent = True
+                        pending.add(asyncio.ensure_future(factory()))
+                    else:
+                        self.skipped += 1
+
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # Primary first when both finished together: its sample is real
+                for task in sorted(done, key=lambda t: t is not primary):
+                    if task.exception() is None:
+                        elapsed = time.monotonic() - started
+                        if task is primary:
+                            self._latencies.append(elapsed)
+                            if hedge_sent:
+                                self.primary_wins += 1
+                        else:
+                            self.hedge_wins += 1
+                            if primary in pending:
+                                # Primary still running: it takes at least this long
+                                self._latencies.append(elapsed)
+                                self.censored += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        delay = self.delay()
+        return {
+            "calls": self.calls,
+            "hedged": self.hedged,
+            "hedge_rate": round(self.hedged / self.calls, 4) if self.calls else 0.0,
+            "hedge_wins": self.hedge_wins,
+            "primary_wins": self.primary_wins,
+            "hedge_win_rate": round(self.hedge_wins / self.hedged, 4) if self.hedged else 0.0,
+            "skipped_by_budget": self.skipped,
+            "percentile": self.percentile,
+            "delay_seconds": round(delay, 4) if delay is not None else None,
+            "samples": len(self._latencies),
+            "censored_samples": self.censored,
+        }
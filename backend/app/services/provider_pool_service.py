@@ -0,0 +1,206 @@
+# ===============================
+# app/services/provider_pool_service.py
+# Multiple simulation provider endpoints: health, latency, routing
+# ===============================
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.services.circuit_breaker_service import CLOSED, CircuitBreaker
+from app.services.utils.bounded_cache import BoundedTTLCache
+
+
+def normalize_base_url(url: str) -> str:
+    return url.strip().rstrip("/")
+
+
+class ProviderEndpoint:
+    """
+    One provider base URL with passive + active health, EWMA latency and
+    its own circuit breaker (one dead instance must not trip the others).
+    """
+
+    def __init__(
+        self,
+        url: str,
+        alpha: float = 0.3,
+        unhealthy_after: int = 3,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.url = normalize_base_url(url)
+        self.breaker = breaker or CircuitBreaker()
+        self.alpha = alpha
+        self.unhealthy_after = unhealthy_after
+        self.healthy = True
+        self.in_flight = 0
+        self.ewma_seconds: Optional[float] = None
+        self.consecutive_failures = 0
+        self.requests = 0
+        self.failures = 0
+        self.last_probe_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    def begin(self) -> None:
+        self.in_flight += 1
+        self.requests += 1
+
+    def end(self, latency: float, ok: bool, error: Optional[str] = None) -> None:
+        self.release()
+        self.observe(latency, ok, error)
+
+    def release(self) -> None:
+        """Drop an in-flight request without an outcome (e.g. cancelled)."""
+        self.in_flight -= 1
+
+    def observe(self, latency: float, ok: bool, error: Optional[str] = None) -> None:
+        if ok:
+            self.ewma_seconds = (
+                latency if self.ewma_seconds is None
+                else self.alpha * latency + (1 - self.alpha) * self.ewma_seconds
+            )
+            self.consecutive_failures = 0
+            self.healthy = True
+        else:
+            self.failures += 1
+            self.consecutive_failures += 1
+            self.last_error = error
+            if self.consecutive_failures >= self.unhealthy_after:
+                self.healthy = False
+
+    def load_score(self) -> float:
+        """Expected wait for one more request: (queue + 1) × typical latency."""
+        latency = self.ewma_seconds if self.ewma_seconds is not None else 1.0
+        return (self.in_flight + 1) * latency
+
+    def accepting(self) -> bool:
+        return self.healthy and self.breaker.state == CLOSED
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "healthy": self.healthy,
+            "breaker": self.breaker.state,
+            "in_flight": self.in_flight,
+            "ewma_ms": round(self.ewma_seconds * 1000, 1) if self.ewma_seconds is not None else None,
+            "requests": self.requests,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "last_error": self.last_error,
+            "last_probe_age_seconds": (
+                round(time.monotonic() - self.last_probe_at, 1) if self.last_probe_at else None
+            ),
+        }
+
+
+class ProviderPool:
+    """
+    Routes provider calls across endpoints.
+    - new simulations → healthy endpoint with the lowest load score
+    - existing simulation ids → sticky to the endpoint that created them
+      (unknown ids go to the primary, i.e. the first URL)
+    """
+
+    def __init__(
+        self,
+        urls: List[str],
+        alpha: float = 0.3,
+        unhealthy_after: int = 3,
+        sticky_max: int = 10000,
+        breaker_factory: Callable[[], CircuitBreaker] = CircuitBreaker,
+    ):
+        self.endpoints = [ProviderEndpoint(u, alpha, unhealthy_after, breaker_factory()) for u in urls]
+        self._by_url = {e.url: e for e in self.endpoints}
+        self._sticky = BoundedTTLCache(max_size=sticky_max)
+        self._prober: Optional[asyncio.Task] = None
+
+    @property
+    def primary(self) -> ProviderEndpoint:
+        return self.endpoints[0]
+
+    # ---------------------------------------------------------
+    # Routing
+    # ---------------------------------------------------------
+    def pick_for_new(self, exclude: Optional[ProviderEndpoint] = None) -> ProviderEndpoint:
+        candidates = [e for e in self.endpoints if e.accepting() and e is not exclude]
+        if not candidates:
+            candidates = [e for e in self.endpoints if e is not exclude] or self.endpoints
+        return min(candidates, key=lambda e: e.load_score())
+
+    def for_simulation(self, simulation_id: str) -> ProviderEndpoint:
+        url = self._sticky.get(simulation_id)
+        return self._by_url.get(url) or self.primary
+
+    def route(self, path: str, exclude: Optional[ProviderEndpoint] = None) -> ProviderEndpoint:
+        """`/simulations/{id}/...` is sticky; anything else is a new placement."""
+        parts = [p for p in path.split("/") if p]
+        if len(parts) >= 2 and parts[0] == "simulations":
+            return self.for_simulation(parts[1])
+        return self.pick_for_new(exclude)
+
+    def bind(self, simulation_id: str, url: str) -> None:
+        endpoint = self.endpoint_for_url(url)
+        if endpoint is not None:
+            self._sticky.set(simulation_id, endpoint.url)
+
+    def lookup(self, simulation_id: str) -> Optional[str]:
+        return self._sticky.get(simulation_id)
+
+    def endpoint_for_url(self, url: str) -> Optional[ProviderEndpoint]:
+        """Endpoint whose base URL is ``url`` or a path prefix of it (segment-exact)."""
+        url = normalize_base_url(url)
+        endpoint = self._by_url.get(url)
+        if endpoint is not None:
+            return endpoint
+        # Longest base first, so http://p/a/b wins over http://p/a
+        for endpoint in sorted(self.endpoints, key=lambda e: len(e.url), reverse=True):
+            if url.startswith(endpoint.url + "/"):
+                return endpoint
+        return None
+
+    # ---------------------------------------------------------
+    # Active health probes
+    # ---------------------------------------------------------
+    async def probe_once(self, check: Callable[[str], Awaitable[bool]]) -> None:
+        async def _probe(endpoint: ProviderEndpoint) -> None:
+            try:
+                ok = await check(endpoint.url)
+                error = None if ok else "health check failed"
+            except Exception as e:
+                ok, error = False, f"{type(e).__name__}: {e}"
+            endpoint.last_probe_at = time.monotonic()
+            # Probe latency is not request latency: only health is updated
+            if ok:
+                endpoint.healthy = True
+                endpoint.consecutive_failures = 0
+            else:
+                # A failed probe alone marks the endpoint down for new placements
+                endpoint.healthy = False
+                endpoint.failures += 1
+                endpoint.last_error = error
+
+        await asyncio.gather(*(_probe(e) for e in self.endpoints))
+
+    async def _probe_loop(self, check: Callable[[str], Awaitable[bool]], interval: float) -> None:
+        while True:
+            await self.probe_once(check)
+            await asyncio.sleep(interval)
+
+    def start_probes(self, check: Callable[[str], Awaitable[bool]], interval: float) -> None:
+        if len(self.endpoints) < 2 or interval <= 0:
+            return  # nothing to choose between
+        if self._prober is None or self._prober.done():
+            self._prober = asyncio.create_task(self._probe_loop(check, interval))
+
+    async def stop_probes(self) -> None:
+        if self._prober is not None:
+            self._prober.cancel()
+            await asyncio.gather(self._prober, return_exceptions=True)
+        self._prober = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "endpoints": [e.stats() for e in self.endpoints],
+            "sticky_simulations": len(self._sticky),
+            "probing": self._prober is not None and not self._prober.done(),
+        }
@@ -0,0 +1,174 @@
+# ===============================
+# app/services/provider_scheduler_service.py
+# Fair, bounded concurrency for simulation provider calls
+# ===============================
+
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Hashable, Optional
+
+# User on whose behalf provider calls are made (set by the controller)
+current_provider_user: ContextVar[Optional[Hashable]] = ContextVar("current_provider_user", default=None)
+
+# Lower value = dispatched first. Control calls jump ahead of heavy ones.
+PRIORITY_CONTROL = 0
+PRIORITY_READ = 1
+PRIORITY_HEAVY = 2
+
+OPERATION_PRIORITIES: Dict[str, int] = {
+    "pause": PRIORITY_CONTROL,
+    "stop": PRIORITY_CONTROL,
+    "get": PRIORITY_READ,
+    "create": PRIORITY_HEAVY,
+    "advance": PRIORITY_HEAVY,
+    "fate": PRIORITY_HEAVY,
+}
+
+
+class SchedulerQueueFull(Exception):
+    """Raised when a user's (or the global) provider queue is full."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Provider queue full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class ProviderScheduler:
+    """
+    Global concurrency cap with per-user round-robin queues per priority class.
+    - max_concurrent: provider calls allowed in flight at once
+    - max_queued_per_user: waiting calls per user before 429
+    - max_queued_total: waiting calls overall before 429
+    """
+
+    def __init__(self, max_concurrent: int = 32, max_queued_per_user: int = 8, max_queued_total: int = 500):
+        self.max_concurrent = max_concurrent
+        self.max_queued_per_user = max_queued_per_user
+        self.max_queued_total = max_queued_total
+        self.running = 0
+        self._queues: Dict[int, Dict[Hashable, Deque[asyncio.Future]]] = {}
+        self._rings: Dict[int, Deque[Hashable]] = {}
+        self._queued_by_user: Dict[Hashable, int] = {}
+        self._queued_total = 0
+        self._avg_hold_seconds = 1.0
+        self.granted = 0
+        self.queued = 0
+        self.rejected = 0
+
+    # ---------------------------------------------------------
+    # Queue bookkeeping
+    # ---------------------------------------------------------
+    def _enqueue(self, priority: int, user: Hashable, fut: asyncio.Future) -> None:
+        users = self._queues.setdefault(priority, {})
+        ring = self._rings.setdefault(priority, deque())
+        if user not in users:
+            users[user] = deque()
+            ring.append(user)
+        users[user].append(fut)
+        self._queued_by_user[user] = self._queued_by_user.get(user, 0) + 1
+        self._queued_total += 1
+
+    def _unqueue(self, user: Hashable) -> None:
+        self._queued_total -= 1
+        left = self._queued_by_user.get(user, 1) - 1
+        if left:
+            self._queued_by_user[user] = left
+        else:
+            self._queued_by_user.pop(user, None)
+
+    def _remove(self, priority: int, user: Hashable, fut: asyncio.Future) -> None:
+        q = self._queues.get(priority, {}).get(user)
+        if q is None or fut not in q:
+            return
+        q.remove(fut)
+        self._unqueue(user)
+        if not q:
+            del self._queues[priority][user]
+            self._rings[priority].remove(user)
+
+    def _dispatch(self) -> None:
+        """Hand free slots to waiters: best priority first, round-robin by user."""
+        for priority in sorted(self._rings):
+            ring = self._rings[priority]
+            while ring and self.running < self.max_concurrent:
+                user = ring.popleft()
+                q = self._queues[priority][user]
+                fut = q.popleft()
+                self._unqueue(user)
+                if q:
+                    ring.append(user)
+                else:
+                    del self._queues[priority][user]
+                if fut.done():
+                    continue
+                self.running += 1
+                self.granted += 1
+                fut.set_result(None)
+
+    def _retry_after(self) -> int:
+        waves = (self._queued_total + 1) / max(1, self.max_concurrent)
+        return max(1, math.ceil(waves * self._avg_hold_seconds))
+
+    # ---------------------------------------------------------
+    # Public API
+    # ---------------------------------------------------------
+    async def acquire(self, user: Hashable, operation: Optional[str]) -> None:
+        if self.running < self.max_concurrent and not self._queued_total:
+            self.running += 1
+            self.granted += 1
+            return
+
+        if (
+            self._queued_by_user.get(user, 0) >= self.max_queued_per_user
+            or self._queued_total >= self.max_queued_total
+        ):
+            self.rejected += 1
+            raise SchedulerQueueFull(self._retry_after())
+
+        priority = OPERATION_PRIORITIES.get(operation or "", PRIORITY_READ)
+        fut = asyncio.get_running_loop().create_future()
+        self._enqueue(priority, user, fut)
+        self.queued += 1
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                self.release()  # slot was granted as we were cancelled
+            else:
+                self._remove(priority, user, fut)
+            raise
+
+    def release(self) -> None:
+        self.running -= 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, operation: Optional[str] = None):
+        user = current_provider_user.get()
+        await self.acquire("system" if user is None else user, operation)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            held = time.monotonic() - started
+            self._avg_hold_seconds = 0.9 * self._avg_hold_seconds + 0.1 * held
+            self.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "running": self.running,
+            "queued_now": self._queued_total,
+            "queued_by_priority": {
+                p: sum(len(q) for q in users.values()) for p, users in self._queues.items()
+            },
+            "users_waiting": len(self._queued_by_user),
+            "granted": self.granted,
+            "queued": self.queued,
+            "rejected": self.rejected,
+            "avg_hold_seconds": round(self._avg_hold_seconds, 3),
+        }
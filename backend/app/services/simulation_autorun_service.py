@@ -0,0 +1,213 @@
+# ===============================
+# app/services/simulation_autorun_service.py
+# Server-side auto-run worker for simulations (one asyncio task per job)
+# ===============================
+
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import func
+
+from app.controllers import simulation_session_controller
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.db.models.simulation_job_model import SimulationJob, SimulationJobStatus
+from app.services import simulation_service
+from app.services.provider_scheduler_service import current_provider_user
+from app.services.simulation_projection_service import PROJECTION_PROFILES
+
+ACTIVE_STATUSES = (SimulationJobStatus.queued, SimulationJobStatus.running)
+
+# Jobs driven by this worker process
+_running: Dict[int, asyncio.Task] = {}
+_supervisor: Optional[asyncio.Task] = None
+
+
+def start_job(jobid: int) -> None:
+    """Schedule a job on this worker's event loop."""
+    if jobid in _running:
+        return
+    task = asyncio.create_task(_run_job(jobid))
+    _running[jobid] = task
+    task.add_done_callback(lambda _t: _running.pop(jobid, None))
+
+
+def _stop_reason(sim: Dict[str, Any], conditions: Dict[str, Any]) -> Optional[str]:
+    """First matching stop condition for the latest snapshot, if any."""
+    sim_status = (sim.get("status") or "").lower()
+    if sim_status and sim_status in {s.lower() for s in conditions.get("statuses") or []}:
+        return f"status:{sim_status}"
+
+    keywords = [k.lower() for k in conditions.get("keywords") or [] if k]
+    for e in sim.get("events", []):
+        text = (e.get("summary") or e.get("text") or "").lower()
+        for k in keywords:
+            if k in text:
+                return f"keyword:{k}"
+    return None
+
+
+def _finish(db, job: SimulationJob, status: SimulationJobStatus, error: Optional[str] = None) -> bool:
+    """
+    Write the final status only if the job is still running. A cancel that
+    landed during the last advance wins over completed / stopped / failed.
+    """
+    values = {SimulationJob.status: status, SimulationJob.finished_at: datetime.utcnow()}
+    if error:
+        values[SimulationJob.error] = error[:2000]
+    won = (
+        db.query(SimulationJob)
+        .filter(SimulationJob.jobid == job.jobid, SimulationJob.status == SimulationJobStatus.running)
+        .update(values, synchronize_session=False)
+    )
+    db.commit()
+    db.refresh(job)
+    print(f"[AUTORUN] Job {job.jobid} → {job.status.value} ({job.turns_completed}/{job.turns_requested})")
+    return bool(won)
+
+
+async def _run_job(jobid: int) -> None:
+    db = SessionLocal()
+    try:
+        job = db.query(SimulationJob).filter(SimulationJob.jobid == jobid).first()
+        if not job or job.status not in ACTIVE_STATUSES:
+            return
+
+        job.status = SimulationJobStatus.running
+        job.started_at = job.started_at or datetime.utcnow()
+        db.commit()
+
+        simulation_session_controller.warm_caches(db, job.simulation_id)
+        conditions = json.loads(job.stop_conditions or "{}")
+        max_errors = conditions.get("max_consecutive_errors") or 3
+        max_duration = conditions.get("max_duration_seconds")
+        current_provider_user.set(job.userid)
+        started = time.monotonic()
+        errors = 0
+
+        while job.turns_completed < job.turns_requested:
+            db.refresh(job)
+            if job.status == SimulationJobStatus.cancelled:
+                print(f"[AUTORUN] Job {jobid} cancelled")
+                return
+            if max_duration and time.monotonic() - started >= max_duration:
+                _finish(db, job, SimulationJobStatus.stopped, "max_duration_seconds reached")
+                return
+
+            try:
+                result = await simulation_service.advance_simulation(
+                    job.simulation_id,
+                    {"steps": job.steps_per_turn},
+                    fields=PROJECTION_PROFILES["board"],
+                )
+                errors = 0
+            except HTTPException as exc:
+                errors += 1
+                if errors >= max_errors or exc.status_code in (400, 401, 403, 404):
+                    _finish(db, job, SimulationJobStatus.failed, f"{exc.status_code}: {exc.detail}")
+                    return
+                retry_after = (exc.headers or {}).get("Retry-After")
+                await asyncio.sleep(float(retry_after) if retry_after else 2.0 * errors)
+                continue
+
+            sim = result.get("simulation", {})
+            job.turns_completed += 1
+            job.progress = json.dumps({
+                "provider_status": sim.get("status"),
+                "outcome": result.get("outcome"),
+                "last_events": [
+                    e.get("summary") or e.get("text") for e in (sim.get("events") or [])[-3:]
+                ],
+            })
+            db.commit()
+            simulation_session_controller.record_activity(db, job.simulation_id, result)
+
+            reason = _stop_reason(sim, conditions)
+            if reason:
+                _finish(db, job, SimulationJobStatus.stopped, reason)
+                return
+            if job.pacing_seconds:
+                await asyncio.sleep(job.pacing_seconds)
+
+        _finish(db, job, SimulationJobStatus.completed)
+    except asyncio.CancelledError:
+        # Worker shutdown: leave the job active so another worker resumes it
+        raise
+    except Exception as e:
+        print(f"❌ [AUTORUN] Job {jobid} crashed: {e}")
+        db.rollback()
+        job = db.query(SimulationJob).filter(SimulationJob.jobid == jobid).first()
+        if job:
+            _finish(db, job, SimulationJobStatus.failed, str(e))
+    finally:
+        db.close()
+
+
+def resume_stale_jobs() -> int:
+    """
+    Claim active jobs whose heartbeat (updated_at) went stale, e.g. after a
+    restart, and run them here. The claim is a conditional UPDATE so only
+    one worker wins each job.
+    """
+    db = SessionLocal()
+    claimed = 0
+    try:
+        cutoff = func.now() - timedelta(seconds=settings.simulation_autorun_stale_seconds)
+        stale = (
+            db.query(SimulationJob)
+            .filter(
+                SimulationJob.status.in_(ACTIVE_STATUSES),
+                SimulationJob.is_deleted == False,
+                SimulationJob.updated_at < cutoff,
+            )
+            .limit(50)
+            .all()
+        )
+        for job in stale:
+            if job.jobid in _running:
+                continue
+            won = (
+                db.query(SimulationJob)
+                .filter(SimulationJob.jobid == job.jobid, SimulationJob.updated_at == job.updated_at)
+                .update({SimulationJob.updated_at: func.now()}, synchronize_session=False)
+            )
+            db.commit()
+            if won:
+                start_job(job.jobid)
+                claimed += 1
+        if claimed:
+            print(f"[AUTORUN] Resumed {claimed} stale job(s)")
+        return claimed
+    except Exception as e:
+        db.rollback()
+        print(f"❌ [AUTORUN] Resume sweep failed: {e}")
+        return claimed
+    finally:
+        db.close()
+
+
+async def _supervise() -> None:
+    while True:
+        resume_stale_jobs()
+        await asyncio.sleep(settings.simulation_autorun_sweep_seconds)
+
+
+async def start_supervisor() -> None:
+    global _supervisor
+    if _supervisor is None or _supervisor.done():
+        _supervisor = asyncio.create_task(_supervise())
+
+
+async def stop_supervisor() -> None:
+    global _supervisor
+    tasks = list(_running.values())
+    if _supervisor is not None:
+        tasks.append(_supervisor)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    _supervisor = None
@@ -0,0 +1,141 @@
+# ===============================
+# app/services/simulation_autosave_service.py
+# Persist the final provider state of a stopped simulation into result_tbl
+# ===============================
+
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from fastapi import HTTPException
+
+from app.controllers import result_controller
+from app.db.database import SessionLocal
+from app.db.models.agent_model import Agent
+from app.db.models.projectagent_model import ProjectAgent
+from app.db.models.simulation_session_model import SimulationSession
+from app.services import simulation_service
+from app.services.provider_scheduler_service import current_provider_user
+from app.services.simulation_journal_service import merged_history
+
+_counters: Dict[str, int] = {"saved": 0, "skipped": 0, "failed": 0}
+
+
+# ============================================================
+# 🔁 Provider state → save_simulation_results payload
+# ============================================================
+def _cast_ids(db, projectid: int) -> Dict[str, int]:
+    """Agent name → projectagentid for the project's cast."""
+    rows = (
+        db.query(Agent.agentname, ProjectAgent.projagentid)
+        .join(ProjectAgent, ProjectAgent.agentid == Agent.agentid)
+        .filter(ProjectAgent.projectid == projectid, ProjectAgent.is_deleted == False)
+        .all()
+    )
+    return {name: projagentid for name, projagentid in rows}
+
+
+def _position(agent: Dict[str, Any]) -> Dict[str, Any]:
+    pos = agent.get("position")
+    if isinstance(pos, dict):
+        return {"x": pos.get("x"), "y": pos.get("y"), "facing": pos.get("facing") or agent.get("facing")}
+    if isinstance(pos, (list, tuple)) and len(pos) >= 2:
+        return {"x": pos[0], "y": pos[1], "facing": agent.get("facing")}
+    return {"x": None, "y": None, "facing": agent.get("facing")}
+
+
+def build_result_payload(
+    sim: Dict[str, Any], events: List[Dict[str, Any]], cast_ids: Dict[str, int]
+) -> Dict[str, Any]:
+    """
+    Map a provider snapshot to the logs / agentLogs / positions blobs the
+    frontend posts to /results/save_simulation.
+    """
+    agents = simulation_service._filter_agents(sim)
+    names_by_id = {a.get("id"): a.get("name") for a in agents}
+    turn = simulation_service._current_turn(sim)
+
+    logs = [
+        {
+            "turn": e.get("turn"),
+            "who": names_by_id.get(e.get("actor_id")) or "System",
+            "text": e.get("summary") or e.get("text") or "",
+        }
+        for e in events
+        if simulation_service._is_visible_event(e, set(names_by_id))
+    ]
+
+    agent_logs: Dict[str, List[Dict[str, Any]]] = {}
+    positions: List[Dict[str, Any]] = []
+    for a in agents:
+        name = a.get("name")
+        projectagentid = cast_ids.get(name)
+        key = str(projectagentid) if projectagentid is not None else name
+        agent_logs[key] = [{
+            "time": turn,
+            "emotion": a.get("emotional_state"),
+            "memory": a.get("memory"),
+            "corrosion": a.get("corroded_memory"),
+        }]
+        if a.get("position") is not None:
+            positions.append({"agent": name, "projectagentid": projectagentid, **_position(a)})
+
+    return {"logs": logs, "agentLogs": agent_logs, "positions": positions}
+
+
+# ============================================================
+# 💾 Persist (runs in a worker thread with its own DB session)
+# ============================================================
+def _persist(simulation_id: str, raw: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    db = SessionLocal()
+    try:
+        session = (
+            db.query(SimulationSession)
+            .filter(SimulationSession.simulation_id == simulation_id, SimulationSession.is_deleted == False)
+            .first()
+        )
+        # Claim the save on this simulation's own session row; a manual save
+        # through /results/save_simulation sets the same flag
+        if (
+            not session
+            or not session.scenarioid
+            or not session.projectid
+            or not result_controller.mark_results_saved(db, simulation_id)
+        ):
+            db.rollback()
+            _counters["skipped"] += 1
+            return None
+
+        sim = raw.get("simulation") or raw
+        events = merged_history(db, simulation_id, sim.get("events") or [])
+        payload = build_result_payload(sim, events, _cast_ids(db, session.projectid))
+        return result_controller.save_simulation_results(
+            db,
+            scenarioid=session.scenarioid,
+            projectid=session.projectid,
+            simulation=sim,
+            claimed=True,
+            **payload,
+        )
+    finally:
+        db.close()
+
+
+async def autosave_final_state(simulation_id: str, user_id: Optional[int] = None) -> None:
+    """Background task after stop: fetch the final state and save it. Never raises."""
+    current_provider_user.set(user_id)
+    try:
+        raw = await simulation_service._fetch_simulation(simulation_id)
+        out = await asyncio.to_thread(_persist, simulation_id, raw)
+        if out:
+            _counters["saved"] += 1
+            print(f"💾 [AUTOSAVE] {simulation_id}: {out['detail']}")
+    except HTTPException as e:
+        _counters["failed"] += 1
+        print(f"❌ [AUTOSAVE] {simulation_id}: {e.status_code} {e.detail}")
+    except Exception as e:
+        _counters["failed"] += 1
+        print(f"❌ [AUTOSAVE] {simulation_id}: {e}")
+
+
+def stats() -> Dict[str, int]:
+    return dict(_counters)
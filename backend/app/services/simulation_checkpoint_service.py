@@ -0,0 +1,126 @@
+# ===============================
+# app/services/simulation_checkpoint_service.py
+# Compressed, content-addressed storage for simulation checkpoints
+# ===============================
+
+import hashlib
+import json
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.db.models.simulation_checkpoint_model import SimulationStateBlob
+from app.services.simulation_projection_service import FULL_AGENT_FIELDS, get_projector
+
+MANIFEST_VERSION = 1
+
+# Events are stored in fixed segments so successive checkpoints (and forks)
+# reuse every full segment of their common history.
+EVENT_SEGMENT_SIZE = 50
+COMPRESSION_LEVEL = 6
+
+
+def _encode(value: Any) -> Tuple[str, bytes, int]:
+    raw = json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str).encode()
+    return hashlib.sha256(raw).hexdigest(), zlib.compress(raw, COMPRESSION_LEVEL), len(raw)
+
+
+def put_blobs(db: Session, values: Iterable[Any]) -> Tuple[List[str], int]:
+    """
+    Store values as compressed blobs (existing digests are skipped).
+    Returns the digests in order and the compressed bytes newly written.
+    """
+    digests: List[str] = []
+    rows: Dict[str, Dict[str, Any]] = {}
+    for value in values:
+        digest, data, raw_size = _encode(value)
+        digests.append(digest)
+        rows.setdefault(digest, {"digest": digest, "data": data, "raw_size": raw_size, "stored_size": len(data)})
+    if not rows:
+        return digests, 0
+
+    existing = {
+        d for (d,) in db.query(SimulationStateBlob.digest).filter(SimulationStateBlob.digest.in_(list(rows)))
+    }
+    new_rows = [r for d, r in rows.items() if d not in existing]
+    if new_rows:
+        stmt = pg_insert(SimulationStateBlob.__table__).values(new_rows)
+        db.execute(stmt.on_conflict_do_nothing(index_elements=["digest"]))
+    return digests, sum(r["stored_size"] for r in new_rows)
+
+
+def get_blobs(db: Session, digests: List[str]) -> List[Any]:
+    """Load and decompress blobs, in the order given."""
+    if not digests:
+        return []
+    rows = db.query(SimulationStateBlob.digest, SimulationStateBlob.data).filter(
+        SimulationStateBlob.digest.in_(set(digests))
+    )
+    by_digest = {d: json.loads(zlib.decompress(data)) for d, data in rows}
+    missing = [d for d in digests if d not in by_digest]
+    if missing:
+        raise LookupError(f"Checkpoint blob(s) missing: {', '.join(missing[:3])}")
+    return [by_digest[d] for d in digests]
+
+
+def segment_events(events: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    return [events[i:i + EVENT_SEGMENT_SIZE] for i in range(0, len(events), EVENT_SEGMENT_SIZE)]
+
+
+def build_manifest(
+    db: Session,
+    sim: Dict[str, Any],
+    agents: List[Dict[str, Any]],
+    events: List[Dict[str, Any]],
+    turn: int,
+    parent_manifest: Optional[Dict[str, Any]] = None,
+) -> Tuple[Dict[str, Any], int]:
+    """
+    Store agent states and event segments, return (manifest, new bytes).
+    With a parent manifest (the checkpoint a fork was seeded from), the
+    parent's event segments are referenced as the branch prefix as-is.
+    """
+    project = get_projector(FULL_AGENT_FIELDS)
+    agent_states = [project(a) for a in agents]
+    agent_digests, agent_bytes = put_blobs(db, agent_states)
+    event_digests, event_bytes = put_blobs(db, segment_events(events))
+
+    prefix = (parent_manifest or {}).get("events", [])
+    prefix_count = (parent_manifest or {}).get("event_count", 0)
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "scenario": sim.get("scenario") or (parent_manifest or {}).get("scenario"),
+        "status": sim.get("status"),
+        "turn": turn,
+        "agents": [{"name": a.get("name"), "blob": d} for a, d in zip(agent_states, agent_digests)],
+        "events": prefix + event_digests,
+        "event_count": prefix_count + len(events),
+    }
+    return manifest, agent_bytes + event_bytes
+
+
+def load_agents(db: Session, manifest: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return get_blobs(db, [a["blob"] for a in manifest.get("agents", [])])
+
+
+def load_recent_events(db: Session, manifest: Dict[str, Any], limit: int) -> List[Dict[str, Any]]:
+    """
+    Last `limit` events, reading only the trailing segments. A fork's
+    manifest is its parent's segments plus its own, so partial segments
+    can sit mid-list: segments are read backwards until `limit` is met.
+    """
+    if limit <= 0:
+        return []
+    digests = manifest.get("events", [])
+    batch = -(-limit // EVENT_SEGMENT_SIZE) + 1
+    collected: List[List[Dict[str, Any]]] = []
+    count, end = 0, len(digests)
+    while end > 0 and count < limit:
+        start = max(0, end - batch)
+        segments = get_blobs(db, digests[start:end])
+        collected[:0] = segments
+        count += sum(len(segment) for segment in segments)
+        end = start
+    return [e for segment in collected for e in segment][-limit:]
@@ -0,0 +1,148 @@
+# ===============================
+# app/services/simulation_cursor_service.py
+# Per-simulation change tracking for the event cursor / delta API
+# ===============================
+
+import uuid
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional
+
+
+class _SimulationCursorState:
+    """
+    Last-seen state of one simulation, versioned by a monotonic cursor.
+    The numbering only exists in this process, so cursors handed out are
+    tagged with a random epoch; another worker (or this one after a
+    restart or eviction) has a different epoch and will not mistake them
+    for its own.
+    """
+
+    def __init__(self, max_events: int):
+        self.epoch = uuid.uuid4().hex[:12]
+        self.cursor = 0
+        self.events: List[Dict[str, Any]] = []   # [{"cursor": n, "event": {...}}]
+        self.event_keys: set = set()   # kept after trimming: snapshots resend full history
+        self.trimmed_cursor = 0        # cursor of the newest event trimmed from the buffer
+        self.agents: Dict[Any, Dict[str, Any]] = {}          # id → last field values
+        self.field_cursors: Dict[Any, Dict[str, int]] = {}   # id → field → cursor
+        self.status: Optional[str] = None
+        self.max_events = max_events
+
+    @property
+    def oldest_cursor(self) -> int:
+        """Cursors older than this can no longer be answered with a delta."""
+        return self.trimmed_cursor
+
+    def token(self) -> str:
+        return f"{self.epoch}.{self.cursor}"
+
+    def resolve(self, token: Optional[str]) -> Optional[int]:
+        """Cursor number for a token issued by this state, else None (resync)."""
+        if not token:
+            return None
+        epoch, _, number = token.partition(".")
+        if epoch != self.epoch or not number.isdigit():
+            return None
+        after = int(number)
+        if after > self.cursor or after < self.oldest_cursor:
+            return None
+        return after
+
+
+class SimulationCursorTracker:
+    def __init__(self, max_simulations: int = 500, max_events: int = 1000):
+        self.max_simulations = max_simulations
+        self.max_events = max_events
+        self._states: "OrderedDict[str, _SimulationCursorState]" = OrderedDict()
+        self._lock = Lock()
+
+    def _state_for(self, simulation_id: str) -> _SimulationCursorState:
+        state = self._states.get(simulation_id)
+        if state is None:
+            state = _SimulationCursorState(self.max_events)
+            self._states[simulation_id] = state
+            while len(self._states) > self.max_simulations:
+                self._states.popitem(last=False)
+        else:
+            self._states.move_to_end(simulation_id)
+        return state
+
+    def ingest(
+        self,
+        simulation_id: str,
+        *,
+        status: Optional[str],
+        agents: List[Dict[str, Any]],
+        events: List[Dict[str, Any]],
+        event_key: Callable[[Dict[str, Any]], Any],
+    ) -> None:
+        """Record a fresh (already filtered) provider snapshot."""
+        with self._lock:
+            state = self._state_for(simulation_id)
+
+            for e in events:
+                key = event_key(e)
+                if key in state.event_keys:
+                    continue
+                state.cursor += 1
+                state.event_keys.add(key)
+                state.events.append({"cursor": state.cursor, "event": e})
+
+            if len(state.events) > state.max_events:
+                state.trimmed_cursor = state.events[-state.max_events - 1]["cursor"]
+                state.events = state.events[-state.max_events:]
+
+            changed_agents = []
+            for a in agents:
+                agent_id = a.get("id")
+                previous = state.agents.get(agent_id, {})
+                changed = [k for k, v in a.items() if k not in previous or previous[k] != v]
+                if changed:
+                    changed_agents.append((agent_id, a, changed))
+
+            if changed_agents or status != state.status:
+                state.cursor += 1
+            for agent_id, a, changed in changed_agents:
+                state.agents[agent_id] = dict(a)
+                fields = state.field_cursors.setdefault(agent_id, {})
+                for k in changed:
+                    fields[k] = state.cursor
+            state.status = status
+
+    def delta(self, simulation_id: str, after: Optional[str]) -> Dict[str, Any]:
+        """
+        Events and agent field changes newer than the ``after`` token.
+        An unknown, foreign or expired token gives ``reset: true`` with the
+        full retained state; the client must replace, not merge, its view.
+        """
+        with self._lock:
+            state = self._state_for(simulation_id)
+            resolved = state.resolve(after)
+            reset = resolved is None
+            since = 0 if reset else resolved
+
+            events = [item["event"] for item in state.events if item["cursor"] > since]
+            agents = []
+            for agent_id, fields in state.field_cursors.items():
+                current = state.agents[agent_id]
+                changed = {k: current.get(k) for k, c in fields.items() if c > since}
+                if changed:
+                    agents.append({"id": agent_id, **changed})
+
+            return {
+                "simulation_id": simulation_id,
+                "cursor": state.token(),
+                "reset": reset,
+                "status": state.status,
+                "events": events,
+                "agents": agents,
+            }
+
+    def forget(self, simulation_id: str) -> None:
+        with self._lock:
+            self._states.pop(simulation_id, None)
+
+
+# Global instance
+cursor_tracker = SimulationCursorTracker()
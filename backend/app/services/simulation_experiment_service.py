@@ -0,0 +1,382 @@
+# ===============================
+# app/services/simulation_experiment_service.py
+# Parameter-sweep worker: create + advance every variant of an experiment
+# ===============================
+
+import asyncio
+import copy
+import itertools
+import json
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import func
+
+from app.controllers import simulation_session_controller
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.db.models.simulation_experiment_model import (
+    SimulationExperiment,
+    SimulationExperimentRun,
+    SimulationExperimentStatus,
+    SimulationRunStatus,
+)
+from app.services import simulation_service
+from app.services.provider_scheduler_service import current_provider_user
+from app.services.simulation_projection_service import PROJECTION_PROFILES
+
+ACTIVE_STATUSES = (SimulationExperimentStatus.queued, SimulationExperimentStatus.running)
+UNFINISHED_RUNS = (SimulationRunStatus.pending, SimulationRunStatus.running)
+
+# Grid axes, in the order they vary (last one fastest)
+GRID_AXES = ("custom_agents", "relationships", "fate_prompt")
+MAX_CONSECUTIVE_ERRORS = 3
+
+# Experiments driven by this worker process
+_running: Dict[int, asyncio.Task] = {}
+_supervisor: Optional[asyncio.Task] = None
+
+
+# ============================================================
+# 🧮 Grid expansion
+# ============================================================
+def expand_grid(grid: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Cartesian product of the non-empty axes, each combination `repeats` times."""
+    axes = [(k, grid[k]) for k in GRID_AXES if grid.get(k)]
+    keys = [k for k, _ in axes]
+    variants = []
+    for combo in itertools.product(*(values for _, values in axes)):
+        for repeat in range(grid.get("repeats") or 1):
+            variants.append({**dict(zip(keys, combo)), "repeat": repeat})
+    return variants
+
+
+def build_create_payload(template: Dict[str, Any], params: Dict[str, Any]) -> Dict[str, Any]:
+    payload = copy.deepcopy(template)
+    payload.pop("projectid", None)
+    payload.pop("scenarioid", None)
+    for key in ("custom_agents", "relationships"):
+        if params.get(key) is not None:
+            payload[key] = copy.deepcopy(params[key])
+    return payload
+
+
+def _summarize(summary: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+    """Fold one advance result into the run's comparison metrics."""
+    sim = result.get("simulation", {})
+    outcome = result.get("outcome") or {}
+    return {
+        "turn": sim.get("turn"),
+        "provider_status": sim.get("status"),
+        "event_count": sim.get("event_count"),
+        "meaningful_turns": summary.get("meaningful_turns", 0) + (1 if outcome.get("meaningful") else 0),
+        "events_skipped": summary.get("events_skipped", 0) + (outcome.get("events_skipped") or 0),
+        "provider_ms": summary.get("provider_ms", 0) + (outcome.get("elapsed_ms") or 0),
+        "emotions": {a.get("name"): a.get("emotional_state") for a in sim.get("agents", [])},
+        "last_events": [e.get("summary") or e.get("text") for e in (sim.get("events") or [])[-3:]],
+    }
+
+
+# ============================================================
+# 🏃 One variant
+# ============================================================
+def _finish_run(db, run: SimulationExperimentRun, status: SimulationRunStatus, error: Optional[str] = None) -> None:
+    run.status = status
+    run.finished_at = datetime.utcnow()
+    if error:
+        run.error = error[:2000]
+    db.commit()
+
+
+def _is_cancelled(db, experimentid: int) -> bool:
+    status = (
+        db.query(SimulationExperiment.status)
+        .filter(SimulationExperiment.experimentid == experimentid)
+        .scalar()
+    )
+    return status == SimulationExperimentStatus.cancelled
+
+
+def _finish_experiment(
+    db, experimentid: int, status: SimulationExperimentStatus, error: Optional[str] = None
+) -> bool:
+    """
+    Write the final status only if the experiment is still running, so a
+    cancel that landed while the last runs finished is not overwritten.
+    """
+    values = {SimulationExperiment.status: status, SimulationExperiment.finished_at: datetime.utcnow()}
+    if error:
+        values[SimulationExperiment.error] = error[:2000]
+    won = (
+        db.query(SimulationExperiment)
+        .filter(
+            SimulationExperiment.experimentid == experimentid,
+            SimulationExperiment.status == SimulationExperimentStatus.running,
+        )
+        .update(values, synchronize_session=False)
+    )
+    db.commit()
+    return bool(won)
+
+
+def _claim_create(db, runid: int) -> bool:
+    """Record the create attempt before calling the provider (one winner per run)."""
+    won = (
+        db.query(SimulationExperimentRun)
+        .filter(
+            SimulationExperimentRun.runid == runid,
+            SimulationExperimentRun.simulation_id.is_(None),
+            SimulationExperimentRun.create_started_at.is_(None),
+        )
+        .update({SimulationExperimentRun.create_started_at: func.now()}, synchronize_session=False)
+    )
+    db.commit()
+    return bool(won)
+
+
+async def _run_variant(spec: Dict[str, Any], runid: int) -> None:
+    db = SessionLocal()
+    try:
+        run = db.query(SimulationExperimentRun).filter(SimulationExperimentRun.runid == runid).first()
+        if not run or run.status not in UNFINISHED_RUNS:
+            return
+        run.status = SimulationRunStatus.running
+        run.started_at = run.started_at or datetime.utcnow()
+        db.commit()
+
+        params = json.loads(run.params)
+        current_provider_user.set(spec["userid"])
+
+        if not run.simulation_id:
+            if run.create_started_at is not None:
+                # A previous attempt may have created a simulation we never recorded
+                _finish_run(
+                    db, run, SimulationRunStatus.failed,
+                    "Interrupted while creating its simulation; not retried to avoid a duplicate",
+                )
+                return
+            if not _claim_create(db, runid):
+                return  # another worker is creating this variant
+            result = await simulation_service.create_simulation(build_create_payload(spec["template"], params))
+            run.simulation_id = (result.get("simulation") or {}).get("id") or result.get("id")
+            if not run.simulation_id:
+                _finish_run(db, run, SimulationRunStatus.failed, "Provider returned no simulation id")
+                return
+            db.commit()
+            simulation_session_controller.register_session(
+                db,
+                result=result,
+                userid=spec["userid"],
+                projectid=spec["projectid"],
+                scenarioid=spec["scenarioid"],
+            )
+        else:
+            simulation_session_controller.warm_caches(db, run.simulation_id)
+
+        if params.get("fate_prompt") and not run.fate_applied:
+            await simulation_service.trigger_fate(run.simulation_id, {"prompt": params["fate_prompt"]})
+            run.fate_applied = True
+            db.commit()
+
+        summary = json.loads(run.summary or "{}")
+        errors = 0
+        while run.turns_completed < spec["turns_per_run"]:
+            if _is_cancelled(db, spec["experimentid"]):
+                _finish_run(db, run, SimulationRunStatus.cancelled)
+                return
+            try:
+                result = await simulation_service.advance_simulation(
+                    run.simulation_id,
+                    {"steps": spec["steps_per_turn"]},
+                    fields=PROJECTION_PROFILES["board"],
+                )
+                errors = 0
+            except HTTPException as exc:
+                errors += 1
+                if errors >= MAX_CONSECUTIVE_ERRORS or exc.status_code in (400, 401, 403, 404):
+                    _finish_run(db, run, SimulationRunStatus.failed, f"{exc.status_code}: {exc.detail}")
+                    return
+                retry_after = (exc.headers or {}).get("Retry-After")
+                await asyncio.sleep(float(retry_after) if retry_after else 2.0 * errors)
+                continue
+
+            summary = _summarize(summary, result)
+            run.turns_completed += 1
+            run.summary = json.dumps(summary)
+            db.commit()
+            simulation_session_controller.record_activity(db, run.simulation_id, result)
+
+        _finish_run(db, run, SimulationRunStatus.completed)
+    except asyncio.CancelledError:
+        # Worker shutdown: the run stays resumable
+        raise
+    except Exception as e:
+        print(f"❌ [EXPERIMENT] Run {runid} crashed: {e}")
+        db.rollback()
+        run = db.query(SimulationExperimentRun).filter(SimulationExperimentRun.runid == runid).first()
+        if run:
+            _finish_run(db, run, SimulationRunStatus.failed, str(e))
+    finally:
+        db.close()
+
+
+# ============================================================
+# 🧪 Whole experiment
+# ============================================================
+def start_experiment(experimentid: int) -> None:
+    """Schedule an experiment on this worker's event loop."""
+    if experimentid in _running:
+        return
+    task = asyncio.create_task(_run_experiment(experimentid))
+    _running[experimentid] = task
+    task.add_done_callback(lambda _t: _running.pop(experimentid, None))
+
+
+async def _heartbeat(experimentid: int) -> None:
+    """Keep updated_at fresh so other workers do not resume a live experiment."""
+    interval = max(5, settings.simulation_autorun_stale_seconds // 3)
+    while True:
+        await asyncio.sleep(interval)
+        db = SessionLocal()
+        try:
+            db.query(SimulationExperiment).filter(SimulationExperiment.experimentid == experimentid).update(
+                {SimulationExperiment.updated_at: func.now()}, synchronize_session=False
+            )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"⚠️ [EXPERIMENT] Heartbeat failed for {experimentid}: {e}")
+        finally:
+            db.close()
+
+
+async def _run_experiment(experimentid: int) -> None:
+    db = SessionLocal()
+    heartbeat: Optional[asyncio.Task] = None
+    try:
+        exp = db.query(SimulationExperiment).filter(SimulationExperiment.experimentid == experimentid).first()
+        if not exp or exp.status not in ACTIVE_STATUSES:
+            return
+        exp.status = SimulationExperimentStatus.running
+        exp.started_at = exp.started_at or datetime.utcnow()
+        db.commit()
+
+        spec = {
+            "experimentid": exp.experimentid,
+            "userid": exp.userid,
+            "projectid": exp.projectid,
+            "scenarioid": exp.scenarioid,
+            "template": json.loads(exp.template),
+            "turns_per_run": exp.turns_per_run,
+            "steps_per_turn": exp.steps_per_turn or 1,
+        }
+        runids = [
+            runid
+            for (runid,) in db.query(SimulationExperimentRun.runid)
+            .filter(
+                SimulationExperimentRun.experimentid == experimentid,
+                SimulationExperimentRun.status.in_(UNFINISHED_RUNS),
+            )
+            .order_by(SimulationExperimentRun.run_index.asc())
+        ]
+
+        limit = asyncio.Semaphore(
+            max(1, min(exp.max_concurrency or 1, settings.simulation_experiment_max_concurrency))
+        )
+
+        async def _bounded(runid: int) -> None:
+            async with limit:
+                await _run_variant(spec, runid)
+
+        heartbeat = asyncio.create_task(_heartbeat(experimentid))
+        await asyncio.gather(*(_bounded(r) for r in runids))
+
+        statuses = [s for (s,) in db.query(SimulationExperimentRun.status).filter(
+            SimulationExperimentRun.experimentid == experimentid
+        )]
+        all_failed = statuses and all(s == SimulationRunStatus.failed for s in statuses)
+        final = SimulationExperimentStatus.failed if all_failed else SimulationExperimentStatus.completed
+        if _finish_experiment(db, experimentid, final):
+            print(f"[EXPERIMENT] {experimentid} → {final.value} ({len(statuses)} run(s))")
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        print(f"❌ [EXPERIMENT] {experimentid} crashed: {e}")
+        db.rollback()
+        _finish_experiment(db, experimentid, SimulationExperimentStatus.failed, str(e))
+    finally:
+        if heartbeat is not None:
+            heartbeat.cancel()
+        db.close()
+
+
+# ============================================================
+# ♻️ Resume after restart
+# ============================================================
+def resume_stale_experiments() -> int:
+    """
+    Claim active experiments whose heartbeat went stale and run them here.
+    Finished runs are kept; unfinished ones continue from their last turn.
+    """
+    db = SessionLocal()
+    claimed = 0
+    try:
+        cutoff = func.now() - timedelta(seconds=settings.simulation_autorun_stale_seconds)
+        stale = (
+            db.query(SimulationExperiment)
+            .filter(
+                SimulationExperiment.status.in_(ACTIVE_STATUSES),
+                SimulationExperiment.is_deleted == False,
+                SimulationExperiment.updated_at < cutoff,
+            )
+            .limit(20)
+            .all()
+        )
+        for exp in stale:
+            if exp.experimentid in _running:
+                continue
+            won = (
+                db.query(SimulationExperiment)
+                .filter(
+                    SimulationExperiment.experimentid == exp.experimentid,
+                    SimulationExperiment.updated_at == exp.updated_at,
+                )
+                .update({SimulationExperiment.updated_at: func.now()}, synchronize_session=False)
+            )
+            db.commit()
+            if won:
+                start_experiment(exp.experimentid)
+                claimed += 1
+        if claimed:
+            print(f"[EXPERIMENT] Resumed {claimed} stale experiment(s)")
+        return claimed
+    except Exception as e:
+        db.rollback()
+        print(f"❌ [EXPERIMENT] Resume sweep failed: {e}")
+        return claimed
+    finally:
+        db.close()
+
+
+async def _supervise() -> None:
+    while True:
+        resume_stale_experiments()
+        await asyncio.sleep(settings.simulation_autorun_sweep_seconds)
+
+
+async def start_supervisor() -> None:
+    global _supervisor
+    if _supervisor is None or _supervisor.done():
+        _supervisor = asyncio.create_task(_supervise())
+
+
+async def stop_supervisor() -> None:
+    global _supervisor
+    tasks = list(_running.values())
+    if _supervisor is not None:
+        tasks.append(_supervisor)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    _supervisor = None
@@ -0,0 +1,163 @@
+# ===============================
+# app/services/simulation_journal_service.py
+# Batched, deduplicated writer for the simulation event journal
+# ===============================
+
+import asyncio
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.core.config import settings
+from app.db.database import engine
+from app.db.models.simulation_event_model import SimulationEvent
+from app.services.utils.bounded_cache import BoundedTTLCache
+
+_queue: Optional[asyncio.Queue] = None
+_writer: Optional[asyncio.Task] = None
+
+# simulation id → key of the newest event already queued (skip re-queuing history)
+_last_queued = BoundedTTLCache(max_size=5000, ttl_seconds=6 * 60 * 60)
+
+_counters: Dict[str, int] = {"queued": 0, "written_batches": 0, "dropped": 0, "errors": 0}
+
+
+def event_identity(e: Dict[str, Any]) -> str:
+    """Provider event id, or a content hash when the provider sends none."""
+    if e.get("id") is not None:
+        return str(e["id"])[:120]
+    basis = json.dumps(
+        [e.get("turn"), e.get("type"), e.get("actor_id"), e.get("summary") or e.get("text"), e.get("timestamp")],
+        sort_keys=True,
+        default=str,
+    )
+    return "h:" + hashlib.sha1(basis.encode()).hexdigest()
+
+
+def merged_history(db, simulation_id: str, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Journaled events the provider no longer returns, followed by its own list."""
+    seen = {event_identity(e) for e in events}
+    rows = (
+        db.query(SimulationEvent.event_key, SimulationEvent.payload)
+        .filter(SimulationEvent.simulation_id == simulation_id)
+        .order_by(SimulationEvent.eventid.asc())
+        .all()
+    )
+    older = [json.loads(payload) for key, payload in rows if key not in seen]
+    return older + list(events)
+
+
+def _as_int(value: Any) -> Optional[int]:
+    return value if isinstance(value, int) else None
+
+
+def observe(data: Dict[str, Any]) -> None:
+    """Queue the new events of a provider snapshot. Never blocks or raises."""
+    if _queue is None or not isinstance(data, dict):
+        return
+    sim = data.get("simulation")
+    if not isinstance(sim, dict) or not sim.get("id"):
+        return
+    events = sim.get("events") or []
+    if not events:
+        return
+
+    simulation_id = str(sim["id"])
+    keys = [event_identity(e) for e in events]
+    start = 0
+    last = _last_queued.get(simulation_id)
+    if last in keys:
+        start = keys.index(last) + 1   # older ones were queued before
+    if start >= len(events):
+        return
+
+    for index in range(start, len(events)):
+        e = events[index]
+        seq = _as_int(e.get("sequence"))
+        if seq is None:
+            seq = _as_int(e.get("seq"))
+        row = {
+            "simulation_id": simulation_id,
+            "event_key": keys[index],
+            "seq": seq if seq is not None else index,
+            "turn": _as_int(e.get("turn")),
+            "event_type": (e.get("type") or "")[:50] or None,
+            "actor_id": str(e["actor_id"])[:100] if e.get("actor_id") is not None else None,
+            "payload": json.dumps(e, ensure_ascii=False, default=str),
+        }
+        try:
+            _queue.put_nowait(row)
+            _counters["queued"] += 1
+        except asyncio.QueueFull:
+            _counters["dropped"] += 1
+            return  # retry from here on the next snapshot
+        _last_queued.set(simulation_id, keys[index])
+
+
+def _write_batch(rows: List[Dict[str, Any]]) -> None:
+    stmt = pg_insert(SimulationEvent.__table__).values(rows)
+    stmt = stmt.on_conflict_do_nothing(index_elements=["simulation_id", "event_key"])
+    with engine.begin() as conn:
+        conn.execute(stmt)
+
+
+async def _drain() -> None:
+    batch_size = settings.simulation_journal_batch_size
+    flush_seconds = settings.simulation_journal_flush_seconds
+    while True:
+        rows = [await _queue.get()]
+        try:
+            deadline = asyncio.get_running_loop().time() + flush_seconds
+            while len(rows) < batch_size:
+                timeout = deadline - asyncio.get_running_loop().time()
+                if timeout <= 0:
+                    break
+                try:
+                    rows.append(await asyncio.wait_for(_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+        finally:
+            await _flush(rows)
+
+
+async def _flush(rows: List[Dict[str, Any]]) -> None:
+    if not rows:
+        return
+    try:
+        await asyncio.to_thread(_write_batch, rows)
+        _counters["written_batches"] += 1
+    except Exception as e:
+        _counters["errors"] += 1
+        print(f"❌ [JOURNAL] Failed to write {len(rows)} event(s): {e}")
+
+
+async def start_writer() -> None:
+    global _queue, _writer
+    if _writer is not None and not _writer.done():
+        return
+    _queue = asyncio.Queue(maxsize=settings.simulation_journal_queue_size)
+    _writer = asyncio.create_task(_drain())
+
+
+async def stop_writer() -> None:
+    """Stop the writer and flush whatever is still queued."""
+    global _queue, _writer
+    if _writer is not None:
+        _writer.cancel()
+        await asyncio.gather(_writer, return_exceptions=True)
+    if _queue is not None:
+        leftover = []
+        while not _queue.empty():
+            leftover.append(_queue.get_nowait())
+        await _flush(leftover)
+    _queue, _writer = None, None
+
+
+def stats() -> Dict[str, Any]:
+    return {
+        **_counters,
+        "pending": _queue.qsize() if _queue is not None else 0,
+        "running": _writer is not None and not _writer.done(),
+    }
@@ -0,0 +1,123 @@
+# ===============================
+# app/services/simulation_prefetch_service.py
+# Speculative "next turn" prefetch for interactive advance
+# ===============================
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+
+class _Slot:
+    __slots__ = ("key", "task", "created_at")
+
+    def __init__(self, key: Hashable, task: asyncio.Task):
+        self.key = key
+        self.task = task
+        self.created_at = time.monotonic()
+
+
+class SpeculativePrefetcher:
+    """
+    Holds at most one speculative advance per simulation.
+    - schedule(): start advancing to the next turn in the background
+    - take(): serve the held/in-flight result if it matches the request
+    - discard(): drop it (fate, pause, stop, or a different advance)
+    - max_outstanding: speculative advances held or in flight, all simulations
+    - ttl_seconds: held results older than this are treated as stale
+    A discarded prefetch that already reached the provider cannot be undone;
+    its events still show up in the next snapshot.
+    """
+
+    def __init__(self, max_outstanding: int = 50, ttl_seconds: float = 120.0):
+        self.max_outstanding = max_outstanding
+        self.ttl_seconds = ttl_seconds
+        self._slots: Dict[Hashable, _Slot] = {}
+        self._counters: Dict[str, int] = {
+            "scheduled": 0,
+            "hits": 0,
+            "hits_in_flight": 0,   # request arrived before the prefetch finished
+            "misses": 0,
+            "wasted": 0,           # completed on the provider, never served
+            "cancelled": 0,        # still in flight when discarded
+            "failed": 0,
+            "skipped_budget": 0,
+        }
+
+    def schedule(
+        self,
+        simulation_id: Hashable,
+        key: Hashable,
+        runner: Callable[[], Awaitable[Any]],
+        allowed: Callable[[], bool] = lambda: True,
+    ) -> bool:
+        self._evict_expired()
+        if simulation_id in self._slots:
+            return False
+        if len(self._slots) >= self.max_outstanding or not allowed():
+            self._counters["skipped_budget"] += 1
+            return False
+        task = asyncio.create_task(runner())
+        # Retrieve the exception so an unserved failure is not logged as "never retrieved"
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self._slots[simulation_id] = _Slot(key, task)
+        self._counters["scheduled"] += 1
+        return True
+
+    async def take(self, simulation_id: Hashable, key: Hashable) -> Optional[Any]:
+        slot = self._slots.pop(simulation_id, None)
+        if slot is None:
+            self._counters["misses"] += 1
+            return None
+        if slot.key != key or (slot.task.done() and time.monotonic() - slot.created_at > self.ttl_seconds):
+            self._drop(slot)
+            self._counters["misses"] += 1
+            return None
+
+        in_flight = not slot.task.done()
+        try:
+            # shield: a disconnecting client must not cancel the provider call
+            result = await asyncio.shield(slot.task)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self._counters["failed"] += 1
+            self._counters["misses"] += 1
+            return None
+        self._counters["hits_in_flight" if in_flight else "hits"] += 1
+        return result
+
+    def discard(self, simulation_id: Hashable) -> None:
+        slot = self._slots.pop(simulation_id, None)
+        if slot is not None:
+            self._drop(slot)
+
+    def _evict_expired(self) -> None:
+        now = time.monotonic()
+        for simulation_id, slot in list(self._slots.items()):
+            if slot.task.done() and now - slot.created_at > self.ttl_seconds:
+                del self._slots[simulation_id]
+                self._drop(slot)
+
+    def _drop(self, slot: _Slot) -> None:
+        if slot.task.done():
+            if not slot.task.cancelled() and slot.task.exception() is None:
+                self._counters["wasted"] += 1
+        else:
+            slot.task.cancel()
+            self._counters["cancelled"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        self._evict_expired()
+        served = self._counters["hits"] + self._counters["hits_in_flight"]
+        lookups = served + self._counters["misses"]
+        return {
+            **self._counters,
+            "outstanding": len(self._slots),
+            "max_outstanding": self.max_outstanding,
+            "hit_rate": round(served / lookups, 4) if lookups else 0.0,
+            "waste_rate": (
+                round(self._counters["wasted"] / self._counters["scheduled"], 4)
+                if self._counters["scheduled"] else 0.0
+            ),
+        }
@@ -0,0 +1,94 @@
+# ===============================
+# app/services/simulation_projection_service.py
+# Named / ad-hoc agent field projections for slimmed simulation payloads
+# ===============================
+
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+# Full cognitive/behavioral profile (the historical slim output)
+FULL_AGENT_FIELDS: Tuple[str, ...] = (
+    "id",
+    "name",
+    "role",
+    "persona",
+    "mbti",
+    "cognitive_bias",
+    "motivation",
+    "secret_agenda",
+    "agenda_progress",
+    "memory",
+    "corroded_memory",
+    "traits",
+    "skills",
+    "quirks",
+    "constraints",
+    "biography",
+    "emotional_state",
+    "last_action",
+    "turn_count",
+    "position",
+    "thought_process",
+)
+
+# id + name are always kept: event filtering and the UI key on them
+REQUIRED_FIELDS: Tuple[str, ...] = ("id", "name")
+
+PROJECTION_PROFILES: Dict[str, Tuple[str, ...]] = {
+    "minimal": ("id", "name", "emotional_state", "position"),
+    "board": ("id", "name", "role", "emotional_state", "last_action", "turn_count", "position"),
+    "inspector": (
+        "id",
+        "name",
+        "role",
+        "persona",
+        "mbti",
+        "cognitive_bias",
+        "motivation",
+        "agenda_progress",
+        "traits",
+        "skills",
+        "quirks",
+        "constraints",
+        "emotional_state",
+        "last_action",
+        "turn_count",
+        "position",
+        "thought_process",
+    ),
+    "full": FULL_AGENT_FIELDS,
+}
+
+
+@lru_cache(maxsize=256)
+def get_projector(fields: Tuple[str, ...]) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """One projector per distinct field tuple."""
+    return lambda agent: {f: agent.get(f) for f in fields}
+
+
+def resolve_fields(profile: Optional[str] = None, fields: Optional[str] = None) -> Tuple[str, ...]:
+    """
+    Turn `?profile=` / `?fields=a,b` into a normalized field tuple.
+    Ad-hoc fields win over the profile; unknown names are rejected.
+    """
+    if fields:
+        requested = [f.strip() for f in fields.split(",") if f.strip()]
+        # Only known names pass, so the tuple is at most FULL_AGENT_FIELDS long
+        unknown = [f for f in requested if f not in FULL_AGENT_FIELDS]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown agent field(s): {', '.join(unknown)}",
+            )
+        ordered = list(REQUIRED_FIELDS) + [f for f in requested if f not in REQUIRED_FIELDS]
+        return tuple(dict.fromkeys(ordered))
+
+    name = (profile or "full").lower()
+    if name not in PROJECTION_PROFILES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown projection profile '{profile}'. Use one of: {', '.join(PROJECTION_PROFILES)}",
+        )
+    return PROJECTION_PROFILES[name]
@@ -1,22 +1,192 @@
 from __future__ import annotations
-from typing import Any, Dict, Optional
-import httpx, json, asyncio
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+import httpx, json, asyncio, math, random, time
+from contextlib import AsyncExitStack
 from fastapi import HTTPException, status
 from app.core.config import settings
+from app.services.circuit_breaker_service import (
+    RETRY_POLICIES,
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryBudget,
+    backoff_delay,
+    get_retry_policy,
+)
+from app.services import simulation_journal_service
+from app.services.hedging_service import RequestHedger
+from app.services.provider_pool_service import ProviderEndpoint, ProviderPool
+from app.services.provider_scheduler_service import ProviderScheduler, SchedulerQueueFull
+from app.services.simulation_prefetch_service import SpeculativePrefetcher
+from app.services.simulation_cursor_service import cursor_tracker
+from app.services.simulation_projection_service import FULL_AGENT_FIELDS, get_projector
+from app.services.utils.bounded_cache import BoundedTTLCache
 
 # =====================================================
-# 🧠 In-memory cache for user-submitted agent names
+# 🧠 User-submitted agent names, keyed by provider simulation id
 # =====================================================
-payload_agents_cache: dict[str, list[str]] = {}
+# Bounded LRU/TTL → O(1) lookup, no unbounded growth. Each worker holds
+# its own copy; routes warm it from simulation_session_tbl on a miss
+# (other worker, restart, eviction). Unregistered simulations fall back to
+# the provider's agent list, which is the closed cast since
+# create_simulation() forces strict_agent_mode / no background NPCs.
+payload_agents_cache = BoundedTTLCache(
+    max_size=settings.simulation_agent_cache_max_entries,
+    ttl_seconds=settings.simulation_agent_cache_ttl_seconds,
+)
+
+
+# =====================================================
+# 🔌 Shared HTTP Client (app-lifetime connection pool)
+# =====================================================
+_client: Optional[httpx.AsyncClient] = None
+_client_http2 = False
+
+_pool_counters: Dict[str, int] = {
+    "requests": 0,
+    "in_flight": 0,
+    "errors": 0,
+    "clients_created": 0,
+}
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _build_client() -> httpx.AsyncClient:
+    global _client_http2
+    http2 = settings.simulation_service_http2
+    if http2 and not _http2_available():
+        print("[WARN] simulation_service_http2 enabled but 'h2' is not installed → using HTTP/1.1")
+        http2 = False
+
+    limits = httpx.Limits(
+        max_connections=settings.simulation_service_max_connections,
+        max_keepalive_connections=settings.simulation_service_max_keepalive_connections,
+        keepalive_expiry=settings.simulation_service_keepalive_expiry_seconds,
+    )
+    _client_http2 = http2
+    _pool_counters["clients_created"] += 1
+    return httpx.AsyncClient(
+        timeout=_build_timeout(None),
+        limits=limits,
+        http2=http2,
+        headers=_build_headers(),
+    )
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Return the shared client, creating it lazily outside the app lifecycle."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _build_client()
+    return _client
+
+
+async def start_http_client() -> None:
+    """Open the shared provider client (called on app startup)."""
+    _get_client()
+    provider_pool.start_probes(_probe_endpoint, settings.simulation_pool_probe_interval_seconds)
+    print(f"✅ Simulation provider HTTP client started ({len(provider_pool.endpoints)} endpoint(s))")
+
+
+async def close_http_client() -> None:
+    """Close the shared provider client (called on app shutdown)."""
+    global _client
+    await provider_pool.stop_probes()
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
+    print("🛑 Simulation provider HTTP client closed")
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Snapshot of the provider connection pool and request counters."""
+    stats: Dict[str, Any] = {
+        **_pool_counters,
+        "provider_pool": provider_pool.stats(),
+        "http2": _client_http2,
+        "max_connections": settings.simulation_service_max_connections,
+        "max_keepalive_connections": settings.simulation_service_max_keepalive_connections,
+        "connections": 0,
+        "idle_connections": 0,
+    }
+    if _client is None or _client.is_closed:
+        stats["client"] = "closed"
+        return stats
+
+    stats["client"] = "open"
+    # httpcore does not publish pool metrics; read them defensively
+    pool = getattr(getattr(_client, "_transport", None), "_pool", None)
+    connections = getattr(pool, "connections", None) or []
+    stats["connections"] = len(connections)
+    stats["idle_connections"] = sum(
+        1 for c in connections if getattr(c, "is_idle", lambda: False)()
+    )
+    return stats
+
+
+# =====================================================
+# 🛡️ Circuit Breaker + Retry Budget
+# =====================================================
+def _new_breaker() -> CircuitBreaker:
+    """One breaker per pooled endpoint (see provider_pool below)."""
+    return CircuitBreaker(
+        failure_threshold=settings.simulation_breaker_failure_threshold,
+        recovery_seconds=settings.simulation_breaker_recovery_seconds,
+    )
+
+
+retry_budget = RetryBudget(
+    ratio=settings.simulation_retry_budget_ratio,
+    min_retries=settings.simulation_retry_budget_min_retries,
+    window_seconds=settings.simulation_retry_budget_window_seconds,
+)
+
+
+# =====================================================
+# 🚦 Fair Provider Scheduler
+# =====================================================
+provider_scheduler = ProviderScheduler(
+    max_concurrent=settings.simulation_scheduler_max_concurrent,
+    max_queued_per_user=settings.simulation_scheduler_max_queued_per_user,
+    max_queued_total=settings.simulation_scheduler_max_queued_total,
+)
+
+
+# =====================================================
+# 🌐 Provider Endpoint Pool
+# =====================================================
+# New simulations go to the least-loaded healthy endpoint; everything
+# under /simulations/{id} sticks to the endpoint that created it (the
+# registry persists the binding, routes warm it like the cast cache).
+provider_pool = ProviderPool(
+    settings.simulation_service_base_urls or [settings.simulation_service_base_url],
+    alpha=settings.simulation_pool_ewma_alpha,
+    unhealthy_after=settings.simulation_pool_unhealthy_after_failures,
+    breaker_factory=_new_breaker,
+)
+
+
+async def _probe_endpoint(base_url: str) -> bool:
+    """Active health check: any non-5xx answer means the instance is awake."""
+    response = await _get_client().get(
+        f"{base_url}/{settings.simulation_pool_health_path.lstrip('/')}",
+        timeout=settings.simulation_pool_probe_timeout_seconds,
+    )
+    return response.status_code < 500
 
 
 # =====================================================
 # 🔧 Core HTTP Helpers
 # =====================================================
-def _build_url(path: str) -> str:
-    base = settings.simulation_service_base_url.rstrip("/")
-    segment = path.lstrip("/")
-    return f"{base}/{segment}"
+def _route(path: str, exclude: Optional[ProviderEndpoint] = None) -> Tuple[ProviderEndpoint, str]:
+    endpoint = provider_pool.route(path, exclude)
+    return endpoint, f"{endpoint.url}/{path.lstrip('/')}"
 
 
 def _build_headers() -> Dict[str, str]:
@@ -26,137 +196,451 @@ def _build_headers() -> Dict[str, str]:
     return headers
 
 
-async def _forward_request(
-    method: str, path: str, payload: Optional[Dict[str, Any]] = None
-) -> Dict[str, Any]:
-    """Universal forwarding helper to simulation microservice."""
-    url = _build_url(path)
-    headers = _build_headers()
-
-    try:
-        async with httpx.AsyncClient(
-            timeout=settings.simulation_service_timeout_seconds
-        ) as client:
+def _build_timeout(operation: Optional[str]) -> httpx.Timeout:
+    """Per-operation read timeout, falling back to the global provider timeout."""
+    read = settings.simulation_service_operation_timeouts.get(
+        operation or "", settings.simulation_service_timeout_seconds
+    )
+    return httpx.Timeout(
+        read,
+        connect=settings.simulation_service_connect_timeout_seconds,
+        pool=settings.simulation_service_pool_timeout_seconds,
+    )
+
+
+async def _send_once(
+    method: str,
+    endpoint: ProviderEndpoint,
+    url: str,
+    payload: Optional[Dict[str, Any]],
+    operation: Optional[str],
+) -> httpx.Response:
+    """One provider round trip on the shared client (raises httpx errors)."""
+    client = _get_client()
+    async with provider_scheduler.slot(operation):
+        _pool_counters["requests"] += 1
+        _pool_counters["in_flight"] += 1
+        endpoint.begin()
+        started = time.monotonic()
+        # None until the provider answered or the transport failed; a
+        # cancelled call (hedge loser, dropped prefetch, client gone) says
+        # nothing about the endpoint's health
+        ok: Optional[bool] = None
+        error = None
+        try:
             response = await client.request(
                 method=method.upper(),
                 url=url,
                 json=payload,
-                headers=headers,
+                timeout=_build_timeout(operation),
             )
-        response.raise_for_status()
-    except httpx.HTTPStatusError as exc:
-        try:
-            detail = exc.response.json()
-        except ValueError:
-            detail = exc.response.text or exc.response.reason_phrase
-        raise HTTPException(status_code=exc.response.status_code, detail=detail) from exc
-    except httpx.RequestError as exc:
+            # 4xx is the provider answering: healthy for routing purposes
+            ok = response.status_code < 500
+            if not ok:
+                error = f"HTTP {response.status_code}"
+            response.raise_for_status()
+            return response
+        except httpx.HTTPError as exc:
+            _pool_counters["errors"] += 1
+            if ok is None:
+                ok, error = False, f"{type(exc).__name__}: {exc}"
+            raise
+        finally:
+            _pool_counters["in_flight"] -= 1
+            if ok is None:
+                endpoint.release()
+            else:
+                endpoint.end(time.monotonic() - started, ok, error)
+
+
+def _breaker_gate(endpoint: ProviderEndpoint) -> None:
+    """Fail fast with 503 while the endpoint's circuit is open."""
+    try:
+        endpoint.breaker.before_call()
+    except CircuitOpenError as exc:
         raise HTTPException(
-            status_code=status.HTTP_502_BAD_GATEWAY,
-            detail=f"Simulation provider unreachable: {exc}",
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Simulation provider is temporarily unavailable, please retry shortly",
+            headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))},
         ) from exc
 
+
+def _queue_full_error(exc: SchedulerQueueFull) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many simulation requests queued, please slow down",
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+def _may_retry(attempt: int, policy: Dict[str, Any]) -> bool:
+    return attempt < policy["max_attempts"] and retry_budget.try_acquire_retry()
+
+
+async def _forward_request(
+    method: str,
+    path: str,
+    payload: Optional[Dict[str, Any]] = None,
+    *,
+    operation: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Universal forwarding helper to simulation microservice."""
+    policy = get_retry_policy(operation)
+    retry_budget.record_request()
+
+    attempt = 0
+    endpoint: Optional[ProviderEndpoint] = None
+    while True:
+        attempt += 1
+        # Retries of unpinned calls (create) move to another endpoint
+        endpoint, url = _route(path, exclude=endpoint)
+        breaker = endpoint.breaker
+        _breaker_gate(endpoint)
+        try:
+            response = await _send_once(method, endpoint, url, payload, operation)
+        except asyncio.CancelledError:
+            breaker.release_probe()
+            raise
+        except SchedulerQueueFull as exc:
+            breaker.release_probe()
+            raise _queue_full_error(exc) from exc
+        except httpx.HTTPStatusError as exc:
+            code = exc.response.status_code
+            if code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()  # provider is up, request was rejected
+
+            if code in policy["retry_statuses"] and _may_retry(attempt, policy):
+                print(f"[Retry {attempt}/{policy['max_attempts']}] {operation} → provider {code}")
+                await asyncio.sleep(_backoff(attempt))
+                continue
+            try:
+                detail = exc.response.json()
+            except ValueError:
+                detail = exc.response.text or exc.response.reason_phrase
+            raise HTTPException(status_code=code, detail=detail) from exc
+        except httpx.RequestError as exc:
+            breaker.record_failure()
+
+            # Non-idempotent calls only retry when the request never left
+            never_sent = isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout))
+            if (never_sent or policy["retry_statuses"]) and _may_retry(attempt, policy):
+                print(f"[Retry {attempt}/{policy['max_attempts']}] {operation} → {type(exc).__name__}")
+                await asyncio.sleep(_backoff(attempt))
+                continue
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail=f"Simulation provider unreachable: {exc}",
+            ) from exc
+
+        breaker.record_success()
+        break
+
     try:
-        return response.json()
+        data = response.json()
     except ValueError:
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
             detail="Simulation provider returned invalid JSON payload",
         )
 
+    if operation == "create" and isinstance(data, dict):
+        simulation_id = (data.get("simulation") or {}).get("id") or data.get("id")
+        if simulation_id:
+            provider_pool.bind(str(simulation_id), endpoint.url)
+
+    # 📓 Every event the proxy sees goes to the journal (async, batched)
+    simulation_journal_service.observe(data)
+    return data
+
+
+async def open_passthrough(
+    simulation_id: str,
+) -> Tuple[Dict[str, str], AsyncIterator[bytes]]:
+    """
+    Stream GET /simulations/{id} straight from the provider without
+    decoding it. Returns (headers to forward, body byte iterator); the
+    scheduler slot and provider response are released when the body ends.
+    """
+    endpoint, url = _route(f"/simulations/{simulation_id}")
+    breaker = endpoint.breaker
+    client = _get_client()
+    stack = AsyncExitStack()
+
+    _breaker_gate(endpoint)
+    try:
+        await stack.enter_async_context(provider_scheduler.slot("get"))
+        _pool_counters["requests"] += 1
+        response = await client.send(
+            client.build_request("GET", url, timeout=_build_timeout("get")),
+            stream=True,
+        )
+        stack.push_async_callback(response.aclose)
+
+        if response.is_error:
+            _pool_counters["errors"] += 1
+            body = await response.aread()
+            if response.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            try:
+                detail = json.loads(body)
+            except ValueError:
+                detail = body.decode(errors="replace") or response.reason_phrase
+            raise HTTPException(status_code=response.status_code, detail=detail)
+        breaker.record_success()
+    except SchedulerQueueFull as exc:
+        breaker.release_probe()
+        await stack.aclose()
+        raise _queue_full_error(exc) from exc
+    except httpx.RequestError as exc:
+        _pool_counters["errors"] += 1
+        breaker.record_failure()
+        await stack.aclose()
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"Simulation provider unreachable: {exc}",
+        ) from exc
+    except BaseException:
+        breaker.release_probe()
+        await stack.aclose()
+        raise
+
+    headers = {"content-type": response.headers.get("content-type", "application/json")}
+    if "content-encoding" in response.headers:
+        headers["content-encoding"] = response.headers["content-encoding"]
+
+    async def body() -> AsyncIterator[bytes]:
+        try:
+            async for chunk in response.aiter_raw():
+                yield chunk
+        finally:
+            await stack.aclose()
+
+    return headers, body()
+
+
+def should_dump_debug() -> bool:
+    """Sampled switch for full payload debug dumps (off by default)."""
+    rate = settings.simulation_debug_payload_sample_rate
+    return rate > 0 and random.random() < rate
+
+
+def _backoff(attempt: int) -> float:
+    return backoff_delay(
+        attempt,
+        settings.simulation_retry_backoff_base_seconds,
+        settings.simulation_retry_backoff_max_seconds,
+    )
+
+
+def get_breaker_stats() -> Dict[str, Any]:
+    return {
+        "breakers": {e.url: e.breaker.stats() for e in provider_pool.endpoints},
+        "retry_budget": retry_budget.stats(),
+        "retry_policies": {
+            op: {"max_attempts": p["max_attempts"], "retry_statuses": sorted(p["retry_statuses"])}
+            for op, p in RETRY_POLICIES.items()
+        },
+    }
+
+
+# =====================================================
+# 🪃 Hedged Reads (tail latency)
+# =====================================================
+read_hedger = RequestHedger(
+    percentile=settings.simulation_hedge_percentile,
+    min_delay_seconds=settings.simulation_hedge_min_delay_seconds,
+    min_samples=settings.simulation_hedge_min_samples,
+)
+
+
+# =====================================================
+# 🔀 Single-flight Reads (request coalescing)
+# =====================================================
+_inflight: Dict[Tuple[str, str], "asyncio.Task"] = {}
+_read_cache: Dict[Tuple[str, str], Tuple[float, Dict[str, Any]]] = {}
+
+_coalesce_counters: Dict[str, int] = {
+    "provider_calls": 0,
+    "coalesced": 0,
+    "cache_hits": 0,
+}
+
+
+async def _single_flight(key: Tuple[str, str], factory) -> Any:
+    """Concurrent callers with the same key await one shared provider call."""
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(factory())
+        _inflight[key] = task
+        _coalesce_counters["provider_calls"] += 1
+
+        def _done(t: "asyncio.Task") -> None:
+            if _inflight.get(key) is t:
+                del _inflight[key]
+            if not t.cancelled():
+                t.exception()  # mark retrieved when every waiter has gone away
+
+        task.add_done_callback(_done)
+    else:
+        _coalesce_counters["coalesced"] += 1
+    # shield → one cancelled viewer does not cancel the call for the others
+    return await asyncio.shield(task)
+
+
+def _cache_get(key: Tuple[str, str]) -> Optional[Dict[str, Any]]:
+    ttl = settings.simulation_read_cache_ttl_seconds
+    if ttl <= 0:
+        return None
+    hit = _read_cache.get(key)
+    if hit and time.monotonic() - hit[0] < ttl:
+        _coalesce_counters["cache_hits"] += 1
+        return hit[1]
+    return None
+
+
+def _cache_put(key: Tuple[str, str], value: Dict[str, Any]) -> None:
+    ttl = settings.simulation_read_cache_ttl_seconds
+    if ttl <= 0:
+        return
+    now = time.monotonic()
+    for k in [k for k, (ts, _) in _read_cache.items() if now - ts >= ttl]:
+        del _read_cache[k]
+    _read_cache[key] = (now, value)
+
+
+def _invalidate_reads(simulation_id: str) -> None:
+    """Drop cached reads after a state-changing call."""
+    for k in [k for k in _read_cache if k[0] == simulation_id]:
+        del _read_cache[k]
+
+
+async def _fetch_simulation(simulation_id: str) -> Dict[str, Any]:
+    """Coalesced GET /simulations/{id} against the provider."""
+    def _get() -> Any:
+        return _forward_request("GET", f"/simulations/{simulation_id}", operation="get")
+
+    if settings.simulation_hedge_enabled:
+        return await _single_flight(
+            (simulation_id, "get"), lambda: read_hedger.run(_get, lambda: _may_hedge(simulation_id))
+        )
+    return await _single_flight((simulation_id, "get"), _get)
+
+
+def _may_hedge(simulation_id: str) -> bool:
+    """Hedges are extra provider load: only while healthy and within budget."""
+    return provider_pool.for_simulation(simulation_id).accepting() and retry_budget.try_acquire_retry()
+
+
+def get_coalescing_stats() -> Dict[str, Any]:
+    return {
+        **_coalesce_counters,
+        "in_flight": len(_inflight),
+        "cached": len(_read_cache),
+        "cache_ttl_seconds": settings.simulation_read_cache_ttl_seconds,
+    }
+
 
 # =====================================================
 # 🧩 Unified Slim Simulation Helper
 # =====================================================
-def _slim_simulation(data: Dict[str, Any]) -> Dict[str, Any]:
+def _allowed_agent_names(sim: Dict[str, Any]) -> set:
+    """Names of the user-submitted cast for this simulation."""
+    agents = sim.get("agents", [])
+    allowed_names = set(payload_agents_cache.get(sim.get("id")) or ())
+
+    # fallback → include all current agents if cache empty
+    if not allowed_names:
+        allowed_names.update(a.get("name") for a in agents if a.get("name"))
+    return allowed_names
+
+
+def _filter_agents(
+    sim: Dict[str, Any], fields: Tuple[str, ...] = FULL_AGENT_FIELDS
+) -> List[Dict[str, Any]]:
+    """Keep only the cast, projected to `fields` (default: full profile)."""
+    allowed_names = _allowed_agent_names(sim)
+    project = get_projector(fields)
+    return [project(a) for a in sim.get("agents", []) if a.get("name") in allowed_names]
+
+
+def _is_visible_event(e: Dict[str, Any], allowed_agent_ids: set) -> bool:
+    """Drop ghost NPC events and redundant system messages."""
+    actor_id = e.get("actor_id")
+    event_type = e.get("type", "")
+    summary = e.get("summary", "")
+
+    # skip ghost NPCs
+    if actor_id and actor_id not in allowed_agent_ids:
+        return False
+
+    # skip redundant system messages
+    if event_type == "system" and (
+        "Agents initialized" in summary
+        or "Simulation created" in summary
+        or "entered the scenario" in e.get("details", "")
+        or "Memory corrosion applied" in summary
+        or "Memory corrosion" in summary
+        or summary.strip().lower() == "internal reasoning"
+    ):
+        return False
+    return True
+
+
+def _event_key(e: Dict[str, Any]) -> Any:
+    """Stable identity for a provider event (id when present)."""
+    if e.get("id") is not None:
+        return e["id"]
+    return (e.get("turn"), e.get("type"), e.get("actor_id"), e.get("summary") or e.get("text"))
+
+
+def _slim_envelope(sim: Dict[str, Any], agents: List[Dict[str, Any]], events: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "simulation": {
+            "id": sim.get("id"),
+            "scenario": sim.get("scenario"),
+            "status": sim.get("status"),
+            "created_at": sim.get("created_at"),
+            "updated_at": sim.get("updated_at"),
+            "active_agent_index": sim.get("active_agent_index"),
+            "turn": _current_turn(sim),
+            "event_count": len(sim.get("events") or []),
+            "agents": agents,
+            "events": events,
+        }
+    }
+
+
+def _current_turn(sim: Dict[str, Any]) -> int:
+    """Provider turn counter, or the furthest agent turn_count."""
+    for key in ("turn", "current_turn"):
+        if isinstance(sim.get(key), int):
+            return sim[key]
+    counts = [a.get("turn_count") for a in sim.get("agents", []) if isinstance(a.get("turn_count"), int)]
+    return max(counts, default=0)
+
+
+def _slim_simulation(
+    data: Dict[str, Any], fields: Tuple[str, ...] = FULL_AGENT_FIELDS
+) -> Dict[str, Any]:
     """Apply the same slim logic used in get_simulation()."""
     sim = data.get("simulation", {})
     events = sim.get("events", [])
-    agents = sim.get("agents", [])
 
     # 🎯 Trim to last few events for brevity
     trimmed_events = events[-3:] if len(events) > 3 else events
 
-    # 🎯 Determine allowed agent names from cache
-    allowed_names = set()
-    scenario_text = sim.get("scenario", "")
-    for key, cached_names in payload_agents_cache.items():
-        if key.lower() in scenario_text.lower():
-            allowed_names.update(cached_names)
-
-    # fallback → include all current agents if cache empty
-    if not allowed_names:
-        allowed_names.update(a.get("name") for a in agents if a.get("name"))
-
-    # 🔹 Filter agents (full cognitive/behavioral profile)
-    filtered_agents = []
-    for a in agents:
-        if a.get("name") not in allowed_names:
-            continue
-
-        filtered_agents.append({
-            "id": a.get("id"),
-            "name": a.get("name"),
-            "role": a.get("role"),
-            "persona": a.get("persona"),
-            "mbti": a.get("mbti"),
-            "cognitive_bias": a.get("cognitive_bias"),
-            "motivation": a.get("motivation"),
-            "secret_agenda": a.get("secret_agenda"),
-            "agenda_progress": a.get("agenda_progress"),
-            "memory": a.get("memory"),
-            "corroded_memory": a.get("corroded_memory"),
-            "traits": a.get("traits"),
-            "skills": a.get("skills"),
-            "quirks": a.get("quirks"),
-            "constraints": a.get("constraints"),
-            "biography": a.get("biography"),
-            "emotional_state": a.get("emotional_state"),
-            "last_action": a.get("last_action"),
-            "turn_count": a.get("turn_count"),
-            "position": a.get("position"),
-            "thought_process": a.get("thought_process"),
-
-        })
-
-    # 🧠 Filter events
+    # 🔹 Filter agents, then 🧠 filter events against them
+    filtered_agents = _filter_agents(sim, fields)
     allowed_agent_ids = {a.get("id") for a in filtered_agents}
-    filtered_events = []
-    for e in trimmed_events:
-        actor_id = e.get("actor_id")
-        event_type = e.get("type", "")
-        summary = e.get("summary", "")
-
-        # skip ghost NPCs
-        if actor_id and actor_id not in allowed_agent_ids:
-            continue
-
-        # skip redundant system messages
-        if event_type == "system" and (
-            "Agents initialized" in summary
-            or "Simulation created" in summary
-            or "entered the scenario" in e.get("details", "")
-            or "Memory corrosion applied" in summary
-            or "Memory corrosion" in summary
-             or summary.strip().lower() == "internal reasoning"
-        ):
-            continue
-
-        filtered_events.append(e)
-
-    slim_sim = {
-        "id": sim.get("id"),
-        "scenario": sim.get("scenario"),
-        "status": sim.get("status"),
-        "created_at": sim.get("created_at"),
-        "updated_at": sim.get("updated_at"),
-        "active_agent_index": sim.get("active_agent_index"),
-        "agents": filtered_agents,
-        "events": filtered_events,
-    }
+    filtered_events = [e for e in trimmed_events if _is_visible_event(e, allowed_agent_ids)]
 
-    print(f"[DEBUG] Slim applied → {len(filtered_agents)} agents, {len(filtered_events)} events")
-    return {"simulation": slim_sim}
+    if should_dump_debug():
+        print(f"[DEBUG] Slim applied → {len(filtered_agents)} agents, {len(filtered_events)} events")
+    return _slim_envelope(sim, filtered_agents, filtered_events)
 
 
 # =====================================================
@@ -182,99 +666,326 @@ async def create_simulation(payload: Dict[str, Any]) -> Dict[str, Any]:
         "fallback": "ignore_unlisted",
     }
 
-    # Cache agent names
     agent_names = [a.get("name") for a in agents if a.get("name")]
-    scenario_key = payload.get("scenario") or "unknown_scenario"
-    payload_agents_cache[scenario_key] = agent_names
 
-    print("[DEBUG] Final simulation payload before POST:")
-    print(json.dumps(payload, indent=2)[:1000])
+    if should_dump_debug():
+        print("[DEBUG] Final simulation payload before POST:")
+        print(json.dumps(payload, indent=2)[:1000])
 
-    return await _forward_request("POST", "/simulations", payload)
+    result = await _forward_request("POST", "/simulations", payload, operation="create")
+
+    # Cache agent names under the provider-assigned simulation id
+    simulation_id = (result.get("simulation") or {}).get("id") or result.get("id")
+    if simulation_id and agent_names:
+        payload_agents_cache.set(simulation_id, agent_names)
+    return result
 
 
 # =====================================================
 # 🧩 GET SIMULATION
 # =====================================================
-async def get_simulation(simulation_id: str, slim: bool = False) -> Dict[str, Any]:
+async def get_simulation(
+    simulation_id: str, slim: bool = False, fields: Tuple[str, ...] = FULL_AGENT_FIELDS
+) -> Dict[str, Any]:
     """Fetch simulation and apply slim filter if requested."""
-    data = await _forward_request("GET", f"/simulations/{simulation_id}")
-    if slim:
-        return _slim_simulation(data)
-    return data
+    if not slim:
+        return await _fetch_simulation(simulation_id)
+
+    cache_key = (simulation_id, "get_slim:" + ",".join(fields))
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return cached
+    slimmed = _slim_simulation(await _fetch_simulation(simulation_id), fields)
+    _cache_put(cache_key, slimmed)
+    return slimmed
 
 
 # =====================================================
 # 🧩 ADVANCE SIMULATION
 # =====================================================
-# =====================================================
-# 🧩 ADVANCE SIMULATION
-# =====================================================
-async def advance_simulation(simulation_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
-    """Advance simulation up to MAX_ATTEMPTS until at least one *meaningful* new event exists."""
-    MAX_ADVANCE_ATTEMPTS = 5
-    final_result = None
-
-    def _is_meaningful_event(e: dict) -> bool:
-        """Return True if event is not a system/meta message."""
-        summary = (e.get("summary") or e.get("text") or "").lower()
-        event_type = (e.get("type") or "").lower()
-        if not summary:
-            return False
-        # skip empty, system, and meta chatter
-        return not (
-            event_type == "system"
-            or "memory corrosion" in summary
-            or "internal reasoning" in summary
-            or "agents initialized" in summary
-            or "simulation created" in summary
+def _is_meaningful_event(e: dict) -> bool:
+    """Return True if event is not a system/meta message."""
+    summary = (e.get("summary") or e.get("text") or "").lower()
+    event_type = (e.get("type") or "").lower()
+    if not summary:
+        return False
+    # skip empty, system, and meta chatter
+    return not (
+        event_type == "system"
+        or "memory corrosion" in summary
+        or "internal reasoning" in summary
+        or "agents initialized" in summary
+        or "simulation created" in summary
+    )
+
+
+def _meaningful_tail(sim: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Meaningful events among the last 3 visible ones, without slimming agents."""
+    allowed_names = _allowed_agent_names(sim)
+    cast_ids = {a.get("id") for a in sim.get("agents", []) if a.get("name") in allowed_names}
+    tail = sim.get("events", [])[-3:]
+    return [e for e in tail if _is_visible_event(e, cast_ids) and _is_meaningful_event(e)]
+
+
+# Speculative next-turn advances for interactive users (opt-in per request)
+turn_prefetcher = SpeculativePrefetcher(
+    max_outstanding=settings.simulation_prefetch_max_outstanding,
+    ttl_seconds=settings.simulation_prefetch_ttl_seconds,
+)
+
+
+def _may_prefetch(simulation_id: str) -> bool:
+    """Speculation is extra provider load: only while healthy and idle."""
+    return (
+        provider_pool.for_simulation(simulation_id).accepting()
+        and provider_scheduler.stats()["queued_now"] == 0
+    )
+
+
+async def advance_simulation(
+    simulation_id: str,
+    payload: Dict[str, Any],
+    fields: Tuple[str, ...] = FULL_AGENT_FIELDS,
+    *,
+    until_meaningful: bool = True,
+    deadline_seconds: Optional[float] = None,
+    prefetch: bool = False,
+) -> Dict[str, Any]:
+    """
+    Advance the simulation (see _advance). With `prefetch`, serve a held
+    speculative result when it matches, then start speculating on the next
+    turn. Any other advance drops the held result first.
+    """
+    key = (json.dumps(payload, sort_keys=True), fields, until_meaningful, deadline_seconds)
+
+    def _run() -> Any:
+        return _advance(
+            simulation_id, payload, fields, until_meaningful=until_meaningful, deadline_seconds=deadline_seconds
         )
 
-    for attempt in range(1, MAX_ADVANCE_ATTEMPTS + 1):
-        raw = await _forward_request("POST", f"/simulations/{simulation_id}/advance", payload)
-        slimmed = _slim_simulation(raw)
-        sim = slimmed.get("simulation", {})
-        events = sim.get("events", []) or []
+    if not prefetch:
+        turn_prefetcher.discard(simulation_id)
+        return await _run()
 
-        # Filter out meta chatter before deciding
-        meaningful_events = [e for e in events if _is_meaningful_event(e)]
+    result = await turn_prefetcher.take(simulation_id, key)
+    if result is not None:
+        result = {**result, "outcome": {**result.get("outcome", {}), "prefetched": True}}
+    else:
+        result = await _run()
 
-        print(
-            f"[DEBUG] Advance attempt {attempt}: "
-            f"{len(events)} total → {len(meaningful_events)} meaningful"
-        )
-
-        if meaningful_events:
-            print(f"[DEBUG] ✅ Returning result after {attempt} advance step(s)")
-            # Replace event list with only meaningful ones before returning
-            sim["events"] = meaningful_events
-            return {"simulation": sim}
+    if (result.get("simulation", {}).get("status") or "").lower() not in STREAM_TERMINAL_STATUSES:
+        turn_prefetcher.schedule(simulation_id, key, _run, lambda: _may_prefetch(simulation_id))
+    return result
 
-        final_result = slimmed
-        await asyncio.sleep(0.5)
 
-    print("[DEBUG] ⚠️ Max advance attempts reached, returning last result")
-    return final_result
+async def _advance(
+    simulation_id: str,
+    payload: Dict[str, Any],
+    fields: Tuple[str, ...] = FULL_AGENT_FIELDS,
+    *,
+    until_meaningful: bool = True,
+    deadline_seconds: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Advance the simulation; with `until_meaningful`, keep advancing server-side
+    until a *meaningful* event appears, attempts run out or the deadline would
+    be exceeded. Only the returned snapshot is slimmed. The response carries an
+    `outcome` block (attempts, elapsed_ms, events_skipped, stopped_by).
+    """
+    max_attempts = settings.simulation_advance_max_attempts if until_meaningful else 1
+    budget = deadline_seconds or settings.simulation_advance_deadline_seconds
+    started = time.monotonic()
+    deadline = started + budget
+    delay = settings.simulation_advance_backoff_initial_seconds
+    avg_call = 0.0
+
+    seen_events: set = set()
+    events_skipped = 0
+    attempt = 0
+    stopped_by = "max_attempts"
+    meaningful: List[Dict[str, Any]] = []
+    raw: Dict[str, Any] = {}
+
+    while True:
+        attempt += 1
+        call_started = time.monotonic()
+        raw = await _forward_request(
+            "POST", f"/simulations/{simulation_id}/advance", payload, operation="advance"
+        )
+        _invalidate_reads(simulation_id)
+        call_time = time.monotonic() - call_started
+        avg_call = call_time if attempt == 1 else 0.7 * avg_call + 0.3 * call_time
+
+        sim = raw.get("simulation", {})
+        meaningful = _meaningful_tail(sim)
+        if meaningful:
+            stopped_by = "meaningful"
+            break
+
+        new_keys = {_event_key(e) for e in sim.get("events", [])} - seen_events
+        if attempt > 1:
+            events_skipped += len(new_keys)
+        seen_events |= new_keys
+
+        if not until_meaningful or attempt >= max_attempts:
+            break
+        # Adaptive stop: don't start a call that would overrun the deadline
+        remaining = deadline - time.monotonic()
+        if remaining <= delay + avg_call:
+            stopped_by = "deadline"
+            break
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, settings.simulation_advance_backoff_max_seconds)
+
+    slimmed = _slim_simulation(raw, fields)
+    if meaningful:
+        # Replace event list with only meaningful ones before returning
+        visible_keys = {_event_key(e) for e in meaningful}
+        slimmed["simulation"]["events"] = [
+            e for e in slimmed["simulation"]["events"] if _event_key(e) in visible_keys
+        ]
+
+    outcome = {
+        "attempts": attempt,
+        "elapsed_ms": round((time.monotonic() - started) * 1000),
+        "events_skipped": events_skipped,
+        "meaningful": bool(meaningful),
+        "stopped_by": stopped_by if until_meaningful else "single",
+    }
+    if should_dump_debug():
+        print(f"[DEBUG] Advance {simulation_id}: {outcome}")
+    return {**slimmed, "outcome": outcome}
 
 
 # =====================================================
 # 🧩 TRIGGER FATE
 # =====================================================
-async def trigger_fate(simulation_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+async def trigger_fate(
+    simulation_id: str, payload: Dict[str, Any], fields: Tuple[str, ...] = FULL_AGENT_FIELDS
+) -> Dict[str, Any]:
     """Trigger fate event and slim output."""
-    raw = await _forward_request("POST", f"/simulations/{simulation_id}/fate", payload)
-    return _slim_simulation(raw)
+    turn_prefetcher.discard(simulation_id)
+    raw = await _forward_request("POST", f"/simulations/{simulation_id}/fate", payload, operation="fate")
+    _invalidate_reads(simulation_id)
+    return _slim_simulation(raw, fields)
 
 # =====================================================
 # 🧩 PLease add a pause and stop
 # =====================================================
 
-async def pause_simulation(simulation_id: str) -> Dict[str, Any]:
+async def pause_simulation(simulation_id: str, fields: Tuple[str, ...] = FULL_AGENT_FIELDS) -> Dict[str, Any]:
     """Pause an active simulation."""
-    raw = await _forward_request("POST", f"/simulations/{simulation_id}/pause")
-    return _slim_simulation(raw)
+    turn_prefetcher.discard(simulation_id)
+    raw = await _forward_request("POST", f"/simulations/{simulation_id}/pause", operation="pause")
+    _invalidate_reads(simulation_id)
+    return _slim_simulation(raw, fields)
 
-async def stop_simulation(simulation_id: str) -> Dict[str, Any]:
+async def stop_simulation(simulation_id: str, fields: Tuple[str, ...] = FULL_AGENT_FIELDS) -> Dict[str, Any]:
     """Stop (terminate) an active simulation."""
-    raw = await _forward_request("POST", f"/simulations/{simulation_id}/stop")
-    return _slim_simulation(raw)
+    turn_prefetcher.discard(simulation_id)
+    raw = await _forward_request("POST", f"/simulations/{simulation_id}/stop", operation="stop")
+    _invalidate_reads(simulation_id)
+    return _slim_simulation(raw, fields)
+
+
+# =====================================================
+# 📡 LIVE EVENT STREAM (SSE)
+# =====================================================
+STREAM_TERMINAL_STATUSES = {"paused", "stopped", "completed", "finished", "terminated"}
+
+
+def _agent_changes(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """Fields of a slimmed agent that differ from the previous snapshot."""
+    return {k: v for k, v in current.items() if previous.get(k) != v}
+
+
+async def stream_simulation(
+    simulation_id: str,
+    *,
+    advance: bool = True,
+    steps: int = 1,
+    interval: float = 1.0,
+    max_turns: Optional[int] = None,
+    on_advance: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Drive the provider and yield ``(event_name, data)`` pairs as they arrive:
+    ``snapshot`` once, then ``event`` per new visible event and ``agents``
+    with per-agent field deltas, and ``end`` when the run stops.
+    Uses the same agent/event filtering rules as _slim_simulation().
+    Advances run the same hooks as advance_simulation(): any held prefetch
+    is dropped first, and ``on_advance`` gets the result (session activity).
+    """
+    raw = await _fetch_simulation(simulation_id)
+    sim = raw.get("simulation", {})
+    agents = _filter_agents(sim)
+    allowed_agent_ids = {a.get("id") for a in agents}
+
+    seen_events = {_event_key(e) for e in sim.get("events", [])}
+    agent_state = {a.get("id"): a for a in agents}
+    yield "snapshot", _slim_simulation(raw)
+
+    turns = 0
+    while sim.get("status") not in STREAM_TERMINAL_STATUSES:
+        if max_turns is not None and turns >= max_turns:
+            break
+        if advance:
+            turn_prefetcher.discard(simulation_id)
+            raw = await _forward_request(
+                "POST",
+                f"/simulations/{simulation_id}/advance",
+                {"steps": steps},
+                operation="advance",
+            )
+            _invalidate_reads(simulation_id)
+            if on_advance is not None:
+                on_advance(raw)
+        else:
+            await asyncio.sleep(interval)
+            raw = await _fetch_simulation(simulation_id)
+        turns += 1
+        sim = raw.get("simulation", {})
+
+        # 🧠 New events only, filtered like the slim view
+        for e in sim.get("events", []):
+            key = _event_key(e)
+            if key in seen_events:
+                continue
+            seen_events.add(key)
+            if _is_visible_event(e, allowed_agent_ids):
+                yield "event", e
+
+        # 🔹 Agent-state deltas
+        deltas = []
+        for a in _filter_agents(sim):
+            changes = _agent_changes(agent_state.get(a.get("id"), {}), a)
+            if changes:
+                deltas.append({"id": a.get("id"), **changes})
+                agent_state[a.get("id")] = a
+        if deltas:
+            yield "agents", {"agents": deltas, "status": sim.get("status")}
+
+        if advance and interval > 0:
+            await asyncio.sleep(interval)
+
+    yield "end", {"status": sim.get("status"), "turns": turns}
+
+
+# =====================================================
+# 🧭 EVENT CURSOR / DELTA
+# =====================================================
+async def get_simulation_delta(simulation_id: str, after: Optional[str] = None) -> Dict[str, Any]:
+    """Fetch the provider state and return only what changed since ``after``."""
+    raw = await _fetch_simulation(simulation_id)
+    sim = raw.get("simulation", {})
+    agents = _filter_agents(sim)
+    allowed_agent_ids = {a.get("id") for a in agents}
+
+    cursor_tracker.ingest(
+        simulation_id,
+        status=sim.get("status"),
+        agents=agents,
+        events=[e for e in sim.get("events", []) if _is_visible_event(e, allowed_agent_ids)],
+        event_key=_event_key,
+    )
+    return cursor_tracker.delta(simulation_id, after)